@@ -0,0 +1,127 @@
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_cache import ReadinessCache
+
+from partition_registry.actions.check_partition_readiness import evaluate_partition_readiness
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.request import ReadinessRequest
+
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+
+from partition_registry.orm import PartitionsRegistryORM
+
+
+@traced
+def check_batch_readiness(
+    requests: list[ReadinessRequest],
+    partition_registry: PartitionRegistry,
+    events_registry: EventsRegistry,
+    readiness_index: ReadinessIndex | None = None,
+    readiness_cache: ReadinessCache | None = None,
+) -> list[PartitionReady | PartitionNotReady]:
+    """Check readiness of many (source, interval) pairs
+
+    Requests with cached results are answered by the readiness cache, requests of warm sources
+    are answered by the readiness index, all others are answered with one partitions query and one events query.
+    Results are returned in the order of requests.
+    """
+    versions = [readiness_cache.version(request.source_name) for request in requests] if readiness_cache else []
+    results = evaluate_cached(requests, versions, readiness_cache)
+    cached_positions = set(results)
+    cold_positions = evaluate_indexed(requests, readiness_index, results)
+
+    if cold_positions:
+        cold_requests = [requests[position] for position in cold_positions]
+        partitions = partition_registry.get_filtered_partitions_batch(cold_requests)
+        unique_partitions = unique(partitions)
+        events = events_registry.get_partition_events(unique_partitions) if unique_partitions else []
+        evaluate_cold(cold_requests, cold_positions, partitions, events, results)
+
+    cache_results(requests, versions, readiness_cache, results, cached_positions)
+    return [results[position] for position in range(len(requests))]
+
+
+def evaluate_cached(
+    requests: list[ReadinessRequest],
+    versions: list[int],
+    readiness_cache: ReadinessCache | None,
+) -> dict[int, PartitionReady | PartitionNotReady]:
+    """Answer requests with results cached for current versions of their sources"""
+    results: dict[int, PartitionReady | PartitionNotReady] = {}
+    if readiness_cache is None:
+        return results
+
+    for position, (request, version) in enumerate(zip(requests, versions)):
+        match readiness_cache.get(request.source_name, version, request.start, request.end):
+            case PartitionReady() | PartitionNotReady() as cached:
+                results[position] = cached
+
+    return results
+
+
+def evaluate_indexed(
+    requests: list[ReadinessRequest],
+    readiness_index: ReadinessIndex | None,
+    results: dict[int, PartitionReady | PartitionNotReady],
+) -> list[int]:
+    """Answer unanswered requests of warm sources, return positions of requests left for the database"""
+    cold_positions: list[int] = []
+
+    for position, request in enumerate(requests):
+        if position in results:
+            continue
+        indexed = readiness_index.lookup(request.source_name, request.start, request.end) if readiness_index else None
+        match indexed:
+            case (indexed_partitions, indexed_events):
+                results[position] = evaluate_partition_readiness(
+                    request.start, request.end, request.source_name, indexed_partitions, indexed_events
+                )
+            case None:
+                cold_positions.append(position)
+
+    return cold_positions
+
+
+def cache_results(
+    requests: list[ReadinessRequest],
+    versions: list[int],
+    readiness_cache: ReadinessCache | None,
+    results: dict[int, PartitionReady | PartitionNotReady],
+    cached_positions: set[int],
+) -> None:
+    if readiness_cache is None:
+        return
+
+    for position, (request, version) in enumerate(zip(requests, versions)):
+        if position not in cached_positions:
+            readiness_cache.put(request.source_name, version, request.start, request.end, results[position])
+
+
+def unique(partitions: dict[int, list[PartitionsRegistryORM]]) -> list[PartitionsRegistryORM]:
+    return list({partition.id: partition for found in partitions.values() for partition in found}.values())
+
+
+def evaluate_cold(
+    cold_requests: list[ReadinessRequest],
+    cold_positions: list[int],
+    partitions: dict[int, list[PartitionsRegistryORM]],
+    events: list[SimplifiedPartitionEventORM],
+    results: dict[int, PartitionReady | PartitionNotReady],
+) -> None:
+    events_by_partition = {event.id: event for event in events}
+
+    for cold_position, request in enumerate(cold_requests):
+        request_partitions = partitions.get(cold_position, [])
+        request_events = [
+            events_by_partition[partition.id]
+            for partition in request_partitions
+            if partition.id in events_by_partition
+        ]
+        results[cold_positions[cold_position]] = evaluate_partition_readiness(
+            request.start, request.end, request.source_name, request_partitions, request_events
+        )
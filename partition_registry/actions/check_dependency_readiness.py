@@ -0,0 +1,78 @@
+import datetime as dt
+
+from partition_registry.actor.dependency_registry import DependencyRegistry
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_cache import ReadinessCache
+
+from partition_registry.actions.check_batch_readiness import check_batch_readiness
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.dependency import DependencyGroup
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.request import ReadinessRequest
+
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import ValidationFailed
+
+
+@traced
+def check_dependency_readiness(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_names: list[str],
+    group_name: str | None,
+    dependency_registry: DependencyRegistry,
+    partition_registry: PartitionRegistry,
+    events_registry: EventsRegistry,
+    readiness_index: ReadinessIndex | None = None,
+    readiness_cache: ReadinessCache | None = None,
+) -> DependencyReadiness | LookupFailed | ValidationFailed:
+    """Check readiness of the interval for the given sources and sources of the dependency group
+
+    Sources are checked together as a batch, see `check_batch_readiness`.
+    """
+    group: DependencyGroup | None = None
+    if group_name is not None:
+        match dependency_registry.lookup_registered(group_name):
+            case LookupFailed() as lookup_failed:
+                return lookup_failed
+            case DependencyGroup() as group:
+                ...
+
+    match requests := dependency_requests(start, end, source_names, group):
+        case ValidationFailed():
+            return requests
+
+    results = check_batch_readiness(requests, partition_registry, events_registry, readiness_index, readiness_cache)
+    return dependency_readiness(requests, results)
+
+
+def dependency_requests(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_names: list[str],
+    group: DependencyGroup | None,
+) -> list[ReadinessRequest] | ValidationFailed:
+    """One request per distinct source, sources of the group follow the given ones"""
+    group_source_names = group.source_names if group is not None else ()
+    unique_source_names = dict.fromkeys([*source_names, *group_source_names])
+    if not unique_source_names:
+        return ValidationFailed("Either source names or dependency group should be given...")
+    return [ReadinessRequest(source_name, start, end) for source_name in unique_source_names]
+
+
+def dependency_readiness(
+    requests: list[ReadinessRequest],
+    results: list[PartitionReady | PartitionNotReady],
+) -> DependencyReadiness:
+    blocking = {
+        request.source_name: result.reason
+        for request, result in zip(requests, results)
+        if isinstance(result, PartitionNotReady)
+    }
+    return DependencyReadiness(is_ready=not blocking, blocking=blocking)
@@ -1,40 +1,115 @@
 import datetime as dt
+from typing import Sequence
 
 from partition_registry.actor.events_registry import EventsRegistry
 from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_index import IndexedPartition
+from partition_registry.actor.readiness_cache import ReadinessCache
+
+from partition_registry.integration.tracing import traced
 
 from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.readiness import ReadinessEngine
+from partition_registry.data.readiness import ReadinessSummary
 
 from partition_registry.data.status import PartitionReady
 from partition_registry.data.status import PartitionNotReady
 
+from partition_registry.orm import PartitionsRegistryORM
+
 
+@traced
 def check_partition_readiness(
     start: dt.datetime,
     end: dt.datetime,
     source_name: str,
     partition_registry: PartitionRegistry,
     events_registry: EventsRegistry,
+    readiness_index: ReadinessIndex | None = None,
+    readiness_cache: ReadinessCache | None = None,
+    readiness_engine: ReadinessEngine = ReadinessEngine.PYTHON,
+) -> PartitionReady | PartitionNotReady:
+    if readiness_cache is None:
+        return read_partition_readiness(start, end, source_name, partition_registry, events_registry, readiness_index, readiness_engine)
+
+    version = readiness_cache.version(source_name)
+    match readiness_cache.get(source_name, version, start, end):
+        case PartitionReady() | PartitionNotReady() as cached:
+            return cached
+
+    result = read_partition_readiness(start, end, source_name, partition_registry, events_registry, readiness_index, readiness_engine)
+    readiness_cache.put(source_name, version, start, end, result)
+    return result
+
+
+def read_partition_readiness(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_name: str,
+    partition_registry: PartitionRegistry,
+    events_registry: EventsRegistry,
+    readiness_index: ReadinessIndex | None = None,
+    readiness_engine: ReadinessEngine = ReadinessEngine.PYTHON,
 ) -> PartitionReady | PartitionNotReady:
+    if readiness_index is not None:
+        if not readiness_index.is_warm(source_name):
+            warm_readiness_index(source_name, partition_registry, events_registry, readiness_index)
+        match readiness_index.lookup(source_name, start, end):
+            case (indexed_partitions, indexed_events):
+                return evaluate_partition_readiness(start, end, source_name, indexed_partitions, indexed_events)
+
+    # Cold path: the index is disabled or the source state changed while it was warming up
+    if readiness_engine == ReadinessEngine.SQL:
+        summary = events_registry.get_readiness_summary(start, end, source_name)
+        return evaluate_readiness_summary(start, end, source_name, summary)
+
     partitions = partition_registry.get_filtered_partitions(start, end, source_name)
+    events = events_registry.get_partition_events(partitions) if partitions else []
+    return evaluate_partition_readiness(start, end, source_name, partitions, events)
 
+
+def warm_readiness_index(
+    source_name: str,
+    partition_registry: PartitionRegistry,
+    events_registry: EventsRegistry,
+    readiness_index: ReadinessIndex,
+) -> None:
+    """Load every partition of the source with its last event into the index"""
+    generation = readiness_index.generation(source_name)
+    partitions = partition_registry.get_source_partitions(source_name)
+    events = events_registry.get_partition_events(partitions) if partitions else []
+    readiness_index.warm(
+        source_name,
+        [IndexedPartition(partition.id, partition.start, partition.end) for partition in partitions],
+        events,
+        generation,
+    )
+
+
+def evaluate_partition_readiness(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_name: str,
+    partitions: Sequence[PartitionsRegistryORM | IndexedPartition],
+    events: Sequence[SimplifiedPartitionEventORM],
+) -> PartitionReady | PartitionNotReady:
     if not partitions:
-        return PartitionNotReady(f"There are no registered partitions by source <<{source_name}>> within the requested interval: <<{start} : {end}>>")
+        return not_registered(start, end, source_name)
 
-    events = events_registry.get_partition_events(partitions)
     if not events:
-        return PartitionNotReady(f"There are no registered events by source <<{source_name}>> within the requested interval: <<{start} : {end}>> ")
+        return no_events(start, end, source_name)
 
     for event in events:
-        if event.event_type == EventType.LOCK.value:
-            return PartitionNotReady(f"Source is locked by: <<partition_id:{event.id}>>...")
+        if event.event_type == EventType.LOCK:
+            return locked(event.id)
 
-    
     # Case when partition is registered but we don't have any event by this partition
-    partitions_presented_in_events = [event.id for event in events]
+    partitions_presented_in_events = {event.id for event in events}
     real_partitions = [partition for partition in partitions if partition.id in partitions_presented_in_events]
     if not real_partitions:
-        return PartitionNotReady(f"There are no events by registered partitions for Source <<{source_name}>> within the requested interval: <<{start} : {end}>>")
+        return no_partition_events(start, end, source_name)
 
     # Case when first partition partition start date is greater than interval
     # and due to that fact can't be comprehensively covered
@@ -47,10 +122,7 @@ def check_partition_readiness(
     # TODO: add test for this case
     first_partition = min(real_partitions, key=lambda p: p.start)
     if first_partition.start > start:
-        return PartitionNotReady(
-            "Requested interval not comprehensively covered by registered partitions..."
-            f"\nThere are no partitions to cover interval: <<{start} : {first_partition.start}>>"
-        )
+        return not_covered(start, first_partition.start)
 
     # Case when intersected partition start date is less than end date in desired partition
     # and due to that fact can't be comprehensively covered
@@ -62,10 +134,7 @@ def check_partition_readiness(
     # TODO: add test for this case
     last_partition = max(real_partitions, key=lambda p: p.end)
     if last_partition.end < end:
-        return PartitionNotReady(
-            "Requested interval not comprehensively covered by registered partitions..."
-            f"\nThere are no partitions to cover interval: <<{last_partition.end} : {end}>>"
-        )
+        return not_covered(last_partition.end, end)
 
     sorted_events = sorted(real_partitions, key=lambda p: p.start)
     current_end = sorted_events[0].end
@@ -80,15 +149,95 @@ def check_partition_readiness(
     # 2. Desired interval: |2000-01-01: 2000-01-04|
     #    Partitions: |2000-01-01: 2000-01-02|, |2000-01-03: 2000-01-04| - shouldn't comprehensively cover interval
     #
+    # 3. Desired interval: |2000-01-01: 2000-01-04|
+    #    Partitions: |2000-01-01: 2000-01-03|, |2000-01-02: 2000-01-02T12|, |2000-01-03: 2000-01-04| - should
+    #    comprehensively cover interval, covered prefix ends at the furthest end seen so far, a nested partition doesn't shrink it
+    #
     # In terms of Big O we have O(n) complexity here for the worst case
     # TODO: add test for this case
     while current_position < total_events:
         if current_end < sorted_events[current_position].start:
-            return PartitionNotReady(
-                "Requested interval not comprehesively convered..."
-                f"There are not events to cover interval: <<{current_end} : {sorted_events[current_position].start}>>"
-            )
-        current_end = sorted_events[current_position].end
+            return has_gap(current_end, sorted_events[current_position].start)
+        current_end = max(current_end, sorted_events[current_position].end)
         current_position += 1
 
     return PartitionReady()
+
+
+def evaluate_readiness_summary(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_name: str,
+    summary: ReadinessSummary,
+) -> PartitionReady | PartitionNotReady:
+    """Verdict of `evaluate_partition_readiness` over the summary evaluated by Postgres"""
+    if not summary.partitions:
+        return not_registered(start, end, source_name)
+
+    if not summary.events:
+        return no_events(start, end, source_name)
+
+    if summary.locked_by is not None:
+        return locked(summary.locked_by)
+
+    if summary.first_start is None or summary.last_end is None:
+        return no_partition_events(start, end, source_name)
+
+    if summary.first_start > start:
+        return not_covered(start, summary.first_start)
+
+    if summary.last_end < end:
+        return not_covered(summary.last_end, end)
+
+    if summary.gap_start is not None and summary.gap_end is not None:
+        return has_gap(summary.gap_start, summary.gap_end)
+
+    return PartitionReady()
+
+
+# Classes of not ready verdicts by the beginning of their reasons, see the functions below
+REASON_CLASSES = (
+    ('not_registered', "There are no registered partitions"),
+    ('no_events', "There are no registered events"),
+    ('locked', "Source is locked"),
+    ('no_partition_events', "There are no events by registered partitions"),
+    ('not_covered', "Requested interval not comprehensively covered"),
+    ('gap', "Requested interval not comprehesively convered"),
+)
+
+
+def reason_class(not_ready: PartitionNotReady) -> str:
+    for name, prefix in REASON_CLASSES:
+        if not_ready.reason.startswith(prefix):
+            return name
+    return 'unknown'
+
+
+def not_registered(start: dt.datetime, end: dt.datetime, source_name: str) -> PartitionNotReady:
+    return PartitionNotReady(f"There are no registered partitions by source <<{source_name}>> within the requested interval: <<{start} : {end}>>")
+
+
+def no_events(start: dt.datetime, end: dt.datetime, source_name: str) -> PartitionNotReady:
+    return PartitionNotReady(f"There are no registered events by source <<{source_name}>> within the requested interval: <<{start} : {end}>> ")
+
+
+def locked(partition_id: int) -> PartitionNotReady:
+    return PartitionNotReady(f"Source is locked by: <<partition_id:{partition_id}>>...")
+
+
+def no_partition_events(start: dt.datetime, end: dt.datetime, source_name: str) -> PartitionNotReady:
+    return PartitionNotReady(f"There are no events by registered partitions for Source <<{source_name}>> within the requested interval: <<{start} : {end}>>")
+
+
+def not_covered(gap_start: dt.datetime, gap_end: dt.datetime) -> PartitionNotReady:
+    return PartitionNotReady(
+        "Requested interval not comprehensively covered by registered partitions..."
+        f"\nThere are no partitions to cover interval: <<{gap_start} : {gap_end}>>"
+    )
+
+
+def has_gap(gap_start: dt.datetime, gap_end: dt.datetime) -> PartitionNotReady:
+    return PartitionNotReady(
+        "Requested interval not comprehesively convered..."
+        f"There are not events to cover interval: <<{gap_start} : {gap_end}>>"
+    )
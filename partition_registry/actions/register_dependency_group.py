@@ -0,0 +1,31 @@
+from partition_registry.actor.dependency_registry import DependencyRegistry
+from partition_registry.actor.source_registry import SourceRegistry
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.dependency import DependencyGroup
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import ValidationFailed
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import FailedPersist
+
+
+@traced
+def register_dependency_group(
+    group_name: str,
+    source_names: list[str],
+    dependency_registry: DependencyRegistry,
+    source_registry: SourceRegistry,
+) -> SuccededRegistration | FailedRegistration:
+    match dependency_registry.safe_register(group_name, source_names, source_registry):
+        case ValidationFailed() as validation_failed:
+            return FailedRegistration(validation_failed.message)
+        case LookupFailed() as lookup_failed:
+            return FailedRegistration(lookup_failed.message)
+        case FailedPersist() as failed_persist:
+            return FailedRegistration(failed_persist.message)
+        case DependencyGroup() as group:
+            ...
+
+    return SuccededRegistration(group)
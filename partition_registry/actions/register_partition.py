@@ -4,6 +4,8 @@ from partition_registry.actor.source_registry import SourceRegistry
 from partition_registry.actor.provider_registry import ProviderRegistry
 from partition_registry.actor.partition_registry import PartitionRegistry
 
+from partition_registry.integration.tracing import traced
+
 from partition_registry.data.partition import RegisteredPartition
 
 from partition_registry.data.status import SuccededRegistration
@@ -15,6 +17,7 @@ from partition_registry.data.status import FailedPersist
 from partition_registry.data.status import ValidationFailed
 
 
+@traced
 def register_partition(
     start: dt.datetime,
     end: dt.datetime,
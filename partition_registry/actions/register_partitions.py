@@ -0,0 +1,65 @@
+from partition_registry.actor.source_registry import SourceRegistry
+from partition_registry.actor.provider_registry import ProviderRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.partition_registry import RegistrationOutcome
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.partition import RegisteredPartition
+
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import AccessDenied
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import AlreadyRegistered
+from partition_registry.data.status import FailedPersist
+from partition_registry.data.status import ValidationFailed
+
+
+@traced
+def register_partitions(
+    partitions: list[SimplePartition | ValidationFailed],
+    partition_registry: PartitionRegistry,
+    source_name: str,
+    source_registry: SourceRegistry,
+    provider_name: str,
+    provider_registry: ProviderRegistry
+) -> list[SuccededRegistration | FailedRegistration] | FailedRegistration:
+    registered_partitions = partition_registry.safe_register_many(
+        partitions=[partition for partition in partitions if isinstance(partition, SimplePartition)],
+        source_name=source_name,
+        source_registry=source_registry,
+        provider_name=provider_name,
+        provider_registry=provider_registry
+    )
+    return to_registrations(partitions, registered_partitions)
+
+
+def to_registrations(
+    partitions: list[SimplePartition | ValidationFailed],
+    registered_partitions: list[RegistrationOutcome] | FailedPersist | LookupFailed | AccessDenied,
+) -> list[SuccededRegistration | FailedRegistration] | FailedRegistration:
+    """Merge outcomes of registered partitions with partitions failed before registration"""
+    match registered_partitions:
+        case FailedPersist() as failed_persist:
+            return FailedRegistration(failed_persist.message)
+        case LookupFailed() as lookup_failed:
+            return FailedRegistration(lookup_failed.message)
+        case AccessDenied() as access_denied:
+            return FailedRegistration(access_denied.message)
+        case list() as registration_outcomes:
+            ...
+
+    outcomes = iter(registration_outcomes)
+    results: list[SuccededRegistration | FailedRegistration] = []
+    for partition in partitions:
+        match partition if isinstance(partition, ValidationFailed) else next(outcomes):
+            case ValidationFailed() as validation_failed:
+                results.append(FailedRegistration(validation_failed.message))
+            case AlreadyRegistered() as already_registered:
+                results.append(FailedRegistration(already_registered.message))
+            case RegisteredPartition() as registered_partition:
+                results.append(SuccededRegistration(registered_partition))
+
+    return results
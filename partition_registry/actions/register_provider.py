@@ -1,5 +1,7 @@
 from partition_registry.actor.provider_registry import ProviderRegistry
 
+from partition_registry.integration.tracing import traced
+
 from partition_registry.data.provider import RegisteredProvider
 from partition_registry.data.status import SuccededRegistration
 from partition_registry.data.status import FailedRegistration
@@ -8,6 +10,7 @@ from partition_registry.data.status import ValidationFailed
 from partition_registry.data.status import FailedPersist
 
 
+@traced
 def register_provider(
     provider_name: str,
     access_token: str,
@@ -1,5 +1,7 @@
 from partition_registry.actor.source_registry import SourceRegistry
 
+from partition_registry.integration.tracing import traced
+
 from partition_registry.data.source import RegisteredSource
 from partition_registry.data.status import SuccededRegistration
 from partition_registry.data.status import FailedRegistration
@@ -8,6 +10,7 @@ from partition_registry.data.status import AlreadyRegistered
 from partition_registry.data.status import FailedPersist
 
 
+@traced
 def register_source(
     source_name: str,
     owner: str,
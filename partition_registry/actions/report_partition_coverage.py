@@ -0,0 +1,64 @@
+import datetime as dt
+
+from partition_registry.actor.events_registry import EventsRegistry
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.event import EventType
+from partition_registry.data.readiness import CoverageGap
+from partition_registry.data.readiness import CoverageReport
+from partition_registry.data.readiness import LockedPartition
+
+
+@traced
+def report_partition_coverage(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_name: str,
+    events_registry: EventsRegistry,
+) -> CoverageReport:
+    """Every gap and every lock of requested interval, unlike readiness check stopping at the first one"""
+    sweep = CoverageSweep(start, end)
+    for partition_id, partition_start, partition_end, event_type in events_registry.stream_coverage(start, end, source_name):
+        sweep.add(partition_id, partition_start, partition_end, EventType(event_type))
+    return sweep.report()
+
+
+class CoverageSweep:
+    """Single pass over partitions with events ordered by start
+
+    Sorting is left to Postgres, the sweep keeps only the end of covered prefix of requested interval,
+    so memory is bounded by the size of the report rather than by the number of partitions.
+    Partitions are expected to intersect requested interval, locked partitions still cover it.
+    """
+
+    def __init__(self, start: dt.datetime, end: dt.datetime) -> None:
+        self.start = start
+        self.end = end
+        self.covered_until = start
+        self.covered = dt.timedelta()
+        self.partitions = 0
+        self.gaps: list[CoverageGap] = []
+        self.locked: list[LockedPartition] = []
+
+    def add(self, partition_id: int, start: dt.datetime, end: dt.datetime, event_type: EventType) -> None:
+        self.partitions += 1
+        if event_type == EventType.LOCK:
+            self.locked.append(LockedPartition(partition_id, start, end))
+
+        if start > self.covered_until:
+            self.gaps.append(CoverageGap(self.covered_until, min(start, self.end)))
+            self.covered_until = min(start, self.end)
+
+        covered_until = max(self.covered_until, min(end, self.end))
+        self.covered += covered_until - self.covered_until
+        self.covered_until = covered_until
+
+    def report(self) -> CoverageReport:
+        gaps = self.gaps
+        if self.covered_until < self.end:
+            gaps = [*gaps, CoverageGap(self.covered_until, self.end)]
+
+        length = self.end - self.start
+        covered_fraction = self.covered / length if length > dt.timedelta() else 0.0
+        return CoverageReport(self.partitions, gaps, self.locked, covered_fraction)
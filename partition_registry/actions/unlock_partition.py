@@ -5,6 +5,8 @@ from partition_registry.actor.partition_registry import PartitionRegistry
 from partition_registry.actor.source_registry import SourceRegistry
 from partition_registry.actor.provider_registry import ProviderRegistry
 
+from partition_registry.integration.tracing import traced
+
 from partition_registry.data.event import RegisteredPartitionEvent
 from partition_registry.data.event import EventType
 
@@ -15,6 +17,7 @@ from partition_registry.data.status import LookupFailed
 from partition_registry.data.status import FailedPersist
 
 
+@traced
 def unlock_partition(
     start: dt.datetime,
     end: dt.datetime,
@@ -0,0 +1,37 @@
+import time
+from typing import Awaitable
+from typing import Callable
+
+from partition_registry.actor.source_changes import SourceChanges
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+
+
+@traced
+async def wait_partition_readiness(
+    source_name: str,
+    check: Callable[[], Awaitable[PartitionReady | PartitionNotReady]],
+    source_changes: SourceChanges,
+    timeout: float,
+    recheck_interval: float,
+) -> PartitionReady | PartitionNotReady:
+    """Check readiness until the interval is ready or timeout expires, returns the last result
+
+    Readiness is checked again on every change of the source, and at least every `recheck_interval` seconds
+    to notice writes not seen by this process.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        # Version is read first: a change made during the check wakes the waiter immediately
+        version = source_changes.version(source_name)
+        result = await check()
+        remaining = deadline - time.monotonic()
+        match result:
+            case PartitionReady():
+                return result
+        if remaining <= 0:
+            return result
+        await source_changes.wait(source_name, version, min(remaining, recheck_interval))
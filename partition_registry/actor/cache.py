@@ -0,0 +1,101 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable
+from typing import Generic
+from typing import Hashable
+from typing import Protocol
+from typing import TypeVar
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+KeyT = TypeVar('KeyT', bound=Hashable, contravariant=True)
+
+
+class Cache(Protocol[KeyT, V]):
+    """Interface of in-memory caches used by registries"""
+
+    def get(self, key: KeyT) -> V | None: ...
+
+    def put(self, key: KeyT, value: V) -> None: ...
+
+    def invalidate(self, key: KeyT) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded cache evicting least recently used entries and entries older than `ttl` seconds
+
+    Safe to share between threads of one worker.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> V | None:
+        with self.lock:
+            match self.entries.get(key):
+                case (value, expires_at) if expires_at is None or expires_at > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                case (_, _):
+                    del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: K, value: V) -> None:
+        if self.max_size <= 0:
+            return
+
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def init_cache(name: str, max_size: int = 10000, ttl: float = 300) -> LRUCache[K, V]:
+    """Cache configured by PARTITION_REGISTRY_<NAME>_CACHE_SIZE and PARTITION_REGISTRY_<NAME>_CACHE_TTL"""
+    max_size = int(os.getenv(f'PARTITION_REGISTRY_{name}_CACHE_SIZE', str(max_size)))
+    ttl = float(os.getenv(f'PARTITION_REGISTRY_{name}_CACHE_TTL', str(ttl)))
+    return LRUCache(max_size=max_size, ttl=ttl if ttl > 0 else None)
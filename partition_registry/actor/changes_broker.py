@@ -0,0 +1,66 @@
+import asyncio
+from typing import AsyncIterator
+
+from partition_registry.data.change import SourceChange
+
+
+class Subscription:
+    """Changes of the given sources (of every source if none given) pending delivery to a subscriber"""
+
+    def __init__(self, source_names: frozenset[str], max_pending: int) -> None:
+        self.source_names = source_names
+        # None marks the end of the subscription
+        self.queue: asyncio.Queue[SourceChange | None] = asyncio.Queue(max_pending)
+
+    def accepts(self, change: SourceChange) -> bool:
+        return not self.source_names or change.source_name in self.source_names
+
+    def close(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ChangesBroker:
+    """Fans changes received by the worker out to subscribers of their sources
+
+    Subscriber falling behind by `max_pending` changes is disconnected and expected to subscribe again.
+    Methods are called within the event loop of the worker.
+    """
+
+    def __init__(self, max_pending: int = 1000) -> None:
+        self.max_pending = max_pending
+        self.subscriptions: set[Subscription] = set()
+
+    def subscribe(self, source_names: frozenset[str]) -> Subscription:
+        subscription = Subscription(source_names, self.max_pending)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def publish(self, change: SourceChange) -> None:
+        for subscription in list(self.subscriptions):
+            if not subscription.accepts(change):
+                continue
+            try:
+                subscription.queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self.unsubscribe(subscription)
+                subscription.close()
+
+    async def server_sent_events(self, subscription: Subscription, keepalive: float) -> AsyncIterator[str]:
+        """Changes of the subscription as Server-Sent Events, comments are sent while there are no changes"""
+        try:
+            while True:
+                try:
+                    change = await asyncio.wait_for(subscription.queue.get(), keepalive)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if change is None:
+                    return
+                yield f"event: {change.change_type.value}\ndata: {change.to_json()}\n\n"
+        finally:
+            self.unsubscribe(subscription)
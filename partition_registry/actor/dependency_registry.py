@@ -0,0 +1,81 @@
+from sqlalchemy.orm import scoped_session
+from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy import Select
+
+from partition_registry.actor.source_registry import SourceRegistry
+
+from partition_registry.integration.tracing import traced
+
+from partition_registry.orm import DependencyGroupsORM
+from partition_registry.orm import SourcesRegistryORM
+
+from partition_registry.data.dependency import DependencyGroup
+from partition_registry.data.source import RegisteredSource
+
+from partition_registry.data.status import ValidationFailed
+from partition_registry.data.status import FailedPersist
+from partition_registry.data.status import LookupFailed
+
+
+class DependencyRegistry:
+    def __init__(self, session: scoped_session[Session]) -> None:
+        self.session = session
+        self.table = DependencyGroupsORM
+
+    @traced
+    def safe_register(
+        self,
+        group_name: str,
+        source_names: list[str],
+        source_registry: SourceRegistry,
+    ) -> DependencyGroup | ValidationFailed | LookupFailed | FailedPersist:
+        """Register dependency group, sources of already registered group are replaced"""
+        group = DependencyGroup(group_name, tuple(dict.fromkeys(source_names)))
+        match group.safe_validate():
+            case ValidationFailed() as failed_validation:
+                return failed_validation
+
+        sources: list[RegisteredSource] = []
+        for source_name in group.source_names:
+            match source_registry.lookup_registered(source_name):
+                case LookupFailed() as lookup_failed:
+                    return lookup_failed
+                case RegisteredSource() as registered_source:
+                    sources.append(registered_source)
+
+        return self.persist(group, sources)
+
+    @traced
+    def lookup_registered(self, group_name: str) -> DependencyGroup | LookupFailed:
+        source_names = (
+            self.session
+            .scalars(group_sources(group_name))
+            .all()
+        )
+        if not source_names:
+            return LookupFailed(f"DependencyGroup<<{group_name}>> not registered...")
+        return DependencyGroup(group_name, tuple(source_names))
+
+    @traced
+    def persist(self, group: DependencyGroup, sources: list[RegisteredSource]) -> DependencyGroup | FailedPersist:
+        try:
+            self.session.execute(delete(self.table).where(self.table.name == group.name))
+            self.session.add_all([self.table(name=group.name, source_id=source.source_id) for source in sources])
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            return FailedPersist(f"Persist failed with error: {e}")
+
+        return group
+
+
+def group_sources(group_name: str) -> Select[tuple[str]]:
+    """Names of sources of the dependency group"""
+    return (
+        select(SourcesRegistryORM.name)
+        .join(DependencyGroupsORM, DependencyGroupsORM.source_id == SourcesRegistryORM.id)
+        .where(DependencyGroupsORM.name == group_name)
+        .order_by(SourcesRegistryORM.name)
+    )
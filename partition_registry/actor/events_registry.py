@@ -1,16 +1,33 @@
 import datetime as dt
+from typing import Any
+from typing import Iterator
 
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import scoped_session
 from sqlalchemy import func
-from sqlalchemy import and_
+from sqlalchemy import select
+from sqlalchemy import Select
+from sqlalchemy import Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import Insert
 
 from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.partition_registry import overlaps
 from partition_registry.actor.source_registry import SourceRegistry
 from partition_registry.actor.provider_registry import ProviderRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_cache import ReadinessCache
+from partition_registry.actor.source_changes import SourceChanges
+from partition_registry.actor.cache import Cache
+from partition_registry.actor.cache import init_cache
+
+from partition_registry.integration.notifications import notify_statement
+from partition_registry.integration.tracing import traced
 
 from partition_registry.orm import PartitionEventsORM
+from partition_registry.orm import PartitionStateORM
 from partition_registry.orm import PartitionsRegistryORM
+from partition_registry.orm import SourcesRegistryORM
 
 from partition_registry.data.source import RegisteredSource
 from partition_registry.data.provider import RegisteredProvider
@@ -24,14 +41,117 @@ from partition_registry.data.event import SimplePartitionEvent
 from partition_registry.data.event import SimplifiedPartitionEventORM
 from partition_registry.data.event import RegisteredPartitionEvent
 from partition_registry.data.event import EventType
+from partition_registry.data.readiness import ReadinessSummary
+from partition_registry.data.change import ChangeType
+from partition_registry.data.change import SourceChange
+
+
+def readiness_summary_statement(start: dt.datetime, end: dt.datetime, source_name: str) -> Select[tuple[Any, ...]]:
+    """Single statement version of `evaluate_partition_readiness`
+
+    Partitions intersected with requested interval get their last events from partition state, partitions with events
+    are ordered by start, and the first one starting after every previous partition ended opens a gap.
+    """
+    overlapping = (
+        select(PartitionsRegistryORM.id, PartitionsRegistryORM.start, PartitionsRegistryORM.end)
+        .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
+        .filter(SourcesRegistryORM.name == source_name)
+        .filter(overlaps(start, end))
+        .cte('overlapping')
+    )
+
+    last_events = (
+        select(PartitionStateORM.partition_id, PartitionStateORM.event_type)
+        .filter(PartitionStateORM.partition_id.in_(select(overlapping.c.id)))
+        .cte('last_events')
+    )
+
+    covered = (
+        select(overlapping)
+        .filter(overlapping.c.id.in_(select(last_events.c.partition_id)))
+        .cte('covered')
+    )
+    islands = (
+        select(
+            covered.c.start,
+            func.max(covered.c.end)
+                .over(order_by=(covered.c.start, covered.c.end), rows=(None, -1))
+                .label('previous_end')
+        )
+        .cte('islands')
+    )
+    gaps = islands.c.previous_end < islands.c.start
+
+    return select(
+        select(func.count()).select_from(overlapping).scalar_subquery(),
+        select(func.count()).select_from(last_events).scalar_subquery(),
+        select(func.min(last_events.c.partition_id)).filter(last_events.c.event_type == EventType.LOCK.value).scalar_subquery(),
+        select(func.min(covered.c.start)).scalar_subquery(),
+        select(func.max(covered.c.end)).scalar_subquery(),
+        select(islands.c.previous_end).filter(gaps).order_by(islands.c.start).limit(1).scalar_subquery(),
+        select(islands.c.start).filter(gaps).order_by(islands.c.start).limit(1).scalar_subquery(),
+    )
+
+
+# Rows of coverage are fetched from the server in chunks of this size
+COVERAGE_CHUNK_SIZE = 1000
+
+
+def coverage_statement(
+    start: dt.datetime,
+    end: dt.datetime,
+    source_name: str,
+) -> Select[tuple[int, dt.datetime, dt.datetime, str]]:
+    """Partitions with events intersected with requested interval together with their last event types, ordered by start"""
+    return (
+        select(PartitionsRegistryORM.id, PartitionsRegistryORM.start, PartitionsRegistryORM.end, PartitionStateORM.event_type)
+        .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
+        .join(PartitionStateORM, PartitionStateORM.partition_id == PartitionsRegistryORM.id)
+        .filter(SourcesRegistryORM.name == source_name)
+        .filter(overlaps(start, end))
+        .order_by(PartitionsRegistryORM.start, PartitionsRegistryORM.end)
+        .execution_options(yield_per=COVERAGE_CHUNK_SIZE)
+    )
+
+
+def source_change(event: SimplePartitionEvent) -> SourceChange:
+    return SourceChange(event.source.name, event.partition.partition_id, ChangeType(event.event_type.value))
+
+
+def update_partition_state(record: PartitionEventsORM) -> Insert:
+    """Make the event last one of its partition, unless a later event is already there"""
+    statement = insert(PartitionStateORM).values(
+        partition_id=record.partition_id,
+        event_type=record.event_type,
+        registered_at=record.registered_at,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[PartitionStateORM.partition_id],
+        set_={'event_type': statement.excluded.event_type, 'registered_at': statement.excluded.registered_at},
+        where=PartitionStateORM.registered_at <= statement.excluded.registered_at,
+    )
 
 
 class EventsRegistry:
-    def __init__(self, session: scoped_session[Session]) -> None:
+    def __init__(
+        self,
+        session: scoped_session[Session],
+        readiness_index: ReadinessIndex | None = None,
+        cache: Cache[SimplePartitionEvent, RegisteredPartitionEvent] | None = None,
+        readiness_cache: ReadinessCache | None = None,
+        source_changes: SourceChanges | None = None,
+        notify_channel: str | None = None,
+    ) -> None:
         self.session = session
         self.table = PartitionEventsORM
-        self.cache: dict[SimplePartitionEvent, RegisteredPartitionEvent] = {}
+        self.cache: Cache[SimplePartitionEvent, RegisteredPartitionEvent] = cache if cache is not None else init_cache('EVENT')
+        self.readiness_index = readiness_index
+        self.readiness_cache = readiness_cache
+        self.source_changes = source_changes
+        # Writes are published to every worker with NOTIFY when set
+        self.notify_channel = notify_channel
 
+    @traced
     def safe_register(
         self,
         start: dt.datetime,
@@ -74,66 +194,72 @@ class EventsRegistry:
             case FailedPersist() as failed_persist:
                 return failed_persist
             case RegisteredPartitionEvent() as registered_event:
-                self.cache[event] = registered_event
+                self.cache.put(event, registered_event)
+                if self.readiness_index is not None:
+                    self.readiness_index.add_event(registered_event)
+                if self.readiness_cache is not None:
+                    self.readiness_cache.bump(source_name)
+                if self.source_changes is not None:
+                    self.source_changes.notify(source_name)
 
         return registered_event
 
+    @traced
     def persist(self, event: SimplePartitionEvent) -> RegisteredPartitionEvent | FailedPersist:
         session = self.session
         record = PartitionEventsORM(
             partition_id=event.partition.partition_id,
             event_type=event.event_type.value,
+            registered_at=dt.datetime.now(dt.timezone.utc),
+        )
+        # Events table has no primary key, so the record can't be reloaded after commit:
+        # every event of the partition would match it. Keep the values before they expire
+        registered_event = RegisteredPartitionEvent(
+            partition=event.partition,
+            event_type=event.event_type,
+            registered_at=record.registered_at
         )
         try:
             session.add(record)
+            session.execute(update_partition_state(record))
+            if self.notify_channel is not None:
+                session.execute(notify_statement(self.notify_channel, [source_change(event)]))
+            session.commit()
         except Exception as e:
+            session.rollback()
             return FailedPersist(f"Persist failed with error: {e}")
 
-        session.commit()
+        session.expunge(record)
 
-        match record.event_type:
-            case EventType.LOCK.value:
-                event_type = EventType.LOCK
-            case EventType.UNLOCK.value:
-                event_type = EventType.UNLOCK
-            case unexpected:
-                return FailedPersist(f"Event type has unexpected value: {unexpected}")
-
-        return RegisteredPartitionEvent(
-            partition=event.partition,
-            event_type=event_type,
-            registered_at=record.registered_at
-        )
+        return registered_event
 
+    @traced
     def get_partition_events(
         self,
         partitions: list[PartitionsRegistryORM]
     ) -> list[SimplifiedPartitionEventORM]:
         """Get last events by every specified partition"""
-        last_events_subquery = (
-            self.session
-            .query(
-                self.table.partition_id,
-                func.max(self.table.registered_at)
-                    .over(partition_by=self.table.partition_id)
-                    .label('max_registered_at')
-            )
-            .filter(self.table.partition_id.in_([partition.id for partition in partitions]))
-            .subquery('last_events')
-        )
-
         rows = (
             self.session
-            .query(self.table.partition_id, self.table.event_type, self.table.registered_at)
-            .join(
-                last_events_subquery,
-                and_(
-                    last_events_subquery.c.partition_id == self.table.partition_id,
-                    last_events_subquery.c.max_registered_at == self.table.registered_at
-                )
-            )
-            .distinct()
+            .query(PartitionStateORM.partition_id, PartitionStateORM.event_type, PartitionStateORM.registered_at)
+            .filter(PartitionStateORM.partition_id.in_([partition.id for partition in partitions]))
             .all()
         )
 
-        return [SimplifiedPartitionEventORM(row[0], row[1], row[2]) for row in rows]
+        return [SimplifiedPartitionEventORM(row[0], EventType(row[1]), row[2]) for row in rows]
+
+    @traced
+    def get_readiness_summary(self, start: dt.datetime, end: dt.datetime, source_name: str) -> ReadinessSummary:
+        """Evaluate everything needed for readiness verdict within one statement"""
+        row = self.session.execute(readiness_summary_statement(start, end, source_name)).one()
+        return ReadinessSummary(*row)
+
+    @traced
+    def stream_coverage(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+    ) -> Iterator[Row[tuple[int, dt.datetime, dt.datetime, str]]]:
+        """Rows of `coverage_statement`, fetched with a server side cursor"""
+        yield from self.session.execute(coverage_statement(start, end, source_name))
@@ -2,13 +2,30 @@ import datetime as dt
 
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from sqlalchemy import and_
-
-
+from sqlalchemy import func
+from sqlalchemy import ColumnElement
+from sqlalchemy import values
+from sqlalchemy import column
+from sqlalchemy import INTEGER
+from sqlalchemy import TEXT
+from sqlalchemy import DateTime
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import TSTZRANGE
 
 from partition_registry.actor.source_registry import SourceRegistry
 from partition_registry.actor.provider_registry import ProviderRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_cache import ReadinessCache
+from partition_registry.actor.source_changes import SourceChanges
+from partition_registry.actor.cache import Cache
+from partition_registry.actor.cache import init_cache
+
+from partition_registry.integration.notifications import notify_statement
+from partition_registry.integration.tracing import traced
 
 from partition_registry.orm import PartitionsRegistryORM
 from partition_registry.orm import ProvidersRegistryORM
@@ -17,8 +34,12 @@ from partition_registry.orm import SourcesRegistryORM
 from partition_registry.data.source import RegisteredSource
 from partition_registry.data.provider import RegisteredProvider
 from partition_registry.data.partition import RegisteredPartition
+from partition_registry.data.partition import CachedPartition
 
 from partition_registry.data.partition import SimplePartition
+from partition_registry.data.request import ReadinessRequest
+from partition_registry.data.change import ChangeType
+from partition_registry.data.change import SourceChange
 
 from partition_registry.data.status import FailedPersist
 from partition_registry.data.status import ValidationFailed
@@ -27,12 +48,32 @@ from partition_registry.data.status import AlreadyRegistered
 from partition_registry.data.status import AccessDenied
 
 
+RegistrationOutcome = RegisteredPartition | AlreadyRegistered | ValidationFailed
+
+# (start, end, source_id, provider_id)
+PartitionKey = tuple[dt.datetime, dt.datetime, int, int]
+
+
 class PartitionRegistry:
-    def __init__(self, session: scoped_session[Session]) -> None:
+    def __init__(
+        self,
+        session: scoped_session[Session],
+        readiness_index: ReadinessIndex | None = None,
+        cache: Cache[PartitionKey, CachedPartition] | None = None,
+        readiness_cache: ReadinessCache | None = None,
+        source_changes: SourceChanges | None = None,
+        notify_channel: str | None = None,
+    ) -> None:
         self.session = session
         self.table = PartitionsRegistryORM
-        self.cache: dict[tuple[dt.datetime, dt.datetime, RegisteredSource, RegisteredProvider], RegisteredPartition] = {}
+        self.cache: Cache[PartitionKey, CachedPartition] = cache if cache is not None else init_cache('PARTITION')
+        self.readiness_index = readiness_index
+        self.readiness_cache = readiness_cache
+        self.source_changes = source_changes
+        # Writes are published to every worker with NOTIFY when set
+        self.notify_channel = notify_channel
 
+    @traced
     def safe_register(
         self,
         start: dt.datetime,
@@ -74,13 +115,71 @@ class PartitionRegistry:
 
         match self.persist(start, end, registered_source, registered_provider):
             case RegisteredPartition() as registered_partition:
-                key = (start, end, registered_source, registered_provider)
-                self.cache[key] = registered_partition
+                self.cache.put(*cache_entry(registered_partition))
+                if self.readiness_index is not None:
+                    self.readiness_index.add_partition(registered_partition)
+                if self.readiness_cache is not None:
+                    self.readiness_cache.bump(source_name)
+                if self.source_changes is not None:
+                    self.source_changes.notify(source_name)
             case FailedPersist() as failed_persist:
                 return failed_persist
 
         return registered_partition
 
+    @traced
+    def safe_register_many(
+        self,
+        partitions: list[SimplePartition],
+        source_name: str,
+        source_registry: SourceRegistry,
+        provider_name: str,
+        provider_registry: ProviderRegistry,
+    ) -> list[RegistrationOutcome] | FailedPersist | LookupFailed | AccessDenied:
+        """Register many partitions of one source/provider pair
+
+        Already registered partitions are found with one lookup query,
+        all new partitions are inserted with one multi-row statement.
+        Returns outcome for every given partition in the same order.
+        """
+        match source_registry.lookup_registered(source_name):
+            case RegisteredSource() as registered_source: ...
+            case LookupFailed() as lookup_failed:
+                return lookup_failed
+
+        match provider_registry.lookup_registered(provider_name):
+            case RegisteredProvider() as registered_provider: ...
+            case LookupFailed() as lookup_failed:
+                return lookup_failed
+
+        if registered_provider.access_token != registered_source.access_token:
+            return AccessDenied(
+                f"<<{registered_provider}>> has no access to source <<{registered_source.name}>>. "
+                f"Ask <<{registered_source.owner}>> to get access to the source..."
+            )
+
+        outcomes, valid_partitions = validate_partitions(partitions)
+        registered = self.db_lookup_many(valid_partitions, registered_source, registered_provider)
+        new_partitions = skip_registered(partitions, outcomes, set(registered))
+
+        match self.persist_many(new_partitions, registered_source, registered_provider):
+            case FailedPersist() as failed_persist:
+                return failed_persist
+            case list() as persisted:
+                ...
+
+        for registered_partition in persisted:
+            self.cache.put(*cache_entry(registered_partition))
+            if self.readiness_index is not None:
+                self.readiness_index.add_partition(registered_partition)
+        if persisted and self.readiness_cache is not None:
+            self.readiness_cache.bump(source_name)
+        if persisted and self.source_changes is not None:
+            self.source_changes.notify(source_name)
+
+        return merge_persisted(outcomes, persisted)
+
+    @traced
     def lookup_registered(
         self,
         start: dt.datetime,
@@ -88,11 +187,15 @@ class PartitionRegistry:
         source: RegisteredSource,
         provider: RegisteredProvider
     ) -> RegisteredPartition | LookupFailed:
-        return (
-            self.memory_lookup(start, end, source, provider)
-            or self.db_lookup(start, end, source, provider)
-            or LookupFailed(f"Partition<<{start} : {end}>> not registered...")
-        )
+        if (registered_partition := self.memory_lookup(start, end, source, provider)) is not None:
+            return registered_partition
+
+        match self.db_lookup(start, end, source, provider):
+            case RegisteredPartition() as registered_partition:
+                self.cache.put(*cache_entry(registered_partition))
+                return registered_partition
+            case None:
+                return LookupFailed(f"Partition<<{start} : {end}>> not registered...")
 
     def memory_lookup(
         self,
@@ -101,8 +204,11 @@ class PartitionRegistry:
         source: RegisteredSource,
         provider: RegisteredProvider,
     ) -> RegisteredPartition | None:
-        key = (start, end, source, provider)
-        return self.cache.get(key)
+        match self.cache.get(partition_key(start, end, source, provider)):
+            case CachedPartition() as cached_partition:
+                return cached_partition.to_registered(source, provider)
+            case None:
+                return None
 
     def is_registered(
         self,
@@ -113,6 +219,7 @@ class PartitionRegistry:
     ) -> bool:
         return isinstance(self.lookup_registered(start, end, source, provider), RegisteredPartition)
 
+    @traced
     def db_lookup(
         self,
         start: dt.datetime,
@@ -144,6 +251,53 @@ class PartitionRegistry:
             )
         return None
 
+    @traced
+    def db_lookup_many(
+        self,
+        partitions: list[SimplePartition],
+        source: RegisteredSource,
+        provider: RegisteredProvider,
+    ) -> dict[tuple[dt.datetime, dt.datetime], RegisteredPartition]:
+        """Find already registered partitions of source/provider pair with one query
+
+        Intervals are bound as two arrays joined with `unnest`, so the number of
+        parameters doesn't grow with the number of partitions.
+        """
+        if not partitions:
+            return {}
+
+        timestamps = ARRAY(DateTime(timezone=True))
+        requested = (
+            func.unnest(
+                literal([partition.start for partition in partitions], timestamps),
+                literal([partition.end for partition in partitions], timestamps),
+            )
+            .table_valued('start', 'end')
+            .render_derived(name='requested')
+        )
+
+        rows = (
+            self.session
+            .query(self.table)
+            .join(requested, and_(self.table.start == requested.c.start, self.table.end == requested.c.end))
+            .filter(self.table.source_id == source.source_id)
+            .filter(self.table.provider_id == provider.provider_id)
+            .all()
+        )
+
+        return {
+            (row.start, row.end): RegisteredPartition(
+                partition_id=row.id,
+                start=row.start,
+                end=row.end,
+                source=source,
+                provider=provider,
+                registered_at=row.registered_at
+            )
+            for row in rows
+        }
+
+    @traced
     def persist(
         self,
         start: dt.datetime,
@@ -160,11 +314,16 @@ class PartitionRegistry:
         )
         try:
             session.add(record)
+            if self.notify_channel is not None:
+                # Id of the partition is assigned on flush
+                session.flush()
+                change = SourceChange(source.name, record.id, ChangeType.REGISTER)
+                session.execute(notify_statement(self.notify_channel, [change]))
+            session.commit()
         except Exception as e:
+            session.rollback()
             return FailedPersist(f"Persist failed with error: {e}")
 
-        session.commit()
-
         return RegisteredPartition(
             partition_id=record.id,
             start=record.start,
@@ -174,6 +333,54 @@ class PartitionRegistry:
             registered_at=record.registered_at
         )
 
+    @traced
+    def persist_many(
+        self,
+        partitions: list[SimplePartition],
+        source: RegisteredSource,
+        provider: RegisteredProvider
+    ) -> list[RegisteredPartition] | FailedPersist:
+        """Insert partitions with one multi-row INSERT ... RETURNING statement"""
+        if not partitions:
+            return []
+
+        session = self.session
+        try:
+            records = session.scalars(
+                insert(PartitionsRegistryORM).returning(PartitionsRegistryORM, sort_by_parameter_order=True),
+                [
+                    {
+                        "start": partition.start,
+                        "end": partition.end,
+                        "source_id": source.source_id,
+                        "provider_id": provider.provider_id,
+                    }
+                    for partition in partitions
+                ]
+            ).all()
+            # Collect values before commit expires them, otherwise every record is reloaded with its own query
+            registered_partitions = [
+                RegisteredPartition(
+                    partition_id=record.id,
+                    start=record.start,
+                    end=record.end,
+                    source=source,
+                    provider=provider,
+                    registered_at=record.registered_at
+                )
+                for record in records
+            ]
+            if self.notify_channel is not None:
+                changes = [SourceChange(source.name, partition.partition_id, ChangeType.REGISTER) for partition in registered_partitions]
+                session.execute(notify_statement(self.notify_channel, changes))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            return FailedPersist(f"Persist failed with error: {e}")
+
+        return registered_partitions
+
+    @traced
     def get_filtered_partitions(
         self,
         start: dt.datetime,
@@ -190,19 +397,134 @@ class PartitionRegistry:
             .query(PartitionsRegistryORM)
             .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
             .filter(SourcesRegistryORM.name == source_name)
-            .filter(
-                or_(
-                    and_(
-                        PartitionsRegistryORM.start <= start,
-                        start < PartitionsRegistryORM.end
-                    ),
-                    and_(
-                        PartitionsRegistryORM.start < end,
-                        end <= PartitionsRegistryORM.end
-                    )
-                )
-            )
+            .filter(overlaps(start, end))
             .distinct()
             .all()
         )
         return rows
+
+    @traced
+    def get_source_partitions(self, source_name: str) -> list[PartitionsRegistryORM]:
+        """Get all registered partitions by source"""
+        rows = (
+            self.session
+            .query(PartitionsRegistryORM)
+            .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
+            .filter(SourcesRegistryORM.name == source_name)
+            .all()
+        )
+        return rows
+
+    @traced
+    def get_filtered_partitions_batch(
+        self,
+        requests: list[ReadinessRequest],
+    ) -> dict[int, list[PartitionsRegistryORM]]:
+        """
+        Get registered partitions intersecting every requested interval in one query.
+        Result is keyed by the position of the request in the given list
+        """
+        if not requests:
+            return {}
+
+        requested = (
+            values(
+                column('position', INTEGER),
+                column('source_name', TEXT),
+                column('start', DateTime(timezone=True)),
+                column('end', DateTime(timezone=True)),
+                name='requested',
+            )
+            .data([
+                (position, request.source_name, request.start, request.end)
+                for position, request in enumerate(requests)
+            ])
+        )
+
+        rows = (
+            self.session
+            .query(requested.c.position, PartitionsRegistryORM)
+            .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
+            .join(
+                requested,
+                and_(
+                    requested.c.source_name == SourcesRegistryORM.name,
+                    overlaps(requested.c.start, requested.c.end),
+                )
+            )
+            .all()
+        )
+
+        partitions: dict[int, list[PartitionsRegistryORM]] = {position: [] for position in range(len(requests))}
+        for position, partition in rows:
+            partitions[position].append(partition)
+        return partitions
+
+
+def overlaps(start: dt.datetime | ColumnElement[dt.datetime], end: dt.datetime | ColumnElement[dt.datetime]) -> ColumnElement[bool]:
+    """Partitions intersected with [start, end), answered by the GiST index on periods
+
+    Period of a partition must be the indexed expression itself, so bounds are inlined rather than bound as a parameter.
+    """
+    period = func.tstzrange(PartitionsRegistryORM.start, PartitionsRegistryORM.end, literal_column("'[)'"), type_=TSTZRANGE)
+    return period.overlaps(func.tstzrange(start, end, '[)'))
+
+
+def partition_key(
+    start: dt.datetime,
+    end: dt.datetime,
+    source: RegisteredSource,
+    provider: RegisteredProvider,
+) -> PartitionKey:
+    return (start, end, source.source_id, provider.provider_id)
+
+
+def cache_entry(partition: RegisteredPartition) -> tuple[PartitionKey, CachedPartition]:
+    """Key and entry of the partition cache sharing start and end of the partition"""
+    cached_partition = CachedPartition.from_registered(partition)
+    key = (cached_partition.start, cached_partition.end, cached_partition.source_id, cached_partition.provider_id)
+    return key, cached_partition
+
+
+def validate_partitions(
+    partitions: list[SimplePartition]
+) -> tuple[list[RegistrationOutcome | None], list[SimplePartition]]:
+    """Validate partitions in one pass. Valid partitions have no outcome yet"""
+    outcomes: list[RegistrationOutcome | None] = []
+    valid_partitions: list[SimplePartition] = []
+    for partition in partitions:
+        match partition.safe_validate():
+            case ValidationFailed() as failed_validation:
+                outcomes.append(failed_validation)
+            case _:
+                outcomes.append(None)
+                valid_partitions.append(partition)
+    return outcomes, valid_partitions
+
+
+def skip_registered(
+    partitions: list[SimplePartition],
+    outcomes: list[RegistrationOutcome | None],
+    registered: set[tuple[dt.datetime, dt.datetime]],
+) -> list[SimplePartition]:
+    """Mark already registered partitions in outcomes and return the ones to persist"""
+    new_partitions: list[SimplePartition] = []
+    for position, partition in enumerate(partitions):
+        if outcomes[position] is not None:
+            continue
+        bounds = (partition.start, partition.end)
+        if bounds in registered:
+            outcomes[position] = AlreadyRegistered(partition)
+        else:
+            # Partitions repeated within the batch are persisted only once
+            registered.add(bounds)
+            new_partitions.append(partition)
+    return new_partitions
+
+
+def merge_persisted(
+    outcomes: list[RegistrationOutcome | None],
+    persisted: list[RegisteredPartition],
+) -> list[RegistrationOutcome]:
+    persisted_partitions = iter(persisted)
+    return [outcome if outcome is not None else next(persisted_partitions) for outcome in outcomes]
@@ -10,15 +10,30 @@ from partition_registry.data.status import ValidationFailed
 from partition_registry.data.status import AlreadyRegistered
 from partition_registry.data.status import LookupFailed
 
+from partition_registry.actor.cache import Cache
+from partition_registry.actor.cache import init_cache
+
+from partition_registry.integration.tracing import traced
+
 from partition_registry.orm import ProvidersRegistryORM
 
 
 class ProviderRegistry:
-    def __init__(self, session: scoped_session[Session]) -> None:
+    def __init__(
+        self,
+        session: scoped_session[Session],
+        cache: Cache[str, RegisteredProvider] | None = None,
+        missing_cache: Cache[str, LookupFailed] | None = None,
+    ) -> None:
         self.session = session
         self.table = ProvidersRegistryORM
-        self.cache: dict[str, RegisteredProvider] = {}
+        self.cache: Cache[str, RegisteredProvider] = cache if cache is not None else init_cache('PROVIDER')
+        # Short-lived, names registered by other workers are seen once it expires
+        self.missing_cache: Cache[str, LookupFailed] = (
+            missing_cache if missing_cache is not None else init_cache('MISSING_PROVIDER', ttl=5)
+        )
 
+    @traced
     def safe_register(
         self,
         provider_name: str,
@@ -29,25 +44,38 @@ class ProviderRegistry:
             case ValidationFailed() as failed_validation:
                 return failed_validation
 
+        # Registration must not trust cached misses, the name may be taken by another worker
+        self.missing_cache.invalidate(simple_provider.name)
         if self.is_registered(simple_provider.name):
             return AlreadyRegistered(simple_provider)
 
         token = AccessToken(access_token)
         match self.persist(simple_provider, token):
             case RegisteredProvider() as registered_provider:
-                self.cache[simple_provider.name] = registered_provider
+                self.cache.put(simple_provider.name, registered_provider)
+                self.missing_cache.invalidate(simple_provider.name)
             case FailedPersist() as failed_persist:
                 return failed_persist
 
         return registered_provider
 
 
+    @traced
     def lookup_registered(self, provider_name: str) -> RegisteredProvider | LookupFailed:
-        return (
-            self.memory_lookup(provider_name)
-            or self.db_lookup(provider_name)
-            or LookupFailed(f"Provider<<{provider_name}>> not registered...")
-        )
+        if (registered_provider := self.memory_lookup(provider_name)) is not None:
+            return registered_provider
+
+        if (lookup_failed := self.missing_cache.get(provider_name)) is not None:
+            return lookup_failed
+
+        match self.db_lookup(provider_name):
+            case RegisteredProvider() as registered_provider:
+                self.cache.put(provider_name, registered_provider)
+                return registered_provider
+            case None:
+                lookup_failed = LookupFailed(f"Provider<<{provider_name}>> not registered...")
+                self.missing_cache.put(provider_name, lookup_failed)
+                return lookup_failed
 
     def is_registered(self, provider_name: str) -> bool:
         return isinstance(self.lookup_registered(provider_name), RegisteredProvider)
@@ -55,6 +83,7 @@ class ProviderRegistry:
     def memory_lookup(self, provider_name: str) -> RegisteredProvider | None:
         return self.cache.get(provider_name)
 
+    @traced
     def db_lookup(self, provider_name: str) -> RegisteredProvider | None:
         session = self.session
         rows = (
@@ -75,15 +104,16 @@ class ProviderRegistry:
 
         return None
 
+    @traced
     def persist(self, provider: SimpleProvider, access_token: AccessToken) -> RegisteredProvider | FailedPersist:
         record = ProvidersRegistryORM(name=provider.name, access_token=access_token.token)
         session = self.session
         try:
             session.add(record)
+            session.commit()
         except Exception as e:
+            session.rollback()
             return FailedPersist(f"Persist failed with error: {e}")
-        else:
-            session.commit()
 
         return RegisteredProvider(
             provider_id=record.id,
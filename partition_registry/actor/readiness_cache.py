@@ -0,0 +1,63 @@
+import datetime as dt
+import threading
+
+from partition_registry.actor.cache import Cache
+from partition_registry.actor.cache import init_cache
+
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+
+
+# (source_name, version, start, end)
+ReadinessKey = tuple[str, int, dt.datetime, dt.datetime]
+
+
+class ReadinessCache:
+    """Results of readiness checks, valid until the next write to the source
+
+    Registries bump version of the source on every registered partition or event,
+    results cached under older versions are never returned again and are evicted as least recently used.
+    """
+
+    def __init__(self, cache: Cache[ReadinessKey, PartitionReady | PartitionNotReady] | None = None) -> None:
+        self.results: Cache[ReadinessKey, PartitionReady | PartitionNotReady] = (
+            cache if cache is not None else init_cache('READINESS', ttl=60)
+        )
+        self.versions: dict[str, int] = {}
+        # Version of sources without writes, raised when every source is bumped
+        self.epoch = 0
+        self.lock = threading.Lock()
+
+    def version(self, source_name: str) -> int:
+        return self.versions.get(source_name, self.epoch)
+
+    def bump(self, source_name: str) -> None:
+        with self.lock:
+            self.versions[source_name] = self.versions.get(source_name, self.epoch) + 1
+
+    def bump_all(self) -> None:
+        """Drop results of every source, e.g. when changes of other processes may have been missed"""
+        with self.lock:
+            self.epoch += 1
+            for source_name in self.versions:
+                self.versions[source_name] += 1
+
+    def get(
+        self,
+        source_name: str,
+        version: int,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> PartitionReady | PartitionNotReady | None:
+        return self.results.get((source_name, version, start, end))
+
+    def put(
+        self,
+        source_name: str,
+        version: int,
+        start: dt.datetime,
+        end: dt.datetime,
+        result: PartitionReady | PartitionNotReady,
+    ) -> None:
+        """Store result computed for the given version, read it before querying the source state"""
+        self.results.put((source_name, version, start, end), result)
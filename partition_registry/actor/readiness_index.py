@@ -0,0 +1,172 @@
+import bisect
+import dataclasses as dc
+import datetime as dt
+import heapq
+import threading
+
+from partition_registry.data.partition import RegisteredPartition
+from partition_registry.data.event import RegisteredPartitionEvent
+from partition_registry.data.event import SimplifiedPartitionEventORM
+
+
+@dc.dataclass(frozen=True, slots=True)
+class IndexedPartition:
+    id: int
+    start: dt.datetime
+    end: dt.datetime
+
+
+class SpanBucket:
+    """Partitions with spans within a factor of two, kept as arrays sorted by partition start"""
+
+    def __init__(self) -> None:
+        self.starts: list[dt.datetime] = []
+        self.partitions: list[IndexedPartition] = []
+        self.max_span = dt.timedelta(0)
+
+    def add_partition(self, partition: IndexedPartition) -> None:
+        position = bisect.bisect_right(self.starts, partition.start)
+        self.starts.insert(position, partition.start)
+        self.partitions.insert(position, partition)
+        self.max_span = max(self.max_span, partition.end - partition.start)
+
+    def overlapping(self, start: dt.datetime, end: dt.datetime) -> list[IndexedPartition]:
+        lo = bisect.bisect_left(self.starts, start - self.max_span)
+        hi = bisect.bisect_left(self.starts, end)
+        return [partition for partition in self.partitions[lo:hi] if partition.end > start]
+
+
+def span_class(partition: IndexedPartition) -> int:
+    """Bucket of partitions with spans in `[2 ** (n - 1), 2 ** n)` seconds"""
+    return int((partition.end - partition.start).total_seconds()).bit_length()
+
+
+class SourceIntervalIndex:
+    """Partitions of a single source bucketed by the order of magnitude of their span
+
+    Every partition overlapping `[start : end)` starts within the longest span
+    of its bucket before `start`. Spans of a bucket differ at most twice, so a long
+    partition only widens the scan window of its own bucket: a lookup costs
+    O(b * log n + k + m) for `b` buckets (at most ~40 between seconds and centuries),
+    `k` overlapping partitions and `m` partitions ending less than one bucket span before `start`,
+    which is a couple per bucket for partitions that don't overlap each other.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, SpanBucket] = {}
+        self.events: dict[int, SimplifiedPartitionEventORM] = {}
+
+    def add_partition(self, partition: IndexedPartition) -> None:
+        key = span_class(partition)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = SpanBucket()
+        bucket.add_partition(partition)
+
+    def add_event(self, event: SimplifiedPartitionEventORM) -> None:
+        last_event = self.events.get(event.id)
+        if last_event is None or last_event.registered_at <= event.registered_at:
+            self.events[event.id] = event
+
+    def overlapping(self, start: dt.datetime, end: dt.datetime) -> list[IndexedPartition]:
+        """Overlapping partitions ordered by start"""
+        found = [overlapping for bucket in self.buckets.values() if (overlapping := bucket.overlapping(start, end))]
+        match found:
+            case []:
+                return []
+            case [partitions]:
+                return partitions
+            case _:
+                return list(heapq.merge(*found, key=lambda partition: partition.start))
+
+    def last_events(self, partitions: list[IndexedPartition]) -> list[SimplifiedPartitionEventORM]:
+        return [self.events[partition.id] for partition in partitions if partition.id in self.events]
+
+
+class ReadinessIndex:
+    """In-process interval index of partitions and their last events per source
+
+    A source is either warm (fully loaded, kept up to date by registrations and
+    lock/unlock events of this process) or cold (lookups return None and the
+    caller falls back to the database). Writes of other processes make the source cold.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sources: dict[str, SourceIntervalIndex] = {}
+        self.generations: dict[str, int] = {}
+        # Generation of sources without writes, raised when every source is invalidated
+        self.epoch = 0
+
+    def is_warm(self, source_name: str) -> bool:
+        return source_name in self.sources
+
+    def generation(self, source_name: str) -> int:
+        """Counter of writes seen for the source, used to detect races while warming"""
+        with self.lock:
+            return self.generations.get(source_name, self.epoch)
+
+    def warm(
+        self,
+        source_name: str,
+        partitions: list[IndexedPartition],
+        events: list[SimplifiedPartitionEventORM],
+        generation: int,
+    ) -> bool:
+        """Load full source state, unless a write happened since `generation` was taken"""
+        index = SourceIntervalIndex()
+        for partition in sorted(partitions, key=lambda p: p.start):
+            index.add_partition(partition)
+        for event in events:
+            index.add_event(event)
+
+        with self.lock:
+            if self.generations.get(source_name, self.epoch) != generation:
+                return False
+            self.sources[source_name] = index
+        return True
+
+    def lookup(
+        self,
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> tuple[list[IndexedPartition], list[SimplifiedPartitionEventORM]] | None:
+        with self.lock:
+            index = self.sources.get(source_name)
+            if index is None:
+                return None
+            partitions = index.overlapping(start, end)
+            return partitions, index.last_events(partitions)
+
+    def invalidate(self, source_name: str) -> None:
+        """Make source cold, e.g. written by another process, and refuse warm ups already loading it"""
+        with self.lock:
+            self.generations[source_name] = self.generations.get(source_name, self.epoch) + 1
+            self.sources.pop(source_name, None)
+
+    def invalidate_all(self) -> None:
+        """Make every source cold, e.g. when changes of other processes may have been missed"""
+        with self.lock:
+            self.epoch += 1
+            for source_name in self.generations:
+                self.generations[source_name] += 1
+            self.sources.clear()
+
+    def add_partition(self, partition: RegisteredPartition) -> None:
+        source_name = partition.source.name
+        with self.lock:
+            self.generations[source_name] = self.generations.get(source_name, self.epoch) + 1
+            index = self.sources.get(source_name)
+            if index is not None:
+                index.add_partition(IndexedPartition(partition.partition_id, partition.start, partition.end))
+
+    def add_event(self, event: RegisteredPartitionEvent) -> None:
+        source_name = event.partition.source.name
+        with self.lock:
+            self.generations[source_name] = self.generations.get(source_name, self.epoch) + 1
+            index = self.sources.get(source_name)
+            if index is not None:
+                index.add_event(
+                    SimplifiedPartitionEventORM(event.partition.partition_id, event.event_type, event.registered_at)
+                )
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+
+class SourceChanges:
+    """Versions of sources changed by this process, and requests waiting for their next change
+
+    Registries notify about every registered partition or event, so waiters are woken by writes instead of polling.
+    Writes may be handled by threadpool workers, every waiter is woken within its own event loop.
+    """
+
+    def __init__(self) -> None:
+        self.versions: dict[str, int] = {}
+        self.waiters: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]] = {}
+        self.lock = threading.Lock()
+
+    def version(self, source_name: str) -> int:
+        return self.versions.get(source_name, 0)
+
+    def notify(self, source_name: str) -> None:
+        with self.lock:
+            self.versions[source_name] = self.versions.get(source_name, 0) + 1
+            waiters = self.waiters.pop(source_name, [])
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(wake, waiter)
+
+    async def wait(self, source_name: str, version: int, timeout: float) -> bool:
+        """Wait for a change of the source made after the given version, False on timeout"""
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        with self.lock:
+            if self.versions.get(source_name, 0) != version:
+                return True
+            self.waiters.setdefault(source_name, []).append((loop, waiter))
+
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            with self.lock:
+                waiters = self.waiters.get(source_name, [])
+                if (loop, waiter) in waiters:
+                    waiters.remove((loop, waiter))
+                if not waiters:
+                    self.waiters.pop(source_name, None)
+
+
+def wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,6 +1,11 @@
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import Session
 
+from partition_registry.actor.cache import Cache
+from partition_registry.actor.cache import init_cache
+
+from partition_registry.integration.tracing import traced
+
 from partition_registry.orm import SourcesRegistryORM
 
 from partition_registry.data.access_token import AccessToken
@@ -15,11 +20,21 @@ from partition_registry.data.status import LookupFailed
 
 
 class SourceRegistry:
-    def __init__(self, session: scoped_session[Session]) -> None:
+    def __init__(
+        self,
+        session: scoped_session[Session],
+        cache: Cache[str, RegisteredSource] | None = None,
+        missing_cache: Cache[str, LookupFailed] | None = None,
+    ) -> None:
         self.session = session
         self.table = SourcesRegistryORM
-        self.cache: dict[str, RegisteredSource] = dict()
+        self.cache: Cache[str, RegisteredSource] = cache if cache is not None else init_cache('SOURCE')
+        # Short-lived, names registered by other workers are seen once it expires
+        self.missing_cache: Cache[str, LookupFailed] = (
+            missing_cache if missing_cache is not None else init_cache('MISSING_SOURCE', ttl=5)
+        )
 
+    @traced
     def safe_register(
         self,
         source_name: str,
@@ -30,23 +45,36 @@ class SourceRegistry:
             case ValidationFailed() as failed_validation:
                 return ValidationFailed(failed_validation.message)
 
+        # Registration must not trust cached misses, the name may be taken by another worker
+        self.missing_cache.invalidate(simple_source.name)
         if self.is_registered(simple_source.name):
             return AlreadyRegistered(simple_source)
 
         match self.persist(simple_source, AccessToken.generate()):
             case RegisteredSource() as registered_source:
-                self.cache[simple_source.name] = registered_source
+                self.cache.put(simple_source.name, registered_source)
+                self.missing_cache.invalidate(simple_source.name)
             case FailedPersist() as failed_persist:
                 return failed_persist
 
         return registered_source
 
+    @traced
     def lookup_registered(self, source_name: str) -> RegisteredSource | LookupFailed:
-        return (
-            self.memory_lookup(source_name)
-            or self.db_lookup(source_name)
-            or LookupFailed(f"Source<<{source_name}>> not registered...")
-        )
+        if (registered_source := self.memory_lookup(source_name)) is not None:
+            return registered_source
+
+        if (lookup_failed := self.missing_cache.get(source_name)) is not None:
+            return lookup_failed
+
+        match self.db_lookup(source_name):
+            case RegisteredSource() as registered_source:
+                self.cache.put(source_name, registered_source)
+                return registered_source
+            case None:
+                lookup_failed = LookupFailed(f"Source<<{source_name}>> not registered...")
+                self.missing_cache.put(source_name, lookup_failed)
+                return lookup_failed
 
     def is_registered(self, source_name: str) -> bool:
         return isinstance(self.lookup_registered(source_name), RegisteredSource)
@@ -54,6 +82,7 @@ class SourceRegistry:
     def memory_lookup(self, source_name: str) -> RegisteredSource | None:
         return self.cache.get(source_name)
 
+    @traced
     def db_lookup(self, source_name: str) -> RegisteredSource | None:
         rows = (
             self.session
@@ -74,6 +103,7 @@ class SourceRegistry:
 
         return None
 
+    @traced
     def persist(self, source: SimpleSource, access_token: AccessToken) -> RegisteredSource | FailedPersist:
         record = SourcesRegistryORM(
             name=source.name,
@@ -82,11 +112,11 @@ class SourceRegistry:
         )
         try:
             self.session.add(record)
+            self.session.commit()
         except Exception as e:
+            self.session.rollback()
             return FailedPersist(f"Persist failed with error: {e}")
 
-        self.session.commit()
-
         return RegisteredSource(
             source_id=record.id,
             name=record.name,
@@ -0,0 +1,4 @@
+from partition_registry.benchmark.cli import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""Load benchmark of the Partition Registry service
+
+Seeds Postgres configured by POSTGRES_APPLICATION_* variables with synthetic sources, drives a mix of
+registrations, locks, unlocks and readiness checks against the app at every concurrency level
+and stores latency percentiles, throughput and queries per request as JSON.
+
+Usage:
+    python -m partition_registry.benchmark run --concurrency 1,8,32 --output results.json
+    python -m partition_registry.benchmark run --url http://127.0.0.1:5498   # running service, queries aren't counted
+    python -m partition_registry.benchmark compare baseline.json results.json  # fails on regressions
+"""
+import argparse
+import asyncio
+import datetime as dt
+import importlib
+import json
+import pathlib
+import subprocess
+import uuid
+from typing import Any
+from typing import Sequence
+
+import httpx
+
+from partition_registry.benchmark.report import LevelResult
+from partition_registry.benchmark.report import compare_results
+from partition_registry.benchmark.report import write_results
+from partition_registry.benchmark.runner import in_process
+from partition_registry.benchmark.runner import run_level
+from partition_registry.benchmark.seed import SeedConfig
+from partition_registry.benchmark.seed import Seeded
+from partition_registry.benchmark.seed import cleanup
+from partition_registry.benchmark.seed import seed
+from partition_registry.benchmark.workload import DEFAULT_MIX
+from partition_registry.benchmark.workload import Operation
+from partition_registry.benchmark.workload import Workload
+from partition_registry.benchmark.workload import parse_mix
+from partition_registry.data.status import ValidationFailed
+from partition_registry.integration.postgres import init_postgres_engine
+
+
+APPS = {
+    'sync': 'partition_registry.control.mainflow',
+    'async': 'partition_registry.control.async_mainflow',
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m partition_registry.benchmark', description="Partition Registry benchmark")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help="seed the database and measure the service")
+    run.add_argument('--app', choices=sorted(APPS), default='sync', help="app served in-process")
+    run.add_argument('--url', help="measure the service running at the URL instead of the in-process app")
+    run.add_argument('--sources', type=int, default=10)
+    run.add_argument('--providers', type=int, default=2, help="providers per source")
+    run.add_argument('--partitions', type=int, default=1000, help="partitions per source")
+    run.add_argument('--events', type=int, default=1, help="events per partition")
+    run.add_argument('--mix', default=DEFAULT_MIX, help="weights of operations")
+    run.add_argument('--window', type=int, default=24, help="partitions within checked intervals")
+    run.add_argument('--concurrency', default='1,8,32', help="comma separated concurrency levels")
+    run.add_argument('--requests', type=int, default=1000, help="requests at every concurrency level")
+    run.add_argument('--seed', type=int, default=0, help="seed of the workload")
+    run.add_argument('--output', type=pathlib.Path, default=pathlib.Path('benchmark.json'))
+    run.add_argument('--keep', action='store_true', help="keep seeded rows")
+
+    compare = subparsers.add_parser('compare', help="compare results of two runs")
+    compare.add_argument('baseline', type=pathlib.Path)
+    compare.add_argument('candidate', type=pathlib.Path)
+    compare.add_argument('--tolerance', type=float, default=0.1, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case 'compare':
+            regressions = compare_results(
+                json.loads(args.baseline.read_text()), json.loads(args.candidate.read_text()), args.tolerance
+            )
+            for regression in regressions:
+                print(regression)
+            return 1 if regressions else 0
+
+    match mix := parse_mix(args.mix):
+        case ValidationFailed():
+            parser.error(mix.message)
+    concurrency_levels = [int(level) for level in args.concurrency.split(',')]
+    config = SeedConfig(args.sources, args.providers, args.partitions, args.events)
+    prefix = f"benchmark_{uuid.uuid4().hex[:8]}"
+
+    engine = init_postgres_engine()
+    try:
+        with engine.begin() as connection:
+            seeded = seed(connection, config, prefix)
+        levels = asyncio.run(measure(args, seeded, mix, concurrency_levels))
+    finally:
+        if not args.keep:
+            with engine.begin() as connection:
+                cleanup(connection, prefix)
+        engine.dispose()
+
+    metadata = {
+        'commit': current_commit(),
+        'created_at': dt.datetime.now(dt.timezone.utc).isoformat(),
+        'target': args.url or args.app,
+        'seed': {**vars(config), 'partition_length': str(config.partition_length)},
+        'mix': {operation.value: weight for operation, weight in mix.items()},
+        'window': args.window,
+        'workload_seed': args.seed,
+    }
+    write_results(args.output, metadata, levels)
+    for level in levels:
+        print(f"concurrency={level.concurrency}: {level.throughput:.1f} rps")
+        for operation, stats in level.operations.items():
+            print(
+                f"  {operation}: p50={stats.p50_ms}ms p95={stats.p95_ms}ms p99={stats.p99_ms}ms "
+                f"queries/request={stats.queries_per_request} statuses={stats.statuses}"
+            )
+    print(f"Results are written to {args.output}")
+    return 0
+
+
+async def measure(
+    args: argparse.Namespace,
+    seeded: Seeded,
+    mix: dict[Operation, int],
+    concurrency_levels: list[int],
+) -> list[LevelResult]:
+    # Shared by every level, so partitions registered at one level aren't registered again at the next one
+    workload = Workload(seeded, mix, args.window, args.seed)
+    levels = []
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            for concurrency in concurrency_levels:
+                levels.append(await run_level(client, workload, concurrency, args.requests, count_queries=False))
+        return levels
+
+    # Imported only here, the app connects to the database configured at import time
+    app_module: Any = importlib.import_module(APPS[args.app])
+    async with in_process(app_module.app, app_module.postgres_engine) as client:
+        for concurrency in concurrency_levels:
+            levels.append(await run_level(client, workload, concurrency, args.requests, count_queries=True))
+    return levels
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,73 @@
+import dataclasses as dc
+import json
+import math
+import pathlib
+from typing import Any
+from typing import Sequence
+
+
+@dc.dataclass(frozen=True)
+class OperationStats:
+    requests: int
+    errors: int                         # transport errors and 5xx responses
+    statuses: dict[str, int]            # status codes reported by the service
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float | None   # None when the service is not run in-process
+
+
+@dc.dataclass(frozen=True)
+class LevelResult:
+    concurrency: int
+    requests: int
+    seconds: float
+    throughput: float                   # requests per second
+    operations: dict[str, OperationStats]
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of values sorted in ascending order"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def operation_stats(latencies: list[float], errors: int, statuses: dict[str, int], queries: int | None) -> OperationStats:
+    latencies = sorted(latencies)
+    return OperationStats(
+        requests=len(latencies),
+        errors=errors,
+        statuses=statuses,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        queries_per_request=round(queries / len(latencies), 3) if queries is not None and latencies else None,
+    )
+
+
+def write_results(path: pathlib.Path, metadata: dict[str, Any], levels: list[LevelResult]) -> None:
+    document = {**metadata, 'levels': [dc.asdict(level) for level in levels]}
+    path.write_text(json.dumps(document, indent=2, default=str))
+
+
+def compare_results(baseline: dict[str, Any], candidate: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions of p95 latency and throughput beyond the tolerance, for levels present in both results"""
+    baseline_levels = {level['concurrency']: level for level in baseline['levels']}
+    regressions = []
+    for level in candidate['levels']:
+        if (baseline_level := baseline_levels.get(level['concurrency'])) is None:
+            continue
+        if level['throughput'] < baseline_level['throughput'] * (1 - tolerance):
+            regressions.append(
+                f"concurrency={level['concurrency']}: throughput {baseline_level['throughput']:.1f} -> {level['throughput']:.1f} rps"
+            )
+        for operation, stats in level['operations'].items():
+            if (baseline_stats := baseline_level['operations'].get(operation)) is None:
+                continue
+            if stats['p95_ms'] > baseline_stats['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"concurrency={level['concurrency']} {operation}: p95 {baseline_stats['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms"
+                )
+    return regressions
@@ -0,0 +1,98 @@
+import asyncio
+import collections
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Any
+from typing import AsyncIterator
+from typing import cast
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from partition_registry.benchmark.report import LevelResult
+from partition_registry.benchmark.report import operation_stats
+from partition_registry.benchmark.workload import Workload
+
+
+# Queries of the request being sent, every statement of the service is counted in-process
+request_queries: ContextVar[list[int] | None] = ContextVar('request_queries', default=None)
+
+
+def count_query(*_: Any) -> None:
+    if (queries := request_queries.get()) is not None:
+        queries[0] += 1
+
+
+@contextlib.asynccontextmanager
+async def in_process(app: FastAPI, engine: Engine | AsyncEngine) -> AsyncIterator[httpx.AsyncClient]:
+    """Client of the app served within this process, with its lifespan and its queries counted"""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    event.listen(sync_engine, 'before_cursor_execute', count_query)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=cast(Any, app)), base_url='http://benchmark') as client:
+                yield client
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', count_query)
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    concurrency: int,
+    requests: int,
+    count_queries: bool,
+) -> LevelResult:
+    """Send `requests` calls of the workload by `concurrency` workers, each waiting for its response"""
+    latencies: dict[str, list[float]] = collections.defaultdict(list)
+    errors: collections.Counter[str] = collections.Counter()
+    statuses: dict[str, collections.Counter[str]] = collections.defaultdict(collections.Counter)
+    queries: collections.Counter[str] = collections.Counter()
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            call = workload.next_call()
+            operation = call.operation.value
+            counter = [0]
+            request_queries.set(counter if count_queries else None)
+            started = time.perf_counter()
+            try:
+                response = await client.request(call.method, call.url, params=call.params)
+            except httpx.HTTPError:
+                errors[operation] += 1
+                status = 'error'
+            else:
+                if response.status_code >= 500:
+                    errors[operation] += 1
+                status = str(response.status_code)
+            latencies[operation].append(time.perf_counter() - started)
+            statuses[operation][status] += 1
+            queries[operation] += counter[0]
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    seconds = time.perf_counter() - started
+
+    return LevelResult(
+        concurrency=concurrency,
+        requests=requests,
+        seconds=round(seconds, 3),
+        throughput=round(requests / seconds, 3),
+        operations={
+            operation: operation_stats(
+                operation_latencies,
+                errors[operation],
+                dict(statuses[operation]),
+                queries[operation] if count_queries else None,
+            )
+            for operation, operation_latencies in sorted(latencies.items())
+        },
+    )
+
@@ -0,0 +1,115 @@
+"""Synthetic sources, providers, partitions and events written straight into the registry schema"""
+import dataclasses as dc
+import datetime as dt
+
+from sqlalchemy import Connection
+from sqlalchemy import text
+
+
+EPOCH = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+
+
+@dc.dataclass(frozen=True)
+class SeedConfig:
+    sources: int = 10
+    providers_per_source: int = 2
+    partitions_per_source: int = 1000
+    events_per_partition: int = 1            # last event is UNLOCK, so seeded sources are ready
+    partition_length: dt.timedelta = dt.timedelta(hours=1)
+
+
+@dc.dataclass(frozen=True)
+class SeededSource:
+    name: str
+    provider_names: tuple[str, ...]          # provider of partition `i` is `provider_names[i % len(provider_names)]`
+
+
+@dc.dataclass(frozen=True)
+class Seeded:
+    prefix: str
+    config: SeedConfig
+    sources: tuple[SeededSource, ...]
+
+    def partition(self, position: int) -> tuple[dt.datetime, dt.datetime]:
+        start = EPOCH + position * self.config.partition_length
+        return start, start + self.config.partition_length
+
+
+SEEDED_SOURCES = "SELECT id FROM registry.sources WHERE starts_with(name, :prefix)"
+
+
+def seed(connection: Connection, config: SeedConfig, prefix: str) -> Seeded:
+    """Every name starts with the prefix, so seeded rows are removed by `cleanup`"""
+    parameters = {
+        'prefix': prefix,
+        'sources': config.sources,
+        'providers': config.providers_per_source,
+        'partitions': config.partitions_per_source,
+        'events': config.events_per_partition,
+        'epoch': EPOCH,
+        'length': config.partition_length,
+    }
+    connection.execute(text("""
+        INSERT INTO registry.sources (name, owner, access_token)
+        SELECT :prefix || '_source_' || source, 'benchmark', :prefix || '_token_' || source
+        FROM generate_series(1, :sources) AS source
+    """), parameters)
+    connection.execute(text("""
+        INSERT INTO registry.providers (name, access_token, registered_at)
+        SELECT :prefix || '_provider_' || source || '_' || provider, :prefix || '_token_' || source, now()
+        FROM generate_series(1, :sources) AS source
+        CROSS JOIN generate_series(1, :providers) AS provider
+        ORDER BY source, provider
+    """), parameters)
+    connection.execute(text(f"""
+        INSERT INTO registry.partitions (start, "end", source_id, provider_id)
+        SELECT :epoch + position * CAST(:length AS INTERVAL), :epoch + (position + 1) * CAST(:length AS INTERVAL), sources.id, providers.id
+        FROM registry.sources AS sources
+        CROSS JOIN generate_series(0, :partitions - 1) AS position
+        CROSS JOIN LATERAL (
+            SELECT id FROM registry.providers
+            WHERE access_token = sources.access_token
+            ORDER BY id
+            OFFSET position % :providers
+            LIMIT 1
+        ) AS providers
+        WHERE sources.id IN ({SEEDED_SOURCES})
+    """), parameters)
+    connection.execute(text(f"""
+        INSERT INTO registry.events (partition_id, event_type, registered_at)
+        SELECT partitions.id,
+               CASE WHEN (:events - event) % 2 = 0 THEN 'UNLOCK' ELSE 'LOCK' END,
+               now() - (:events - event) * INTERVAL '1 second'
+        FROM registry.partitions AS partitions
+        CROSS JOIN generate_series(1, :events) AS event
+        WHERE partitions.source_id IN ({SEEDED_SOURCES})
+    """), parameters)
+    connection.execute(text(f"""
+        INSERT INTO registry.partition_state (partition_id, event_type, registered_at)
+        SELECT id, 'UNLOCK', now()
+        FROM registry.partitions
+        WHERE source_id IN ({SEEDED_SOURCES}) AND :events > 0
+    """), parameters)
+
+    rows = connection.execute(text("""
+        SELECT sources.name, array_agg(providers.name ORDER BY providers.id)
+        FROM registry.sources AS sources
+        JOIN registry.providers AS providers ON providers.access_token = sources.access_token
+        WHERE starts_with(sources.name, :prefix)
+        GROUP BY sources.name
+        ORDER BY sources.name
+    """), parameters)
+    sources = tuple(SeededSource(name, tuple(provider_names)) for name, provider_names in rows)
+    return Seeded(prefix, config, sources)
+
+
+def cleanup(connection: Connection, prefix: str) -> None:
+    """Remove seeded rows together with everything registered for them during the benchmark"""
+    parameters = {'prefix': prefix}
+    seeded_partitions = f"SELECT id FROM registry.partitions WHERE source_id IN ({SEEDED_SOURCES})"
+    connection.execute(text(f"DELETE FROM registry.partition_state WHERE partition_id IN ({seeded_partitions})"), parameters)
+    connection.execute(text(f"DELETE FROM registry.events WHERE partition_id IN ({seeded_partitions})"), parameters)
+    connection.execute(text(f"DELETE FROM registry.dependency_groups WHERE source_id IN ({SEEDED_SOURCES})"), parameters)
+    connection.execute(text(f"DELETE FROM registry.partitions WHERE source_id IN ({SEEDED_SOURCES})"), parameters)
+    connection.execute(text("DELETE FROM registry.providers WHERE starts_with(name, :prefix)"), parameters)
+    connection.execute(text("DELETE FROM registry.sources WHERE starts_with(name, :prefix)"), parameters)
@@ -0,0 +1,81 @@
+import dataclasses as dc
+import enum
+import itertools
+import random
+
+from partition_registry.benchmark.seed import Seeded
+from partition_registry.data.status import ValidationFailed
+
+
+class Operation(enum.Enum):
+    REGISTER = 'register'
+    LOCK = 'lock'
+    UNLOCK = 'unlock'
+    CHECK_READINESS = 'check_readiness'
+
+
+DEFAULT_MIX = 'check_readiness=7,register=1,lock=1,unlock=1'
+
+
+@dc.dataclass(frozen=True)
+class Call:
+    operation: Operation
+    method: str
+    url: str
+    params: dict[str, str]
+
+
+def parse_mix(mix: str) -> dict[Operation, int] | ValidationFailed:
+    """Weights of operations given as `operation=weight,...`"""
+    weights: dict[Operation, int] = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        try:
+            weights[Operation(name.strip())] = int(weight)
+        except ValueError:
+            return ValidationFailed(f"Mix item <<{item}>> should be one of {[operation.value for operation in Operation]}=<weight>")
+    if not any(weight > 0 for weight in weights.values()):
+        return ValidationFailed("Mix should contain an operation with positive weight")
+    return weights
+
+
+class Workload:
+    """Random calls over seeded sources, reproducible for the same seed
+
+    Registrations add partitions after the seeded ones, locks and unlocks hit seeded partitions
+    and readiness is checked for windows of `window` seeded partitions.
+    """
+
+    def __init__(self, seeded: Seeded, mix: dict[Operation, int], window: int, seed: int) -> None:
+        self.seeded = seeded
+        self.operations = list(mix)
+        self.weights = [mix[operation] for operation in self.operations]
+        self.window = max(1, min(window, seeded.config.partitions_per_source))
+        self.random = random.Random(seed)
+        self.registered = itertools.count(seeded.config.partitions_per_source)
+
+    def next_call(self) -> Call:
+        operation = self.random.choices(self.operations, self.weights)[0]
+        source = self.random.choice(self.seeded.sources)
+        match operation:
+            case Operation.REGISTER:
+                position = next(self.registered)
+                url = '/partitions/register'
+            case Operation.LOCK | Operation.UNLOCK:
+                position = self.random.randrange(self.seeded.config.partitions_per_source)
+                url = f'/partitions/{operation.value}'
+            case Operation.CHECK_READINESS:
+                first = self.random.randrange(self.seeded.config.partitions_per_source - self.window + 1)
+                start, _ = self.seeded.partition(first)
+                _, end = self.seeded.partition(first + self.window - 1)
+                params = {'start': start.isoformat(), 'end': end.isoformat()}
+                return Call(operation, 'GET', f'/sources/{source.name}/check_readiness', params)
+
+        start, end = self.seeded.partition(position)
+        params = {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'source_name': source.name,
+            'provider_name': source.provider_names[position % len(source.provider_names)],
+        }
+        return Call(operation, 'POST', url, params)
@@ -0,0 +1,10 @@
+"""Python client of the Partition Registry service
+
+    from partition_registry.client import PartitionRegistryClient
+
+    with PartitionRegistryClient("http://127.0.0.1:5498") as client:
+        client.check_partition_readiness("public.some_source", start, end)
+"""
+from partition_registry.client.sync_client import PartitionRegistryClient
+from partition_registry.client.async_client import AsyncPartitionRegistryClient
+from partition_registry.client.retry import RetryPolicy
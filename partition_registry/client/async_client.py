@@ -0,0 +1,262 @@
+import asyncio
+import datetime as dt
+from types import TracebackType
+from typing import Any
+from typing import AsyncIterator
+from typing import Sequence
+
+import httpx
+
+from partition_registry.client import payload
+from partition_registry.client import response
+from partition_registry.client.retry import RetryPolicy
+from partition_registry.client.retry import should_retry
+
+from partition_registry.data.change import SourceChange
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.readiness import CoverageReport
+from partition_registry.data.request import ReadinessRequest
+
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import ValidationFailed
+
+
+class AsyncPartitionRegistryClient:
+    """Asynchronous variant of PartitionRegistryClient
+
+    Readiness checks made within `batch_window` seconds of each other are sent as one batch request,
+    checks of an interval already in flight share its result.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        batch_size: int = 500,
+        batch_window: float = 0.005,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Unresolved checks, and those of them not yet sent
+        self.in_flight: dict[ReadinessRequest, asyncio.Future[PartitionReady | PartitionNotReady]] = {}
+        self.pending: list[ReadinessRequest] = []
+        self.flush_handle: asyncio.TimerHandle | None = None
+        self.batches: set[asyncio.Task[None]] = set()
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> 'AsyncPartitionRegistryClient':
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Send pending checks and wait for them before closing connections"""
+        self.flush()
+        if self.batches:
+            await asyncio.wait(self.batches)
+        await self.http.aclose()
+
+    async def request(self, method: str, url: str, idempotent: bool, **kwargs: Any) -> httpx.Response:
+        attempt = 1
+        while True:
+            try:
+                http_response = await self.http.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.retry_policy.attempts or not should_retry(idempotent, None, e):
+                    raise
+            else:
+                if attempt >= self.retry_policy.attempts or not should_retry(idempotent, http_response, None):
+                    if http_response.status_code not in response.FAILURE_STATUSES:
+                        http_response.raise_for_status()
+                    return http_response
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+    async def register_source(self, source_name: str, owner: str) -> SuccededRegistration | FailedRegistration:
+        http_response = await self.request('POST', '/sources/register', idempotent=False, params={'source_name': source_name, 'owner': owner})
+        return response.registration(http_response)
+
+    async def register_provider(self, provider_name: str, access_token: str) -> SuccededRegistration | FailedRegistration:
+        params = {'provider_name': provider_name, 'access_token': access_token}
+        return response.registration(await self.request('POST', '/providers/register', idempotent=False, params=params))
+
+    async def register_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(await self.request('POST', '/partitions/register', idempotent=False, params=params))
+
+    async def register_partitions(
+        self,
+        partitions: Sequence[SimplePartition],
+        source_name: str,
+        provider_name: str,
+    ) -> list[SuccededRegistration | FailedRegistration] | FailedRegistration:
+        params = {'source_name': source_name, 'provider_name': provider_name}
+        registrations: list[SuccededRegistration | FailedRegistration] = []
+        for chunk in payload.chunks(partitions, self.batch_size):
+            http_response = await self.request(
+                'POST', '/partitions/register/bulk', idempotent=False, params=params, json=payload.partitions(chunk)
+            )
+            match response.registrations(http_response):
+                case FailedRegistration() as failed:
+                    return failed
+                case list() as chunk_registrations:
+                    registrations.extend(chunk_registrations)
+        return registrations
+
+    async def lock_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(await self.request('POST', '/partitions/lock', idempotent=False, params=params))
+
+    async def unlock_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(await self.request('POST', '/partitions/unlock', idempotent=False, params=params))
+
+    async def check_partition_readiness(
+        self,
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> PartitionReady | PartitionNotReady:
+        """Check is sent together with other checks made within the batch window"""
+        request = ReadinessRequest(source_name, start, end)
+        future = self.in_flight.get(request)
+        if future is None:
+            future = self.in_flight[request] = asyncio.get_running_loop().create_future()
+            self.pending.append(request)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+            elif self.flush_handle is None:
+                self.flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self.flush)
+        # Cancelled caller must not cancel the check shared with others
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        """Send pending checks as one batch"""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.pending:
+            return
+
+        requests, self.pending = self.pending, []
+        batch = asyncio.get_running_loop().create_task(self.send_batch(requests))
+        self.batches.add(batch)
+        batch.add_done_callback(self.batches.discard)
+
+    async def send_batch(self, requests: list[ReadinessRequest]) -> None:
+        try:
+            results = await self.check_batch_readiness(requests)
+        except Exception as e:
+            for request in requests:
+                self.in_flight.pop(request).set_exception(e)
+        else:
+            for request, result in zip(requests, results):
+                self.in_flight.pop(request).set_result(result)
+
+    async def check_batch_readiness(self, requests: Sequence[ReadinessRequest]) -> list[PartitionReady | PartitionNotReady]:
+        """Check readiness with the batch endpoint, duplicate requests are sent once, chunks are sent concurrently"""
+        unique_requests = list(dict.fromkeys(requests))
+        chunks = list(payload.chunks(unique_requests, self.batch_size))
+        http_responses = await asyncio.gather(*[
+            self.request('POST', '/readiness/batch', idempotent=True, json=payload.readiness_requests(chunk))
+            for chunk in chunks
+        ])
+        results: dict[ReadinessRequest, PartitionReady | PartitionNotReady] = {}
+        for chunk, http_response in zip(chunks, http_responses):
+            results.update(zip(chunk, map(response.readiness, http_response.json())))
+        return [results[request] for request in requests]
+
+    async def wait_partition_readiness(
+        self,
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+        timeout: float = 30,
+    ) -> PartitionReady | PartitionNotReady:
+        http_response = await self.request(
+            'GET',
+            f'/sources/{source_name}/wait_ready',
+            idempotent=True,
+            params={**payload.interval(start, end), 'timeout': timeout},
+            timeout=self.timeout + timeout,
+        )
+        return response.readiness(http_response.json())
+
+    async def report_partition_coverage(self, source_name: str, start: dt.datetime, end: dt.datetime) -> CoverageReport:
+        http_response = await self.request('GET', f'/sources/{source_name}/coverage', idempotent=True, params=payload.interval(start, end))
+        return response.coverage_report(http_response.json())
+
+    async def register_dependency_group(
+        self,
+        group_name: str,
+        source_names: Sequence[str],
+    ) -> SuccededRegistration | FailedRegistration:
+        http_response = await self.request(
+            'POST', '/dependencies/register', idempotent=True, params={'group_name': group_name}, json=list(source_names)
+        )
+        return response.registration(http_response)
+
+    async def check_dependency_readiness(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_names: Sequence[str] = (),
+        group_name: str | None = None,
+    ) -> DependencyReadiness | LookupFailed | ValidationFailed:
+        params: dict[str, Any] = {**payload.interval(start, end), 'source_name': list(source_names)}
+        if group_name is not None:
+            params['group_name'] = group_name
+        http_response = await self.request('GET', '/dependencies/check_readiness', idempotent=True, params=params)
+        return response.dependency_readiness(http_response)
+
+    async def stream_changes(self, source_names: Sequence[str] = ()) -> AsyncIterator[SourceChange]:
+        parser = response.ChangesParser()
+        timeout = httpx.Timeout(self.timeout, read=None)
+        async with self.http.stream('GET', '/changes/stream', params={'source_name': list(source_names)}, timeout=timeout) as stream:
+            stream.raise_for_status()
+            async for line in stream.aiter_lines():
+                if (change := parser.feed(line)) is not None:
+                    yield change
+
+    async def get_pool_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = (await self.request('GET', '/pool/stats', idempotent=True)).json()
+        return stats
@@ -0,0 +1,30 @@
+"""Query parameters and bodies of service requests"""
+import datetime as dt
+from typing import Any
+from typing import Iterator
+from typing import Sequence
+from typing import TypeVar
+
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.request import ReadinessRequest
+
+
+T = TypeVar('T')
+
+
+def interval(start: dt.datetime, end: dt.datetime) -> dict[str, str]:
+    """Naive timestamps are treated as UTC by the service"""
+    return {'start': start.isoformat(), 'end': end.isoformat()}
+
+
+def readiness_requests(requests: Sequence[ReadinessRequest]) -> list[dict[str, Any]]:
+    return [{'source_name': request.source_name, **interval(request.start, request.end)} for request in requests]
+
+
+def partitions(partitions: Sequence[SimplePartition]) -> list[dict[str, str]]:
+    return [interval(partition.start, partition.end) for partition in partitions]
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for position in range(0, len(items), size):
+        yield items[position:position + size]
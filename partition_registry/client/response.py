@@ -0,0 +1,86 @@
+"""Parsing of service responses into the types returned by actions of the service"""
+import datetime as dt
+from http import HTTPStatus
+from typing import Any
+
+import httpx
+
+from partition_registry.data.change import SourceChange
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.readiness import CoverageGap
+from partition_registry.data.readiness import CoverageReport
+from partition_registry.data.readiness import LockedPartition
+
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import ValidationFailed
+
+
+# Statuses of actions failed for a reason given in `detail`, their responses are parsed rather than raised
+FAILURE_STATUSES = frozenset({HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT})
+
+
+def registration(response: httpx.Response) -> SuccededRegistration | FailedRegistration:
+    return registration_item(response.json())
+
+
+def registration_item(body: dict[str, Any]) -> SuccededRegistration | FailedRegistration:
+    """Registered object is left as it's serialized by the service"""
+    if 'detail' in body:
+        return FailedRegistration(body['detail'])
+    return SuccededRegistration(body['registered_object'])
+
+
+def registrations(response: httpx.Response) -> list[SuccededRegistration | FailedRegistration] | FailedRegistration:
+    """Outcome of every partition of a bulk registration, or the reason none was registered"""
+    if response.status_code == HTTPStatus.CONFLICT:
+        return FailedRegistration(response.json()['detail'])
+    return [registration_item(item) for item in response.json()]
+
+
+def readiness(body: dict[str, Any]) -> PartitionReady | PartitionNotReady:
+    if body['is_ready']:
+        return PartitionReady()
+    return PartitionNotReady(body['message'])
+
+
+def dependency_readiness(response: httpx.Response) -> DependencyReadiness | LookupFailed | ValidationFailed:
+    body = response.json()
+    match response.status_code:
+        case HTTPStatus.NOT_FOUND:
+            return LookupFailed(body['detail'])
+        case HTTPStatus.BAD_REQUEST:
+            return ValidationFailed(body['detail'])
+    return DependencyReadiness(body['is_ready'], body['blocking'])
+
+
+def coverage_report(body: dict[str, Any]) -> CoverageReport:
+    gaps = [CoverageGap(timestamp(gap['start']), timestamp(gap['end'])) for gap in body['gaps']]
+    locked = [
+        LockedPartition(partition['partition_id'], timestamp(partition['start']), timestamp(partition['end']))
+        for partition in body['locked']
+    ]
+    return CoverageReport(body['partitions'], gaps, locked, body['covered_fraction'])
+
+
+def timestamp(value: str) -> dt.datetime:
+    return dt.datetime.fromisoformat(value)
+
+
+class ChangesParser:
+    """Changes of Server-Sent Events stream fed line by line, keepalive comments are skipped"""
+
+    def __init__(self) -> None:
+        self.data: str | None = None
+
+    def feed(self, line: str) -> SourceChange | None:
+        if line.startswith('data:'):
+            self.data = line.removeprefix('data:').strip()
+        elif not line and self.data is not None:
+            change = SourceChange.from_json(self.data)
+            self.data = None
+            return change
+        return None
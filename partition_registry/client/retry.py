@@ -0,0 +1,30 @@
+import dataclasses as dc
+import random
+
+import httpx
+
+
+# Statuses of proxies and overloaded workers, the request wasn't handled by the service
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+# The request never reached the service, so retrying it can't register anything twice
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dc.dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, so clients failed together don't retry together"""
+    attempts: int = 4
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to sleep before retrying the request failed `attempt` times"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def should_retry(idempotent: bool, response: httpx.Response | None, error: httpx.TransportError | None) -> bool:
+    """Registrations, locks and unlocks are retried only when they didn't reach the service"""
+    if error is not None:
+        return idempotent or isinstance(error, UNSENT_ERRORS)
+    return idempotent and response is not None and response.status_code in RETRYABLE_STATUSES
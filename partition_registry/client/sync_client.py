@@ -0,0 +1,267 @@
+import datetime as dt
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Any
+from typing import Iterator
+from typing import Sequence
+
+import httpx
+
+from partition_registry.client import payload
+from partition_registry.client import response
+from partition_registry.client.retry import RetryPolicy
+from partition_registry.client.retry import should_retry
+
+from partition_registry.data.change import SourceChange
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.readiness import CoverageReport
+from partition_registry.data.request import ReadinessRequest
+
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import ValidationFailed
+
+
+class PartitionRegistryClient:
+    """Client of the Partition Registry service over a pool of keep-alive connections
+
+    Methods mirror routes of the service and return the types returned by its actions.
+    Readiness checks are sent to the batch endpoint by a background thread: checks made while
+    a batch is in flight, or within `batch_window` seconds of the first of them, are sent as the next batch,
+    checks of an interval already in flight share its result. Many checks and partitions are sent
+    to batch endpoints in chunks of `batch_size`. Client is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        batch_size: int = 500,
+        batch_window: float = 0.0,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Unresolved checks, and those of them not yet sent
+        self.in_flight: dict[ReadinessRequest, Future[PartitionReady | PartitionNotReady]] = {}
+        self.pending: list[ReadinessRequest] = []
+        self.condition = threading.Condition()
+        self.closed = False
+        self.batch_thread: threading.Thread | None = None
+        self.http = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    def __enter__(self) -> 'PartitionRegistryClient':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Send pending checks and wait for them before closing connections"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.batch_thread is not None:
+            self.batch_thread.join()
+        self.http.close()
+
+    def request(self, method: str, url: str, idempotent: bool, **kwargs: Any) -> httpx.Response:
+        """Response retried according to the retry policy, raised unless it's successful or tells why the action failed"""
+        attempt = 1
+        while True:
+            try:
+                http_response = self.http.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.retry_policy.attempts or not should_retry(idempotent, None, e):
+                    raise
+            else:
+                if attempt >= self.retry_policy.attempts or not should_retry(idempotent, http_response, None):
+                    if http_response.status_code not in response.FAILURE_STATUSES:
+                        http_response.raise_for_status()
+                    return http_response
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+    def register_source(self, source_name: str, owner: str) -> SuccededRegistration | FailedRegistration:
+        http_response = self.request('POST', '/sources/register', idempotent=False, params={'source_name': source_name, 'owner': owner})
+        return response.registration(http_response)
+
+    def register_provider(self, provider_name: str, access_token: str) -> SuccededRegistration | FailedRegistration:
+        params = {'provider_name': provider_name, 'access_token': access_token}
+        return response.registration(self.request('POST', '/providers/register', idempotent=False, params=params))
+
+    def register_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(self.request('POST', '/partitions/register', idempotent=False, params=params))
+
+    def register_partitions(
+        self,
+        partitions: Sequence[SimplePartition],
+        source_name: str,
+        provider_name: str,
+    ) -> list[SuccededRegistration | FailedRegistration] | FailedRegistration:
+        """Register partitions with the bulk endpoint, results are in the order of partitions"""
+        params = {'source_name': source_name, 'provider_name': provider_name}
+        registrations: list[SuccededRegistration | FailedRegistration] = []
+        for chunk in payload.chunks(partitions, self.batch_size):
+            http_response = self.request('POST', '/partitions/register/bulk', idempotent=False, params=params, json=payload.partitions(chunk))
+            match response.registrations(http_response):
+                case FailedRegistration() as failed:
+                    return failed
+                case list() as chunk_registrations:
+                    registrations.extend(chunk_registrations)
+        return registrations
+
+    def lock_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(self.request('POST', '/partitions/lock', idempotent=False, params=params))
+
+    def unlock_partition(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str,
+    ) -> SuccededRegistration | FailedRegistration:
+        params = {**payload.interval(start, end), 'source_name': source_name, 'provider_name': provider_name}
+        return response.registration(self.request('POST', '/partitions/unlock', idempotent=False, params=params))
+
+    def check_partition_readiness(
+        self,
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> PartitionReady | PartitionNotReady:
+        """Check is sent together with other checks made while the previous batch is in flight"""
+        request = ReadinessRequest(source_name, start, end)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Client is closed")
+            future = self.in_flight.get(request)
+            if future is None:
+                future = self.in_flight[request] = Future()
+                self.pending.append(request)
+                if self.batch_thread is None:
+                    self.batch_thread = threading.Thread(target=self.send_batches, name='readiness-batches', daemon=True)
+                    self.batch_thread.start()
+                self.condition.notify_all()
+        return future.result()
+
+    def send_batches(self) -> None:
+        """Send pending checks as one batch whenever the previous batch is done, until the client is closed"""
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if not self.pending:
+                    return
+                if self.batch_window > 0:
+                    self.condition.wait_for(lambda: len(self.pending) >= self.batch_size or self.closed, self.batch_window)
+                requests, self.pending = self.pending, []
+
+            try:
+                results = self.check_batch_readiness(requests)
+            except Exception as e:
+                for future in self.sent(requests):
+                    future.set_exception(e)
+            else:
+                for future, result in zip(self.sent(requests), results):
+                    future.set_result(result)
+
+    def sent(self, requests: list[ReadinessRequest]) -> list[Future[PartitionReady | PartitionNotReady]]:
+        """Futures of answered checks, later checks of the same intervals are sent again"""
+        with self.condition:
+            return [self.in_flight.pop(request) for request in requests]
+
+    def check_batch_readiness(self, requests: Sequence[ReadinessRequest]) -> list[PartitionReady | PartitionNotReady]:
+        """Check readiness with the batch endpoint, duplicate requests are sent once"""
+        unique_requests = list(dict.fromkeys(requests))
+        results: dict[ReadinessRequest, PartitionReady | PartitionNotReady] = {}
+        for chunk in payload.chunks(unique_requests, self.batch_size):
+            http_response = self.request('POST', '/readiness/batch', idempotent=True, json=payload.readiness_requests(chunk))
+            results.update(zip(chunk, map(response.readiness, http_response.json())))
+        return [results[request] for request in requests]
+
+    def wait_partition_readiness(
+        self,
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+        timeout: float = 30,
+    ) -> PartitionReady | PartitionNotReady:
+        http_response = self.request(
+            'GET',
+            f'/sources/{source_name}/wait_ready',
+            idempotent=True,
+            params={**payload.interval(start, end), 'timeout': timeout},
+            timeout=self.timeout + timeout,
+        )
+        return response.readiness(http_response.json())
+
+    def report_partition_coverage(self, source_name: str, start: dt.datetime, end: dt.datetime) -> CoverageReport:
+        http_response = self.request('GET', f'/sources/{source_name}/coverage', idempotent=True, params=payload.interval(start, end))
+        return response.coverage_report(http_response.json())
+
+    def register_dependency_group(self, group_name: str, source_names: Sequence[str]) -> SuccededRegistration | FailedRegistration:
+        # Registration replaces sources of the group, so it's safe to repeat
+        http_response = self.request(
+            'POST', '/dependencies/register', idempotent=True, params={'group_name': group_name}, json=list(source_names)
+        )
+        return response.registration(http_response)
+
+    def check_dependency_readiness(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        source_names: Sequence[str] = (),
+        group_name: str | None = None,
+    ) -> DependencyReadiness | LookupFailed | ValidationFailed:
+        params: dict[str, Any] = {**payload.interval(start, end), 'source_name': list(source_names)}
+        if group_name is not None:
+            params['group_name'] = group_name
+        return response.dependency_readiness(self.request('GET', '/dependencies/check_readiness', idempotent=True, params=params))
+
+    def stream_changes(self, source_names: Sequence[str] = ()) -> Iterator[SourceChange]:
+        """Changes of the given sources (of every source if none given) until the stream is closed"""
+        parser = response.ChangesParser()
+        timeout = httpx.Timeout(self.timeout, read=None)
+        with self.http.stream('GET', '/changes/stream', params={'source_name': list(source_names)}, timeout=timeout) as stream:
+            stream.raise_for_status()
+            for line in stream.iter_lines():
+                if (change := parser.feed(line)) is not None:
+                    yield change
+
+    def get_pool_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = self.request('GET', '/pool/stats', idempotent=True).json()
+        return stats
@@ -0,0 +1,13 @@
+"""Asynchronous mode of the Partition Registry service
+
+Run with `uvicorn async_mainflow:app` instead of `mainflow:app`: actions run in greenlets
+over asyncpg, as AsyncSession does, so one worker doesn't need a thread per request.
+"""
+from sqlalchemy.util import greenlet_spawn
+
+from partition_registry.control.service import create_app
+from partition_registry.integration.postgres import init_async_postgres_engine
+
+
+postgres_engine = init_async_postgres_engine()
+app = create_app(postgres_engine, greenlet_spawn)
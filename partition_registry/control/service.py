@@ -0,0 +1,699 @@
+"""Routes and wiring of the Partition Registry service shared by both modes
+
+Actions and registries are blocking code over a SQLAlchemy Session. `mainflow` runs them
+in the threadpool over psycopg2, `async_mainflow` runs them in greenlets over asyncpg
+(as AsyncSession does), so a waiting request suspends its greenlet instead of a thread.
+"""
+import os
+import datetime as dt
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Protocol
+from typing import TypeVar
+from contextlib import asynccontextmanager
+
+from http import HTTPStatus
+
+from fastapi import Depends
+from fastapi import FastAPI
+from fastapi import Query
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from fastapi.responses import PlainTextResponse
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from partition_registry.actions.register_source import register_source as rsource
+from partition_registry.actions.register_provider import register_provider as rprovider
+from partition_registry.actions.register_partition import register_partition as rpartition
+from partition_registry.actions.register_partitions import register_partitions as rpartitions
+from partition_registry.actions.lock_partition import lock_partition as lpartition
+from partition_registry.actions.unlock_partition import unlock_partition as upartition
+from partition_registry.actions.check_partition_readiness import check_partition_readiness as check_readiness
+from partition_registry.actions.check_batch_readiness import check_batch_readiness as check_readiness_batch
+from partition_registry.actions.register_dependency_group import register_dependency_group as rgroup
+from partition_registry.actions.check_dependency_readiness import check_dependency_readiness as check_readiness_dependencies
+from partition_registry.actions.report_partition_coverage import report_partition_coverage as report_coverage
+from partition_registry.actions.wait_partition_readiness import wait_partition_readiness as wait_readiness
+
+from partition_registry.actor.source_registry import SourceRegistry
+from partition_registry.actor.provider_registry import ProviderRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.dependency_registry import DependencyRegistry
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_cache import ReadinessCache
+from partition_registry.actor.source_changes import SourceChanges
+from partition_registry.actor.changes_broker import ChangesBroker
+
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import ValidationFailed
+
+from partition_registry.data.response import ErrorResponse
+from partition_registry.data.response import SucceededRegistrationResponse
+from partition_registry.data.response import PartitionReadinessResponse
+from partition_registry.data.response import DependencyReadinessResponse
+from partition_registry.data.response import CoverageReportResponse
+from partition_registry.data.response import error_responses
+
+from partition_registry.data.request import ReadinessRequest
+from partition_registry.data.request import PartitionsStreamParser
+from partition_registry.data.request import parse_partitions_payload
+from partition_registry.data.readiness import ReadinessEngine
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.change import SourceChange
+
+from partition_registry.data.func import localize
+
+from partition_registry.integration.postgres import init_postgres_session
+from partition_registry.integration.postgres import request_scope
+from partition_registry.integration.postgres import pool_stats
+from partition_registry.integration.postgres import instrument_queries
+from partition_registry.integration.postgres import postgres_slow_query_threshold
+from partition_registry.integration.postgres import QueryCountMiddleware
+from partition_registry.integration.notifications import CHANNEL
+from partition_registry.integration.notifications import ChangesListener
+from partition_registry.integration.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from partition_registry.integration.metrics import Metrics
+from partition_registry.integration.metrics import MetricsMiddleware
+from partition_registry.integration.tracing import TracedCache
+from partition_registry.integration.tracing import TracingMiddleware
+from partition_registry.integration.tracing import configure_tracer
+from partition_registry.integration.tracing import tracer
+
+
+T = TypeVar('T')
+
+
+class BlockingRunner(Protocol):
+    """Runs blocking call without blocking the event loop, e.g. `run_in_threadpool`"""
+
+    def __call__(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> Awaitable[T]: ...
+
+
+def registration_response(outcome: SuccededRegistration | FailedRegistration) -> ORJSONResponse:
+    match outcome:
+        case FailedRegistration():
+            return ORJSONResponse(ErrorResponse(outcome.message), HTTPStatus.CONFLICT)
+        case SuccededRegistration():
+            return ORJSONResponse(SucceededRegistrationResponse(outcome.obj))
+
+
+def readiness_response(outcome: PartitionReady | PartitionNotReady) -> PartitionReadinessResponse:
+    match outcome:
+        case PartitionNotReady():
+            return PartitionReadinessResponse(is_ready=False, message=outcome.reason)
+        case PartitionReady():
+            return PartitionReadinessResponse(is_ready=True)
+
+
+def create_app(postgres_engine: Engine | AsyncEngine, run_blocking: BlockingRunner) -> FastAPI:
+    """Service over the engine, every call reaching the database is run with `run_blocking`"""
+    # Sessions are scoped per request, see `request_session`
+    postgres_session = init_postgres_session(postgres_engine)
+
+    # In-process index and readiness cache are updated by writes of this process,
+    # changes received from other processes make the source cold and drop its cached results
+    readiness_index = ReadinessIndex() if os.getenv('PARTITION_REGISTRY_READINESS_INDEX', 'false').lower() == 'true' else None
+    readiness_cache = ReadinessCache() if os.getenv('PARTITION_REGISTRY_READINESS_CACHE', 'false').lower() == 'true' else None
+    readiness_engine = ReadinessEngine(os.getenv('PARTITION_REGISTRY_READINESS_ENGINE', ReadinessEngine.PYTHON.value).lower())
+
+    # Requests waiting for readiness are woken by writes of this process and by changes received from other processes,
+    # readiness is rechecked at least every PARTITION_REGISTRY_WAIT_RECHECK_INTERVAL seconds in case a change is missed
+    source_changes = SourceChanges()
+    wait_max_timeout = float(os.getenv('PARTITION_REGISTRY_WAIT_MAX_TIMEOUT', '300'))
+    wait_recheck_interval = float(os.getenv('PARTITION_REGISTRY_WAIT_RECHECK_INTERVAL', '30'))
+
+    # Registered partitions and events are published with NOTIFY, every worker listens to them
+    # to wake waiting requests and to stream changes to subscribers
+    changes_enabled = os.getenv('PARTITION_REGISTRY_CHANGES', 'true').lower() == 'true'
+    changes_keepalive = float(os.getenv('PARTITION_REGISTRY_CHANGES_KEEPALIVE', '15'))
+    changes_broker = ChangesBroker()
+
+    def receive_change(change: SourceChange) -> None:
+        if not change.is_local():
+            if readiness_cache is not None:
+                readiness_cache.bump(change.source_name)
+            if readiness_index is not None:
+                readiness_index.invalidate(change.source_name)
+        source_changes.notify(change.source_name)
+        changes_broker.publish(change)
+
+    def reset_readiness() -> None:
+        # Changes published while the listener was disconnected are lost, nothing loaded before can be trusted
+        if readiness_cache is not None:
+            readiness_cache.bump_all()
+        if readiness_index is not None:
+            readiness_index.invalidate_all()
+
+    changes_listener = ChangesListener(receive_change, on_connect=reset_readiness)
+    notify_channel = CHANNEL if changes_enabled else None
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        if changes_enabled:
+            changes_listener.start()
+        yield
+        await changes_listener.stop()
+        tracer.shutdown()
+        match postgres_engine:
+            case AsyncEngine():
+                await postgres_engine.dispose()
+            case Engine():
+                postgres_engine.dispose()
+
+    async def request_session() -> AsyncIterator[None]:
+        """Open request scope and close session of the request when it's served"""
+        token = request_scope.set(object())
+        try:
+            yield
+        finally:
+            await run_blocking(postgres_session.remove)
+            request_scope.reset(token)
+
+    app = FastAPI(lifespan=lifespan, dependencies=[Depends(request_session)], default_response_class=ORJSONResponse)
+
+    # Metrics of this worker only, every worker should be scraped separately
+    metrics = Metrics()
+    metrics_enabled = os.getenv('PARTITION_REGISTRY_METRICS', 'true').lower() == 'true'
+    if metrics_enabled:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        metrics.instrument_engine(postgres_engine)
+
+    # Statements of every request are counted in the X-Query-Count header, slow ones are logged
+    # with the actor method running them
+    app.add_middleware(QueryCountMiddleware)
+    instrument_queries(postgres_engine, postgres_slow_query_threshold())
+
+    # Spans of requests, actions, registry methods, cache lookups and statements,
+    # exported by the exporter chosen with PARTITION_REGISTRY_TRACING
+    configure_tracer()
+    if tracer.enabled:
+        app.add_middleware(TracingMiddleware)
+        tracer.instrument_engine(postgres_engine)
+
+    source_registry = SourceRegistry(postgres_session)
+    dependency_registry = DependencyRegistry(postgres_session)
+    provider_registry = ProviderRegistry(postgres_session)
+    partition_registry = PartitionRegistry(
+        postgres_session,
+        readiness_index,
+        readiness_cache=readiness_cache,
+        source_changes=source_changes,
+        notify_channel=notify_channel,
+    )
+    events_registry = EventsRegistry(
+        postgres_session,
+        readiness_index,
+        readiness_cache=readiness_cache,
+        source_changes=source_changes,
+        notify_channel=notify_channel,
+    )
+
+    if tracer.enabled:
+        source_registry.cache = TracedCache('source', source_registry.cache)
+        source_registry.missing_cache = TracedCache('missing_source', source_registry.missing_cache)
+        provider_registry.cache = TracedCache('provider', provider_registry.cache)
+        provider_registry.missing_cache = TracedCache('missing_provider', provider_registry.missing_cache)
+        partition_registry.cache = TracedCache('partition', partition_registry.cache)
+        events_registry.cache = TracedCache('event', events_registry.cache)
+        if readiness_cache is not None:
+            readiness_cache.results = TracedCache('readiness', readiness_cache.results)
+
+    metrics.register_caches({
+        'source': source_registry.cache,
+        'missing_source': source_registry.missing_cache,
+        'provider': provider_registry.cache,
+        'missing_provider': provider_registry.missing_cache,
+        'partition': partition_registry.cache,
+        'event': events_registry.cache,
+        **({'readiness': readiness_cache.results} if readiness_cache is not None else {}),
+    })
+
+    def count_readiness_checks(source_names: list[str]) -> None:
+        # Only the source cache is consulted, counting must not query the database,
+        # sources are labeled once this worker has seen them registered
+        if metrics_enabled:
+            metrics.count_readiness_checks(source_names, lambda name: source_registry.memory_lookup(name) is not None)
+
+    @app.get("/")
+    async def read_root() -> dict[str, str]:
+        message = (
+            "You are trying to get root page of Partition Registry Service. "
+            "Please, visit documentation page by address YOUR_URL/redoc to get to "
+            "know with complete functional"
+        )
+        return {"message": message}
+
+    @app.post("/sources/register", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def register_source(source_name: str, owner: str) -> ORJSONResponse:
+        """Register source to manage within the Partition Registry service
+
+        Args:
+            source_name (str): source name to register
+            owner (str): source owner
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(RegisteredSource)
+        """
+        response = await run_blocking(rsource, source_name, owner, source_registry)
+        metrics.record_outcome('register_source', response)
+        return registration_response(response)
+
+    @app.post("/providers/register", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def register_provider(provider_name: str, access_token: str) -> ORJSONResponse:
+        """Register provider to manage it within the Partition Registry service
+
+        Args:
+            provider_name (str): provider name to register
+            access_token (str): access token to get access to the source
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(RegisteredProvider)
+        """
+        response = await run_blocking(rprovider, provider_name, access_token, provider_registry)
+        metrics.record_outcome('register_provider', response)
+        return registration_response(response)
+
+    @app.post("/partitions/register", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def register_partition(
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str
+    ) -> ORJSONResponse:
+        """Register partition to manage it within Partition Registry
+
+        Args:
+            start (dt.datetime): startpoint of partition to register
+            end (dt.datetime): endpoint of partition to register
+            source_name (str): source to register partition
+            provider_name (str): provider to register partition
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(RegisteredPartition)
+        """
+        start = localize(start)
+        end = localize(end)
+        response = await run_blocking(
+            rpartition,
+            start=start,
+            end=end,
+            partition_registry=partition_registry,
+            source_name=source_name,
+            source_registry=source_registry,
+            provider_name=provider_name,
+            provider_registry=provider_registry
+        )
+        metrics.record_outcome('register_partition', response)
+        return registration_response(response)
+
+    @app.post(
+        "/partitions/register/bulk",
+        response_model=list[SucceededRegistrationResponse | ErrorResponse],
+        responses=error_responses(HTTPStatus.CONFLICT),
+        openapi_extra={
+            "requestBody": {
+                "content": {
+                    "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                    "application/x-ndjson": {"schema": {"type": "string"}},
+                },
+                "required": True,
+            }
+        },
+    )
+    async def register_partitions(
+        request: Request,
+        source_name: str,
+        provider_name: str
+    ) -> ORJSONResponse:
+        """Register many partitions of one source/provider pair within a single request
+
+        Body is either a JSON array or an NDJSON stream of {"start": ..., "end": ...} objects,
+        NDJSON is parsed as it's received.
+
+        Args:
+            source_name (str): source to register partitions
+            provider_name (str): provider to register partitions
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT if source/provider can't be used
+            list[SucceededRegistrationResponse(RegisteredPartition) | ErrorResponse]
+            in the order of given partitions
+        """
+        content_type = request.headers.get('content-type', '')
+        if content_type.startswith('application/x-ndjson'):
+            parser = PartitionsStreamParser()
+            partitions = [partition async for chunk in request.stream() for partition in parser.feed(chunk)]
+            partitions.extend(parser.close())
+        else:
+            partitions = parse_partitions_payload(await request.body(), content_type)
+        response = await run_blocking(
+            rpartitions,
+            partitions=partitions,
+            partition_registry=partition_registry,
+            source_name=source_name,
+            source_registry=source_registry,
+            provider_name=provider_name,
+            provider_registry=provider_registry
+        )
+        metrics.record_outcome('register_partitions', response)
+        match response:
+            case FailedRegistration():
+                return ORJSONResponse(ErrorResponse(response.message), HTTPStatus.CONFLICT)
+            case list() as outcomes:
+                ...
+
+        results: list[SucceededRegistrationResponse | ErrorResponse] = []
+        for outcome in outcomes:
+            match outcome:
+                case FailedRegistration():
+                    results.append(ErrorResponse(outcome.message))
+                case SuccededRegistration() as success:
+                    results.append(SucceededRegistrationResponse(success.obj))
+        return ORJSONResponse(results)
+
+    @app.post("/partitions/lock", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def lock_partition(
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str
+    ) -> ORJSONResponse:
+        """Lock registered partition
+
+        Args:
+            start (dt.datetime): startpoint of partition to lock
+            end (dt.datetime): endpoint of partition to lock
+            source_name (str): source to lock
+            provider_name (str): provider that locks the interval
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(RegisteredPartitionEvent)
+        """
+        start = localize(start)
+        end = localize(end)
+
+        response = await run_blocking(
+            lpartition,
+            start=start,
+            end=end,
+            partition_registry=partition_registry,
+            source_name=source_name,
+            source_registry=source_registry,
+            provider_name=provider_name,
+            provider_registry=provider_registry,
+            events_registry=events_registry
+        )
+        metrics.record_outcome('lock_partition', response)
+        return registration_response(response)
+
+    @app.post("/partitions/unlock", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def unlock_partition(
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: str,
+        provider_name: str
+    ) -> ORJSONResponse:
+        """Unlock registered partition
+
+        Args:
+            start (dt.datetime): startpoint of partition to unlock
+            end (dt.datetime): endpoint of partition to unlock
+            source_name (str): source to unlock
+            provider_name (str): provider that unlocks the interval
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(RegisteredPartitionEvent)
+        """
+        start = localize(start)
+        end = localize(end)
+
+        response = await run_blocking(
+            upartition,
+            start=start,
+            end=end,
+            partition_registry=partition_registry,
+            source_name=source_name,
+            source_registry=source_registry,
+            provider_name=provider_name,
+            provider_registry=provider_registry,
+            events_registry=events_registry
+        )
+        metrics.record_outcome('unlock_partition', response)
+        return registration_response(response)
+
+    @app.get("/sources/{source_name}/check_readiness", response_model=PartitionReadinessResponse)
+    async def check_partition_readiness(
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> ORJSONResponse:
+        """Check source partition readiness
+
+        Args:
+            source_name (str): source to check
+            start (dt.datetime): startpoint of partition to check
+            end (dt.datetime): end of partition to check
+
+        Returns:
+            PartitionReadinessResponse(True/False, message)
+        """
+        start = localize(start)
+        end = localize(end)
+
+        response = await run_blocking(
+            check_readiness,
+            start=start,
+            end=end,
+            source_name=source_name,
+            partition_registry=partition_registry,
+            events_registry=events_registry,
+            readiness_index=readiness_index,
+            readiness_cache=readiness_cache,
+            readiness_engine=readiness_engine,
+        )
+        metrics.record_outcome('check_partition_readiness', response)
+        count_readiness_checks([source_name])
+        return ORJSONResponse(readiness_response(response))
+
+    @app.get("/sources/{source_name}/coverage", response_model=CoverageReportResponse)
+    async def report_partition_coverage(
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> ORJSONResponse:
+        """Report every gap and every locked partition of source within the interval
+
+        Args:
+            source_name (str): source to report
+            start (dt.datetime): startpoint of interval to report
+            end (dt.datetime): end of interval to report
+
+        Returns:
+            CoverageReportResponse(True/False, partitions, covered fraction, gaps, locked partitions)
+        """
+        start = localize(start)
+        end = localize(end)
+
+        report = await run_blocking(report_coverage, start, end, source_name, events_registry)
+        metrics.record_outcome('report_partition_coverage', report)
+        count_readiness_checks([source_name])
+        return ORJSONResponse(CoverageReportResponse(
+            is_ready=report.is_ready,
+            partitions=report.partitions,
+            covered_fraction=report.covered_fraction,
+            gaps=report.gaps,
+            locked=report.locked,
+        ))
+
+    @app.get("/sources/{source_name}/wait_ready", response_model=PartitionReadinessResponse)
+    async def wait_partition_readiness(
+        source_name: str,
+        start: dt.datetime,
+        end: dt.datetime,
+        timeout: float = 30,
+    ) -> ORJSONResponse:
+        """Wait until source partition is ready
+
+        Request is held open until a registration or an unlock makes the interval ready, or timeout expires.
+
+        Args:
+            source_name (str): source to check
+            start (dt.datetime): startpoint of partition to check
+            end (dt.datetime): end of partition to check
+            timeout (float): seconds to wait, at most PARTITION_REGISTRY_WAIT_MAX_TIMEOUT
+
+        Returns:
+            PartitionReadinessResponse(True/False, message) of the last check
+        """
+        start = localize(start)
+        end = localize(end)
+
+        async def check() -> PartitionReady | PartitionNotReady:
+            result = await run_blocking(
+                check_readiness,
+                start=start,
+                end=end,
+                source_name=source_name,
+                partition_registry=partition_registry,
+                events_registry=events_registry,
+                readiness_index=readiness_index,
+                readiness_cache=readiness_cache,
+                readiness_engine=readiness_engine,
+            )
+            # Connection returns to the pool while the request waits
+            await run_blocking(postgres_session.remove)
+            return result
+
+        response = await wait_readiness(
+            source_name,
+            check,
+            source_changes,
+            timeout=min(max(timeout, 0), wait_max_timeout),
+            recheck_interval=wait_recheck_interval,
+        )
+        metrics.record_outcome('wait_partition_readiness', response)
+        count_readiness_checks([source_name])
+        return ORJSONResponse(readiness_response(response))
+
+    @app.post("/readiness/batch", response_model=list[PartitionReadinessResponse])
+    async def check_batch_readiness(requests: list[ReadinessRequest]) -> ORJSONResponse:
+        """Check readiness of many source intervals at once
+
+        Args:
+            requests (list[ReadinessRequest]): (source_name, start, end) triples to check
+
+        Returns:
+            list[PartitionReadinessResponse(True/False, message)] in the order of requests
+        """
+        localized_requests = [
+            ReadinessRequest(request.source_name, localize(request.start), localize(request.end))
+            for request in requests
+        ]
+
+        responses = await run_blocking(
+            check_readiness_batch,
+            requests=localized_requests,
+            partition_registry=partition_registry,
+            events_registry=events_registry,
+            readiness_index=readiness_index,
+            readiness_cache=readiness_cache,
+        )
+
+        metrics.record_outcome('check_batch_readiness', responses)
+        count_readiness_checks([request.source_name for request in localized_requests])
+        return ORJSONResponse([readiness_response(response) for response in responses])
+
+    @app.post("/dependencies/register", response_model=SucceededRegistrationResponse, responses=error_responses(HTTPStatus.CONFLICT))
+    async def register_dependency_group(group_name: str, source_names: list[str]) -> ORJSONResponse:
+        """Register dependency group, sources of already registered group are replaced
+
+        Args:
+            group_name (str): dependency group name to register
+            source_names (list[str]): registered sources the group depends on
+
+        Returns:
+            ErrorResponse with HTTPStatus.CONFLICT
+            SucceededRegistrationResponse(DependencyGroup)
+        """
+        response = await run_blocking(rgroup, group_name, source_names, dependency_registry, source_registry)
+        metrics.record_outcome('register_dependency_group', response)
+        return registration_response(response)
+
+    @app.get(
+        "/dependencies/check_readiness",
+        response_model=DependencyReadinessResponse,
+        responses=error_responses(HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST),
+    )
+    async def check_dependency_readiness(
+        start: dt.datetime,
+        end: dt.datetime,
+        source_name: list[str] = Query(default=[]),
+        group_name: str | None = None,
+    ) -> ORJSONResponse:
+        """Check readiness of the same interval for a whole set of sources in one request
+
+        Args:
+            start (dt.datetime): startpoint of partition to check
+            end (dt.datetime): end of partition to check
+            source_name (list[str]): sources to check
+            group_name (str | None): dependency group, its sources are checked together with the given ones
+
+        Returns:
+            ErrorResponse with HTTPStatus.NOT_FOUND for unknown group
+            ErrorResponse with HTTPStatus.BAD_REQUEST if neither sources nor group given
+            DependencyReadinessResponse(True/False, blocking reasons by source)
+        """
+        start = localize(start)
+        end = localize(end)
+
+        response = await run_blocking(
+            check_readiness_dependencies,
+            start=start,
+            end=end,
+            source_names=source_name,
+            group_name=group_name,
+            dependency_registry=dependency_registry,
+            partition_registry=partition_registry,
+            events_registry=events_registry,
+            readiness_index=readiness_index,
+            readiness_cache=readiness_cache,
+        )
+        metrics.record_outcome('check_dependency_readiness', response)
+        count_readiness_checks(source_name)
+        match response:
+            case LookupFailed() as lookup_failed:
+                return ORJSONResponse(ErrorResponse(lookup_failed.message), HTTPStatus.NOT_FOUND)
+            case ValidationFailed() as validation_failed:
+                return ORJSONResponse(ErrorResponse(validation_failed.message), HTTPStatus.BAD_REQUEST)
+            case DependencyReadiness() as readiness:
+                return ORJSONResponse(DependencyReadinessResponse(readiness.is_ready, readiness.blocking))
+
+    @app.get("/changes/stream")
+    async def stream_changes(source_name: list[str] = Query(default=[])) -> StreamingResponse:
+        """Stream registered partitions, locks and unlocks as Server-Sent Events
+
+        Args:
+            source_name (list[str]): sources to follow, every source if none given
+
+        Returns:
+            StreamingResponse of REGISTER, LOCK and UNLOCK events with SourceChange data
+        """
+        subscription = changes_broker.subscribe(frozenset(source_name))
+        return StreamingResponse(
+            changes_broker.server_sent_events(subscription, changes_keepalive),
+            media_type='text/event-stream',
+        )
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def get_metrics() -> PlainTextResponse:
+        """Metrics of the worker serving the request in Prometheus text format
+
+        Returns:
+            request latencies by handler, outcomes of actions, SQL statement latencies and cache usage
+        """
+        return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+    @app.get("/pool/stats")
+    async def get_pool_stats() -> dict[str, int]:
+        """Connection pool usage of the worker serving the request
+
+        Returns:
+            dict with pid, pool_size, max_connections, checked_in, checked_out and overflow
+        """
+        return pool_stats(postgres_engine)
+
+    return app
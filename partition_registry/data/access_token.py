@@ -2,7 +2,7 @@ import dataclasses as dc
 import uuid
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class AccessToken:
     token: str
 
@@ -0,0 +1,42 @@
+import dataclasses as dc
+import enum
+import json
+import os
+import socket
+
+
+class ChangeType(enum.Enum):
+    REGISTER = 'REGISTER'
+    LOCK = 'LOCK'
+    UNLOCK = 'UNLOCK'
+
+
+def current_worker() -> str:
+    """Host and process of the worker, taken on every call so forked workers differ"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+@dc.dataclass(frozen=True)
+class SourceChange:
+    """Registered partition or event, published to every worker with Postgres NOTIFY"""
+    source_name: str
+    partition_id: int
+    change_type: ChangeType
+    worker: str = dc.field(default_factory=current_worker)
+
+    def is_local(self) -> bool:
+        """Published by this worker, which has already applied it to its own caches"""
+        return self.worker == current_worker()
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'source_name': self.source_name,
+            'partition_id': self.partition_id,
+            'change_type': self.change_type.value,
+            'worker': self.worker,
+        })
+
+    @staticmethod
+    def from_json(payload: str) -> 'SourceChange':
+        data = json.loads(payload)
+        return SourceChange(data['source_name'], data['partition_id'], ChangeType(data['change_type']), data.get('worker', ''))
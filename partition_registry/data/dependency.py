@@ -0,0 +1,31 @@
+import dataclasses as dc
+
+from partition_registry.data.status import ValidationSucceded
+from partition_registry.data.status import ValidationFailed
+
+
+@dc.dataclass(frozen=True)
+class DependencyGroup:
+    """Named set of sources a downstream job depends on"""
+    name: str
+    source_names: tuple[str, ...]
+
+    def safe_validate(self) -> ValidationSucceded | ValidationFailed:
+        if not self.name:
+            return ValidationFailed("DependencyGroup.name shouldn't be empty...")
+
+        for char in self.name:
+            if not char.strip():
+                return ValidationFailed("DependencyGroup.name can't contain any spaces...")
+
+        if not self.source_names:
+            return ValidationFailed("DependencyGroup.source_names shouldn't be empty...")
+
+        return ValidationSucceded()
+
+
+@dc.dataclass(frozen=True)
+class DependencyReadiness:
+    """Readiness of every source of a dependency set over the same interval"""
+    is_ready: bool
+    blocking: dict[str, str]  # reason of every source not ready, by source name
@@ -1,8 +1,8 @@
 import dataclasses as dc
 import datetime as dt
 import enum
-import pytz
 
+from partition_registry.data.func import utc_now
 from partition_registry.data.partition import RegisteredPartition
 from partition_registry.data.source import RegisteredSource
 from partition_registry.data.provider import RegisteredProvider
@@ -12,14 +12,14 @@ class EventType(enum.Enum):
     LOCK = 'LOCK'
     UNLOCK = 'UNLOCK'
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class SimplifiedPartitionEventORM:
     id: int
     event_type: EventType
     registered_at: dt.datetime
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class SimplePartitionEvent:
     partition: RegisteredPartition
     source: RegisteredSource
@@ -27,8 +27,8 @@ class SimplePartitionEvent:
     event_type: EventType
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class RegisteredPartitionEvent:
     partition: RegisteredPartition
     event_type: EventType
-    registered_at: dt.datetime = dc.field(default=dt.datetime.now(pytz.UTC))
+    registered_at: dt.datetime = dc.field(default_factory=utc_now)
@@ -6,3 +6,8 @@ def localize(obj: dt.datetime) -> dt.datetime:
     if obj.tzinfo is None or obj.tzinfo.utcoffset(obj) is None:
         return obj.replace(tzinfo=tz.UTC)
     return obj
+
+
+def utc_now() -> dt.datetime:
+    """Current timezone aware UTC time, default of registration times"""
+    return dt.datetime.now(tz.UTC)
@@ -2,8 +2,8 @@ from typing import Protocol
 
 import dataclasses as dc
 import datetime as dt
-import pytz
 
+from partition_registry.data.func import utc_now
 from partition_registry.data.provider import RegisteredProvider
 from partition_registry.data.source import RegisteredSource
 
@@ -13,6 +13,9 @@ from partition_registry.data.status import ValidationSucceded
 
 
 class Partition(Protocol):
+    # Slotted implementations have no instance dict only if every base declares slots
+    __slots__ = ()
+
     start: dt.datetime
     end: dt.datetime
 
@@ -37,7 +40,7 @@ class Partition(Protocol):
         return str(self)
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class SimplePartition(Partition):
     start: dt.datetime
     end: dt.datetime
@@ -51,14 +54,14 @@ class SimplePartition(Partition):
         )
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class RegisteredPartition(Partition):
     partition_id: int
     start: dt.datetime
     end: dt.datetime
     source: RegisteredSource
     provider: RegisteredProvider
-    registered_at: dt.datetime = dc.field(default=dt.datetime.now(pytz.UTC))
+    registered_at: dt.datetime = dc.field(default_factory=utc_now)
 
     def __str__(self) -> str:
         return (
@@ -70,3 +73,39 @@ class RegisteredPartition(Partition):
             f"registered_at='{self.registered_at}'"
             ")"
         )
+
+
+@dc.dataclass(frozen=True, slots=True)
+class CachedPartition:
+    """Registered partition as kept by the partition cache, source and provider are referenced by id
+
+    Cached entries don't keep source and provider objects alive, lookups rebuild
+    the partition with the source and provider they were made with.
+    """
+    partition_id: int
+    start: dt.datetime
+    end: dt.datetime
+    source_id: int
+    provider_id: int
+    registered_at: dt.datetime
+
+    @classmethod
+    def from_registered(cls, partition: RegisteredPartition) -> "CachedPartition":
+        return cls(
+            partition_id=partition.partition_id,
+            start=partition.start,
+            end=partition.end,
+            source_id=partition.source.source_id,
+            provider_id=partition.provider.provider_id,
+            registered_at=partition.registered_at,
+        )
+
+    def to_registered(self, source: RegisteredSource, provider: RegisteredProvider) -> RegisteredPartition:
+        return RegisteredPartition(
+            partition_id=self.partition_id,
+            start=self.start,
+            end=self.end,
+            source=source,
+            provider=provider,
+            registered_at=self.registered_at,
+        )
@@ -1,16 +1,18 @@
 import dataclasses as dc
 import datetime as dt
-import pytz
 
 from typing import Protocol
 
 from partition_registry.data.access_token import AccessToken
+from partition_registry.data.func import utc_now
 
 from partition_registry.data.status import ValidationFailed
 from partition_registry.data.status import ValidationSucceded
 
 
 class Provider(Protocol):
+    __slots__ = ()
+
     name: str
 
     def safe_validate(self) -> ValidationSucceded | ValidationFailed:
@@ -22,7 +24,7 @@ class Provider(Protocol):
         return ValidationSucceded()
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class SimpleProvider(Provider):
     name: str
 
@@ -33,12 +35,12 @@ class SimpleProvider(Provider):
         return self.__str__()
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class RegisteredProvider(Provider):
     provider_id: int
     name: str
     access_token: AccessToken = dc.field(repr=False)
-    registered_at: dt.datetime = dc.field(default=dt.datetime.now(pytz.UTC))
+    registered_at: dt.datetime = dc.field(default_factory=utc_now)
 
     def __str__(self) -> str:
         return (
@@ -0,0 +1,48 @@
+import dataclasses as dc
+import datetime as dt
+import enum
+
+
+class ReadinessEngine(enum.Enum):
+    """Where readiness of uncached, unindexed requests is evaluated"""
+    PYTHON = 'python'  # load partitions and their last events, evaluate in the service
+    SQL = 'sql'        # evaluate within a single statement, see `EventsRegistry.get_readiness_summary`
+
+
+@dc.dataclass(frozen=True)
+class ReadinessSummary:
+    """Everything needed to tell the readiness verdict of requested interval"""
+    partitions: int                      # partitions intersected with requested interval
+    events: int                          # last events of these partitions
+    locked_by: int | None                # smallest id of partition with last LOCK event
+    first_start: dt.datetime | None      # start of the earliest partition with events
+    last_end: dt.datetime | None         # end of the latest partition with events
+    gap_start: dt.datetime | None        # first gap between partitions with events
+    gap_end: dt.datetime | None
+
+
+@dc.dataclass(frozen=True)
+class CoverageGap:
+    """Part of requested interval not covered by partitions with events"""
+    start: dt.datetime
+    end: dt.datetime
+
+
+@dc.dataclass(frozen=True)
+class LockedPartition:
+    partition_id: int
+    start: dt.datetime
+    end: dt.datetime
+
+
+@dc.dataclass(frozen=True)
+class CoverageReport:
+    """Every reason requested interval is not ready, see `CoverageSweep`"""
+    partitions: int                 # partitions with events intersected with requested interval
+    gaps: list[CoverageGap]
+    locked: list[LockedPartition]
+    covered_fraction: float         # part of requested interval covered by partitions with events
+
+    @property
+    def is_ready(self) -> bool:
+        return self.partitions > 0 and not self.gaps and not self.locked
@@ -0,0 +1,68 @@
+import dataclasses as dc
+import datetime as dt
+import json
+from typing import Any
+
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.status import ValidationFailed
+from partition_registry.data.func import localize
+
+
+@dc.dataclass(frozen=True)
+class ReadinessRequest:
+    source_name: str
+    start: dt.datetime
+    end: dt.datetime
+
+
+def parse_partitions_payload(payload: bytes, content_type: str) -> list[SimplePartition | ValidationFailed]:
+    """Parse JSON array or NDJSON stream of {"start": ..., "end": ...} objects
+
+    Every row is parsed independently, so one malformed row doesn't fail the whole payload.
+    Naive timestamps are converted to UTC.
+    """
+    if not content_type.startswith('application/x-ndjson'):
+        try:
+            rows = json.loads(payload)
+        except json.JSONDecodeError as e:
+            return [ValidationFailed(f"Payload is not valid JSON: {e}")]
+        if not isinstance(rows, list):
+            return [ValidationFailed("Payload should be a JSON array of partitions...")]
+        return [parse_partition(row) for row in rows]
+
+    parser = PartitionsStreamParser()
+    return parser.feed(payload) + parser.close()
+
+
+class PartitionsStreamParser:
+    """NDJSON partitions fed by chunks of the body as they arrive, so the whole body is never kept in memory"""
+
+    def __init__(self) -> None:
+        self.tail = b''
+
+    def feed(self, chunk: bytes) -> list[SimplePartition | ValidationFailed]:
+        lines = (self.tail + chunk).split(b'\n')
+        self.tail = lines.pop()
+        return [parse_line(line) for line in lines if line.strip()]
+
+    def close(self) -> list[SimplePartition | ValidationFailed]:
+        """Parse the last line, it may come without a trailing newline"""
+        tail, self.tail = self.tail, b''
+        return [parse_line(tail)] if tail.strip() else []
+
+
+def parse_line(line: bytes) -> SimplePartition | ValidationFailed:
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as e:
+        return ValidationFailed(f"Line <<{line.strip()!r}>> is not valid JSON: {e}")
+    return parse_partition(row)
+
+
+def parse_partition(row: Any) -> SimplePartition | ValidationFailed:
+    try:
+        start = localize(dt.datetime.fromisoformat(row['start']))
+        end = localize(dt.datetime.fromisoformat(row['end']))
+    except (KeyError, TypeError, ValueError) as e:
+        return ValidationFailed(f"Partition <<{row}>> can't be parsed: {e!r}")
+    return SimplePartition(start, end)
@@ -1,23 +1,52 @@
 import dataclasses as dc
 from http import HTTPStatus
+from typing import Any
 
 from partition_registry.data.source import RegisteredSource
 from partition_registry.data.provider import RegisteredProvider
 from partition_registry.data.partition import RegisteredPartition
 from partition_registry.data.event import RegisteredPartitionEvent
+from partition_registry.data.dependency import DependencyGroup
+from partition_registry.data.readiness import CoverageGap
+from partition_registry.data.readiness import LockedPartition
+
+
+# Bodies are serialized as they are by `ORJSONResponse`, status is the HTTP status of the response
 
 
 @dc.dataclass(frozen=True)
-class BaseResponse:
-    status_code: HTTPStatus
+class ErrorResponse:
+    detail: str
 
 
 @dc.dataclass(frozen=True)
-class SucceededRegistrationResponse(BaseResponse):
-    registered_object: RegisteredSource | RegisteredProvider | RegisteredPartition | RegisteredPartitionEvent
+class SucceededRegistrationResponse:
+    registered_object: (
+        RegisteredSource | RegisteredProvider | RegisteredPartition | RegisteredPartitionEvent | DependencyGroup
+    )
 
 
 @dc.dataclass(frozen=True)
-class PartitionReadinessResponse(BaseResponse):
+class PartitionReadinessResponse:
     is_ready: bool
     message: str | None = dc.field(default=None)
+
+
+@dc.dataclass(frozen=True)
+class DependencyReadinessResponse:
+    is_ready: bool
+    blocking: dict[str, str] = dc.field(default_factory=dict)
+
+
+@dc.dataclass(frozen=True)
+class CoverageReportResponse:
+    is_ready: bool
+    partitions: int
+    covered_fraction: float
+    gaps: list[CoverageGap]
+    locked: list[LockedPartition]
+
+
+def error_responses(*statuses: HTTPStatus) -> dict[int | str, dict[str, Any]]:
+    """OpenAPI description of error responses of a route"""
+    return {status.value: {'model': ErrorResponse, 'description': status.phrase} for status in statuses}
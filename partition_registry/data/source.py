@@ -3,15 +3,17 @@ from typing import Protocol
 import datetime as dt
 import dataclasses as dc
 
-import pytz
 
 from partition_registry.data.access_token import AccessToken
+from partition_registry.data.func import utc_now
 
 from partition_registry.data.status import ValidationSucceded
 from partition_registry.data.status import ValidationFailed
 
 
 class Source(Protocol):
+    __slots__ = ()
+
     name: str
     owner: str
 
@@ -38,7 +40,7 @@ class Source(Protocol):
         return str(self)
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class SimpleSource(Source):
     name: str
     owner: str
@@ -52,13 +54,13 @@ class SimpleSource(Source):
         )
 
 
-@dc.dataclass(frozen=True)
+@dc.dataclass(frozen=True, slots=True)
 class RegisteredSource(Source):
     source_id: int
     name: str
     owner: str
     access_token: AccessToken = dc.field(repr=False)
-    registered_at: dt.datetime = dc.field(default=dt.datetime.now(pytz.UTC))
+    registered_at: dt.datetime = dc.field(default_factory=utc_now)
 
     def __str__(self) -> str:
         return (
@@ -0,0 +1,229 @@
+"""Prometheus metrics of a single worker, exposed in the text exposition format
+
+Request latencies are observed by `MetricsMiddleware`, outcomes of actions are counted by handlers
+with `Metrics.record_outcome`, queries by engine events, and caches are read when metrics are collected.
+"""
+import bisect
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from partition_registry.actions.check_partition_readiness import reason_class
+from partition_registry.actor.cache import Cache
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.integration.postgres import statement_kind
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, request and query latencies of the registry are mostly milliseconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+# Label of readiness checks of sources not registered
+OTHER_SOURCE = 'other'
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Labels) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.values: dict[Labels, float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self.lock:
+            values = list(self.values.items())
+        for labels, value in values:
+            yield f"{self.name}{render_labels(self.label_names, labels)} {format_value(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Labels, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # Per labels: observations within every bucket (not cumulative, the last one is +Inf), sum
+        self.values: dict[Labels, tuple[list[int], list[float]]] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[position] += 1
+            total[0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self.lock:
+            values = [(labels, list(counts), total[0]) for labels, (counts, total) in self.values.items()]
+        label_names = (*self.label_names, 'le')
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*map(format_value, self.buckets), '+Inf'), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{render_labels(label_names, (*labels, bound))} {cumulative}"
+            yield f"{self.name}_sum{render_labels(self.label_names, labels)} {format_value(total)}"
+            yield f"{self.name}_count{render_labels(self.label_names, labels)} {cumulative}"
+
+
+class Metrics:
+    """Every metric of the worker, rendered on each scrape"""
+
+    def __init__(self) -> None:
+        self.requests = Histogram(
+            'partition_registry_request_duration_seconds', "Latency of handled requests", ('handler', 'method', 'status')
+        )
+        self.outcomes = Counter(
+            'partition_registry_outcomes_total', "Outcomes of handled requests by type", ('handler', 'outcome', 'reason')
+        )
+        # Bounded by the number of registered sources, checks of unknown names are counted as OTHER_SOURCE
+        self.readiness_checks = Counter(
+            'partition_registry_readiness_checks_total', "Readiness checks and coverage reports by source", ('source',)
+        )
+        # Sources once seen registered keep their series when they leave the source cache
+        self.source_labels: set[str] = set()
+        self.queries = Histogram(
+            'partition_registry_db_query_duration_seconds', "Latency of executed SQL statements", ('statement',)
+        )
+        self.query_errors = Counter('partition_registry_db_query_errors_total', "Failed SQL statements", ('statement',))
+        self.caches: dict[str, Cache[Any, Any]] = {}
+
+    def record_outcome(self, handler: str, outcome: object) -> None:
+        """Count result of an action, every item of a list result is counted"""
+        match outcome:
+            case list():
+                for item in outcome:
+                    self.record_outcome(handler, item)
+            case PartitionNotReady():
+                self.outcomes.inc((handler, type(outcome).__name__, reason_class(outcome)))
+            case _:
+                self.outcomes.inc((handler, type(outcome).__name__, ''))
+
+    def count_readiness_checks(self, source_names: Iterable[str], is_registered: Callable[[str], bool]) -> None:
+        """Count checks by source, names are arbitrary request input so only registered ones become labels"""
+        for source_name in source_names:
+            if source_name not in self.source_labels and is_registered(source_name):
+                self.source_labels.add(source_name)
+            self.readiness_checks.inc((source_name if source_name in self.source_labels else OTHER_SOURCE,))
+
+    def register_caches(self, caches: Mapping[str, Cache[Any, Any]]) -> None:
+        self.caches.update(caches)
+
+    def instrument_engine(self, engine: Engine | AsyncEngine) -> None:
+        """Observe every statement executed by the engine"""
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+            conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+        def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+            started = conn.info['query_started'].pop()
+            self.queries.observe((statement_kind(statement),), time.perf_counter() - started)
+
+        def handle_error(context: Any) -> None:
+            if context.statement is None:
+                return
+            if context.connection is not None and context.connection.info.get('query_started'):
+                context.connection.info['query_started'].pop()
+            self.query_errors.inc((statement_kind(context.statement),))
+
+        event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(sync_engine, 'handle_error', handle_error)
+
+    def render(self) -> str:
+        lines = [
+            *self.requests.render(),
+            *self.outcomes.render(),
+            *self.readiness_checks.render(),
+            *self.queries.render(),
+            *self.query_errors.render(),
+            *self.render_caches(),
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def render_caches(self) -> Iterable[str]:
+        stats = {name: cache.stats() for name, cache in self.caches.items()}
+        for key, metric_type, documentation in (
+            ('size', 'gauge', "Entries held by the cache"),
+            ('max_size', 'gauge', "Entries the cache may hold"),
+            ('hits', 'counter', "Lookups answered by the cache"),
+            ('misses', 'counter', "Lookups missed by the cache"),
+            ('evictions', 'counter', "Entries evicted to make room for new ones"),
+        ):
+            name = f"partition_registry_cache_{key}{'_total' if metric_type == 'counter' else ''}"
+            yield f"# HELP {name} {documentation}"
+            yield f"# TYPE {name} {metric_type}"
+            for cache_name, cache_stats in stats.items():
+                if key in cache_stats:
+                    yield f"{name}{render_labels(('cache',), (cache_name,))} {cache_stats[key]}"
+
+
+class MetricsMiddleware:
+    """Observes latency of every request by the name of its handler, until the response is sent"""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.clock = clock
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = self.clock()
+        status = '500'
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            # Route is set by the router once the request is matched
+            route = scope.get('route')
+            handler = getattr(route, 'name', None) or 'unmatched'
+            self.metrics.requests.observe((handler, scope['method'], status), self.clock() - started)
+
+
+def render_labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
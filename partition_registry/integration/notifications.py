@@ -0,0 +1,86 @@
+"""Changes of sources published with Postgres NOTIFY
+
+Registries publish every registered partition and event within the transaction of the write,
+so the change is delivered to listeners once it's committed.
+Every worker holds one LISTEN connection and hands received changes to its subscribers.
+"""
+import asyncio
+import logging
+from typing import Any
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import TextClause
+from sqlalchemy import text
+
+from partition_registry.data.change import SourceChange
+from partition_registry.integration.postgres import postgres_url
+
+
+CHANNEL = 'partition_registry_changes'
+
+logger = logging.getLogger(__name__)
+
+
+def notify_statement(channel: str, changes: list[SourceChange]) -> TextClause:
+    """Publish changes with one statement, they are delivered when the transaction commits"""
+    return text(
+        "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS TEXT[])) AS payload"
+    ).bindparams(channel=channel, payloads=[change.to_json() for change in changes])
+
+
+class ChangesListener:
+    """Dedicated LISTEN connection of the worker, reconnected when it's lost
+
+    Changes published while the connection is lost are not received, `on_connect` is called
+    once the connection listens again, so state kept up to date by changes can be dropped.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[SourceChange], None],
+        channel: str = CHANNEL,
+        reconnect_delay: float = 1.0,
+        on_connect: Callable[[], None] | None = None,
+    ) -> None:
+        self.on_change = on_change
+        self.on_connect = on_connect
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.listening = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def listen(self) -> None:
+        while True:
+            lost = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(postgres_url())
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Can't listen to changes: %s", e)
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self.receive)
+                if self.on_connect is not None:
+                    self.on_connect()
+                self.listening.set()
+                await lost.wait()
+                logger.warning("Connection listening to changes is lost")
+            finally:
+                self.listening.clear()
+                if not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def receive(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.on_change(SourceChange.from_json(payload))
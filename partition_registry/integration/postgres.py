@@ -1,33 +1,200 @@
 import os
-from typing import Iterator
-from contextlib import contextmanager
+import logging
+import threading
+import time
+from typing import Any
+from contextvars import ContextVar
 
 from sqlalchemy import create_engine
 from sqlalchemy import Engine
+from sqlalchemy import QueuePool
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
 
 
-@contextmanager
-def init_postgres_engine() -> Iterator[Engine]:
+logger = logging.getLogger(__name__)
+
+# Set for every request handled by the service, see `init_postgres_session`
+request_scope: ContextVar[object | None] = ContextVar('request_scope', default=None)
+
+# Method running the current statements, e.g. `PartitionRegistry.db_lookup`, see `tracing.traced`
+query_tag: ContextVar[str | None] = ContextVar('query_tag', default=None)
+
+class QueryTagging:
+    """Whether `tracing.traced` sets `query_tag`, only the slow query log reads it"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+
+
+# Enabled by `instrument_queries` with the slow query log on
+query_tagging = QueryTagging()
+
+# Statements executed while handling the current request, see `QueryCountMiddleware`
+request_queries: ContextVar[list[int] | None] = ContextVar('request_queries', default=None)
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+
+def postgres_url(driver: str | None = None) -> str:
+    """SQLAlchemy URL with the given driver, plain libpq URL without it"""
     host = os.getenv('POSTGRES_APPLICATION_HOST', 'localhost')
     user = os.getenv('POSTGRES_APPLICATION_USER', 'postgres')
     password = os.getenv('POSTGRES_APPLICATION_PASSWORD', 'changeme')
     db = os.getenv('POSTGRES_APPLICATION_DATABASE_NAME', 'partition_registry')
-    engine = create_engine(f'postgresql+psycopg2://{user}:{password}@{host}/{db}', echo=False)
-    try:
-        yield engine
-    finally:
-        engine.dispose()
-
-
-@contextmanager
-def init_postgres_session() -> Iterator[scoped_session[Session]]:
-    with init_postgres_engine() as engine:
-        session_factory = sessionmaker(bind=engine)
-        session = scoped_session(session_factory)
+    scheme = 'postgresql' if driver is None else f'postgresql+{driver}'
+    return f'{scheme}://{user}:{password}@{host}/{db}'
+
+
+def postgres_pool_options() -> dict[str, Any]:
+    """Connection pool settings of a single worker
+
+    Every worker holds up to `pool_size + max_overflow` connections,
+    so the sum over all workers should stay below Postgres `max_connections`.
+    """
+    return {
+        'pool_size': int(os.getenv('POSTGRES_APPLICATION_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('POSTGRES_APPLICATION_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('POSTGRES_APPLICATION_POOL_TIMEOUT', '30')),
+        'pool_pre_ping': os.getenv('POSTGRES_APPLICATION_POOL_PRE_PING', 'false').lower() == 'true',
+        'pool_recycle': int(os.getenv('POSTGRES_APPLICATION_POOL_RECYCLE', '-1')),
+    }
+
+
+def postgres_statement_timeout() -> int:
+    """Statement timeout in milliseconds, 0 disables it"""
+    return int(os.getenv('POSTGRES_APPLICATION_STATEMENT_TIMEOUT', '0'))
+
+
+def postgres_slow_query_threshold() -> float:
+    """Duration in milliseconds after which statements are logged, 0 disables the log"""
+    return float(os.getenv('POSTGRES_APPLICATION_SLOW_QUERY_THRESHOLD', '500'))
+
+
+def init_postgres_engine() -> Engine:
+    """Engine doesn't connect until first use, call `engine.dispose()` on shutdown"""
+    return create_engine(
+        postgres_url('psycopg2'),
+        echo=False,
+        connect_args={'options': f'-c statement_timeout={postgres_statement_timeout()}'},
+        **postgres_pool_options(),
+    )
+
+
+def current_scope() -> object:
+    """Request scope if any, otherwise the current thread (scripts, tests)"""
+    scope = request_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+
+def init_postgres_session(engine: Engine | AsyncEngine) -> scoped_session[Session]:
+    """Session registry with a separate session for every request
+
+    Set `request_scope` at the start of the request and call `session.remove()`
+    at its end to close the session and return the connection to the pool.
+    Requests served by the threadpool see the scope too, because
+    the context is copied into the worker thread.
+
+    Sessions over an AsyncEngine must be used within `sqlalchemy.util.greenlet_spawn`,
+    as AsyncSession does, so waiting for asyncpg suspends the request instead of the event loop.
+    """
+    session_factory = sessionmaker(bind=engine.sync_engine if isinstance(engine, AsyncEngine) else engine)
+    return scoped_session(session_factory, scopefunc=current_scope)
+
+
+def init_async_postgres_engine() -> AsyncEngine:
+    """Engine doesn't connect until first use, call `await engine.dispose()` on shutdown"""
+    return create_async_engine(
+        postgres_url('asyncpg'),
+        echo=False,
+        connect_args={'server_settings': {'statement_timeout': str(postgres_statement_timeout())}},
+        **postgres_pool_options(),
+    )
+
+
+def pool_stats(engine: Engine | AsyncEngine) -> dict[str, int]:
+    """Connection pool usage of the current worker"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'pid': os.getpid()}
+
+    options = postgres_pool_options()
+    return {
+        'pid': os.getpid(),
+        'pool_size': pool.size(),
+        'max_connections': options['pool_size'] + options['max_overflow'],
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+    }
+
+
+def instrument_queries(engine: Engine | AsyncEngine, slow_query_threshold: float) -> None:
+    """Count statements of the current request and log those slower than `slow_query_threshold` milliseconds"""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if slow_query_threshold:
+        query_tagging.enabled = True
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if (queries := request_queries.get()) is not None:
+            queries[0] += 1
+        conn.info.setdefault('slow_query_started', []).append(time.perf_counter())
+
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        duration = (time.perf_counter() - conn.info['slow_query_started'].pop()) * 1000
+        if slow_query_threshold and duration >= slow_query_threshold:
+            logger.warning(
+                "Slow query of %s took %.1f ms: %s", query_tag.get() or 'untagged', duration, ' '.join(statement.split())
+            )
+
+    def handle_error(context: Any) -> None:
+        if context.connection is not None and context.connection.info.get('slow_query_started'):
+            context.connection.info['slow_query_started'].pop()
+
+    event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(sync_engine, 'handle_error', handle_error)
+
+
+class QueryCountMiddleware:
+    """Counts statements executed while handling the request, the count is sent in the `X-Query-Count` header
+
+    Statements are counted by engines passed to `instrument_queries`, until the response starts.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        queries = [0]
+
+        async def send_count(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(QUERY_COUNT_HEADER, str(queries[0]))
+            await send(message)
+
+        token = request_queries.set(queries)
         try:
-            yield session
+            await self.app(scope, receive, send_count)
         finally:
-            session.remove()
+            request_queries.reset(token)
+
+
+def statement_kind(statement: str) -> str:
+    """First keyword of the statement, e.g. SELECT or INSERT"""
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else ''
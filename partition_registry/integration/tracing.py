@@ -0,0 +1,600 @@
+"""Spans of requests, actions, registry methods, cache lookups and SQL statements
+
+Spans follow the OpenTelemetry data model and are exported as OTLP JSON, one export request per line,
+so the output can be replayed to any OTLP collector or read as it is. Sampling is decided once per trace
+by its id (like the `TraceIdRatioBased` sampler), nested spans follow the decision of their parent.
+Ended spans are buffered and exported in batches by a background thread (like the `BatchSpanProcessor`),
+so requests never wait for the exporter.
+"""
+import atexit
+import collections
+import dataclasses as dc
+import enum
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from typing import AsyncGenerator
+from typing import AsyncIterator
+from typing import Callable
+from typing import Generator
+from typing import Generic
+from typing import Hashable
+from typing import Iterator
+from typing import Protocol
+from typing import Sequence
+from typing import TextIO
+from typing import TypeVar
+from typing import cast
+
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from partition_registry.actor.cache import Cache
+from partition_registry.integration.postgres import query_tag
+from partition_registry.integration.postgres import query_tagging
+from partition_registry.integration.postgres import statement_kind
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar('F', bound=Callable[..., Any])
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+AttributeValue = str | bool | int | float
+
+SERVICE_NAME = 'partition-registry'
+TRACEPARENT_HEADER = 'traceparent'
+
+
+class SpanKind(enum.Enum):
+    """Values of OTLP `Span.SpanKind`"""
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class SpanExporterType(enum.Enum):
+    OFF = 'off'
+    CONSOLE = 'console'
+    FILE = 'file'
+
+
+@dc.dataclass(frozen=True)
+class SpanContext:
+    trace_id: str   # 32 hex digits
+    span_id: str    # 16 hex digits
+    sampled: bool
+
+
+# Span running in the current request, task or thread
+current_context: ContextVar[SpanContext | None] = ContextVar('current_context', default=None)
+
+
+@dc.dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str | None
+    kind: SpanKind
+    start_time: int                 # unix nanoseconds
+    end_time: int | None = None
+    attributes: dict[str, AttributeValue] = dc.field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Span in OTLP JSON encoding"""
+        otlp: dict[str, Any] = {
+            'traceId': self.context.trace_id,
+            'spanId': self.context.span_id,
+            'name': self.name,
+            'kind': self.kind.value,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time),
+            'attributes': otlp_attributes(self.attributes),
+            # STATUS_CODE_ERROR, spans without errors are left unset
+            'status': {'code': 2, 'message': self.error} if self.error is not None else {},
+        }
+        if self.parent_span_id is not None:
+            otlp['parentSpanId'] = self.parent_span_id
+        return otlp
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class StreamSpanExporter:
+    """Writes every export request as a line of OTLP JSON"""
+
+    def __init__(self, stream: TextIO, service_name: str = SERVICE_NAME) -> None:
+        self.stream = stream
+        self.service_name = service_name
+        self.lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(export_request(spans, self.service_name), separators=(',', ':'))
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+class ConsoleSpanExporter(StreamSpanExporter):
+    def __init__(self, service_name: str = SERVICE_NAME) -> None:
+        super().__init__(sys.stdout, service_name)
+
+
+class FileSpanExporter(StreamSpanExporter):
+    """Appends spans to the file, every worker may append to the same file"""
+
+    def __init__(self, path: str, service_name: str = SERVICE_NAME) -> None:
+        super().__init__(open(path, 'a', encoding='utf-8'), service_name)
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+class BatchSpanExporter:
+    """Buffers spans and hands them to the exporter in batches from a background thread
+
+    A batch is exported once `max_export_batch_size` spans are buffered or `schedule_delay` seconds pass.
+    Spans ended while `max_queue_size` spans are waiting are dropped, so a slow exporter never blocks requests.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 512,
+        schedule_delay: float = 5.0,
+    ) -> None:
+        self.exporter = exporter
+        self.max_queue_size = max_queue_size
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay = schedule_delay
+        self.queue: collections.deque[Span] = collections.deque()
+        self.condition = threading.Condition()
+        self.flushing = False
+        self.closed = False
+        self.dropped = 0
+        self.thread = threading.Thread(target=self.worker, name='span-exporter', daemon=True)
+        self.thread.start()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self.condition:
+            if self.closed:
+                self.dropped += len(spans)
+                return
+            accepted = spans[:self.max_queue_size - len(self.queue)]
+            self.queue.extend(accepted)
+            self.dropped += len(spans) - len(accepted)
+            if len(self.queue) >= self.max_export_batch_size:
+                self.condition.notify_all()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Export every buffered span, False if it doesn't happen within timeout"""
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            return self.condition.wait_for(lambda: not self.flushing, timeout)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Export every buffered span and stop the thread, later spans are dropped"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        if self.dropped:
+            logger.warning("%d spans were dropped because the export queue was full", self.dropped)
+
+    def worker(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.closed or self.flushing or len(self.queue) >= self.max_export_batch_size,
+                    self.schedule_delay,
+                )
+                batch = [self.queue.popleft() for _ in range(min(len(self.queue), self.max_export_batch_size))]
+
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    logger.exception("Can't export %d spans", len(batch))
+
+            with self.condition:
+                if not self.queue:
+                    self.flushing = False
+                    self.condition.notify_all()
+                    if self.closed:
+                        return
+
+
+class Tracer:
+    """Starts spans and exports them once they end, does nothing until it has an exporter"""
+
+    def __init__(self, exporter: SpanExporter | None = None, sample_ratio: float = 1.0) -> None:
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def configure(self, exporter: SpanExporter | None, sample_ratio: float) -> None:
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def shutdown(self) -> None:
+        """Export buffered spans and stop tracing"""
+        exporter, self.exporter = self.exporter, None
+        match exporter:
+            case BatchSpanExporter():
+                exporter.shutdown()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def is_sampled(self, trace_id: str) -> bool:
+        return int(trace_id[16:], 16) < self.sample_ratio * 2 ** 64
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> Span | None:
+        """Child of the current span, new trace without it. None when tracing is off or the trace isn't sampled
+
+        Root of a trace which isn't sampled is still returned, so its children know they aren't sampled.
+        """
+        if self.exporter is None:
+            return None
+
+        parent = current_context.get()
+        if parent is None:
+            trace_id = f"{random.getrandbits(128):032x}"
+            context = SpanContext(trace_id, new_span_id(), self.is_sampled(trace_id))
+        elif parent.sampled:
+            context = SpanContext(parent.trace_id, new_span_id(), True)
+        else:
+            return None
+        return Span(
+            name=name,
+            context=context,
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            start_time=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+
+    def end_span(self, span: Span | None, error: BaseException | None = None) -> None:
+        if span is None or not span.context.sampled or self.exporter is None:
+            return
+        span.end_time = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export([span])
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> Iterator[Span | None]:
+        """Span running within the block, current span of nested spans"""
+        span = self.start_span(name, kind, attributes)
+        if span is None:
+            yield None
+            return
+
+        token = current_context.set(span.context)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            current_context.reset(token)
+
+    def instrument_engine(self, engine: Engine | AsyncEngine) -> None:
+        """Span of every statement executed by the engine, child of the span executing it"""
+        sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+            operation = statement_kind(statement)
+            span = self.start_span(operation, SpanKind.CLIENT, {
+                'db.system': 'postgresql',
+                'db.operation': operation,
+                'db.statement': ' '.join(statement.split()),
+            })
+            conn.info.setdefault('trace_spans', []).append(span)
+
+        def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+            self.end_span(conn.info['trace_spans'].pop())
+
+        def handle_error(context: Any) -> None:
+            if context.connection is not None and context.connection.info.get('trace_spans'):
+                self.end_span(context.connection.info['trace_spans'].pop(), context.original_exception)
+
+        event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(sync_engine, 'handle_error', handle_error)
+
+
+# Shared by every traced function of the worker, see `configure_tracer`
+tracer = Tracer()
+# Buffered spans are exported on exit even if the app is stopped without its lifespan
+atexit.register(tracer.shutdown)
+
+
+def configure_tracer() -> None:
+    """Configure `tracer` with PARTITION_REGISTRY_TRACING_* variables, call `tracer.shutdown()` on shutdown"""
+    sample_ratio = float(os.getenv('PARTITION_REGISTRY_TRACING_SAMPLE_RATIO', '1.0'))
+    tracer.shutdown()
+
+    def batched(exporter: SpanExporter) -> BatchSpanExporter:
+        return BatchSpanExporter(
+            exporter,
+            max_queue_size=int(os.getenv('PARTITION_REGISTRY_TRACING_QUEUE_SIZE', '2048')),
+            max_export_batch_size=int(os.getenv('PARTITION_REGISTRY_TRACING_BATCH_SIZE', '512')),
+            schedule_delay=float(os.getenv('PARTITION_REGISTRY_TRACING_EXPORT_DELAY', '5')),
+        )
+
+    match SpanExporterType(os.getenv('PARTITION_REGISTRY_TRACING', SpanExporterType.OFF.value).lower()):
+        case SpanExporterType.OFF:
+            tracer.configure(None, sample_ratio)
+        case SpanExporterType.CONSOLE:
+            tracer.configure(batched(ConsoleSpanExporter()), sample_ratio)
+        case SpanExporterType.FILE:
+            tracer.configure(batched(FileSpanExporter(os.getenv('PARTITION_REGISTRY_TRACING_FILE', 'spans.jsonl'))), sample_ratio)
+
+
+def traced(function: F) -> F:
+    """Span of every call named by the qualified name of the function, e.g. `EventsRegistry.safe_register`
+
+    Statements executed within the call are attributed to the function in the slow query log.
+    Generators keep their span until they are exhausted or closed.
+    With tracing off and the slow query log off the function is called as it is.
+    """
+    name = function.__qualname__
+    attributes: dict[str, AttributeValue] = {'code.namespace': function.__module__, 'code.function': function.__name__}
+
+    if inspect.isasyncgenfunction(function):
+        @functools.wraps(function)
+        def async_generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled and not query_tagging.enabled:
+                return function(*args, **kwargs)
+            return traced_async_generator(name, attributes, function(*args, **kwargs))
+        return cast(F, async_generator_wrapper)
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled and not query_tagging.enabled:
+                return function(*args, **kwargs)
+            return traced_generator(name, attributes, function(*args, **kwargs))
+        return cast(F, generator_wrapper)
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def coroutine_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled and not query_tagging.enabled:
+                return await function(*args, **kwargs)
+            with call(name, attributes):
+                return await function(*args, **kwargs)
+        return cast(F, coroutine_wrapper)
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not tracer.enabled and not query_tagging.enabled:
+            return function(*args, **kwargs)
+        with call(name, attributes):
+            return function(*args, **kwargs)
+    return cast(F, wrapper)
+
+
+@contextmanager
+def call(name: str, attributes: dict[str, AttributeValue]) -> Iterator[None]:
+    """Tag statements and record the span of a traced call, whichever of them is enabled"""
+    tag_token = query_tag.set(name) if query_tagging.enabled else None
+    try:
+        with tracer.span(name, attributes=attributes):
+            yield
+    finally:
+        if tag_token is not None:
+            query_tag.reset(tag_token)
+
+
+async def traced_async_generator(name: str, attributes: dict[str, AttributeValue], generator: AsyncGenerator[Any, None]) -> AsyncIterator[Any]:
+    span = tracer.start_span(name, attributes=attributes)
+    error: BaseException | None = None
+    try:
+        while True:
+            with step(name, span):
+                try:
+                    item = await anext(generator)
+                except StopAsyncIteration:
+                    return
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        await generator.aclose()
+        tracer.end_span(span, error)
+
+
+def traced_generator(name: str, attributes: dict[str, AttributeValue], generator: Generator[Any, None, None]) -> Iterator[Any]:
+    span = tracer.start_span(name, attributes=attributes)
+    error: BaseException | None = None
+    try:
+        while True:
+            with step(name, span):
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        generator.close()
+        tracer.end_span(span, error)
+
+
+@contextmanager
+def step(name: str, span: Span | None) -> Iterator[None]:
+    """Make the span of a generator current while it produces the next item"""
+    tag_token = query_tag.set(name) if query_tagging.enabled else None
+    context_token = current_context.set(span.context) if span is not None else None
+    try:
+        yield
+    finally:
+        if context_token is not None:
+            current_context.reset(context_token)
+        if tag_token is not None:
+            query_tag.reset(tag_token)
+
+
+class TracedCache(Generic[K, V]):
+    """Cache recording a span of every lookup, whether it was a hit or not"""
+
+    def __init__(self, name: str, cache: Cache[K, V]) -> None:
+        self.name = name
+        self.cache = cache
+
+    def get(self, key: K) -> V | None:
+        with tracer.span(f"cache {self.name}", attributes={'cache.name': self.name}) as span:
+            value = self.cache.get(key)
+            if span is not None:
+                span.set_attribute('cache.hit', value is not None)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        self.cache.put(key, value)
+
+    def invalidate(self, key: K) -> None:
+        self.cache.invalidate(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self.cache.stats()
+
+
+class TracingMiddleware:
+    """Server span of every request, continuing the trace of the W3C `traceparent` header if it's given"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        remote_token = None
+        if (remote := parse_traceparent(Headers(scope=scope).get(TRACEPARENT_HEADER))) is not None:
+            remote_token = current_context.set(remote)
+        span = tracer.start_span(scope['method'], SpanKind.SERVER, {
+            'http.request.method': scope['method'],
+            'url.path': scope['path'],
+        })
+        token = current_context.set(span.context) if span is not None else None
+
+        async def send_status(message: Message) -> None:
+            if message['type'] == 'http.response.start' and span is not None:
+                span.set_attribute('http.response.status_code', message['status'])
+            await send(message)
+
+        error: BaseException | None = None
+        try:
+            await self.app(scope, receive, send_status)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if token is not None:
+                current_context.reset(token)
+            if remote_token is not None:
+                current_context.reset(remote_token)
+            # Route is set by the router once the request is matched
+            if span is not None and (path := getattr(scope.get('route'), 'path', None)) is not None:
+                span.name = f"{scope['method']} {path}"
+                span.set_attribute('http.route', path)
+            tracer.end_span(span, error)
+
+
+def parse_traceparent(traceparent: str | None) -> SpanContext | None:
+    """Remote parent of `version-trace_id-parent_id-flags`, None if the header is missing or malformed"""
+    match (traceparent or '').strip().split('-'):
+        case [version, trace_id, span_id, flags] if (
+            len(version) == 2 and len(trace_id) == 32 and len(span_id) == 16 and len(flags) == 2
+            and is_hex(version + trace_id + span_id + flags)
+            and int(trace_id, 16) != 0 and int(span_id, 16) != 0
+        ):
+            return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+    return None
+
+
+def is_hex(value: str) -> bool:
+    return all(character in '0123456789abcdef' for character in value)
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+def otlp_attributes(attributes: dict[str, AttributeValue]) -> list[dict[str, Any]]:
+    return [{'key': key, 'value': otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_value(value: AttributeValue) -> dict[str, Any]:
+    match value:
+        case bool():
+            return {'boolValue': value}
+        case int():
+            # 64-bit integers are strings in OTLP JSON
+            return {'intValue': str(value)}
+        case float():
+            return {'doubleValue': value}
+    return {'stringValue': value}
+
+
+def export_request(spans: Sequence[Span], service_name: str) -> dict[str, Any]:
+    """OTLP `ExportTraceServiceRequest` of the spans"""
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({'service.name': service_name})},
+            'scopeSpans': [{
+                'scope': {'name': 'partition_registry'},
+                'spans': [span.to_otlp() for span in spans],
+            }],
+        }],
+    }
@@ -0,0 +1,4 @@
+from partition_registry.maintenance.cli import main
+
+
+raise SystemExit(main())
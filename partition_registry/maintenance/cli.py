@@ -0,0 +1,86 @@
+"""Maintenance of the Partition Registry database, meant to be run periodically
+
+Usage:
+    python -m partition_registry.maintenance events   # create upcoming partitions of events, retire expired ones
+    python -m partition_registry.maintenance compact  # collapse events history older than the horizon
+
+Options default to environment variables:
+    PARTITION_REGISTRY_EVENTS_MONTHS_AHEAD    monthly partitions created in advance, 3 by default
+    PARTITION_REGISTRY_EVENTS_RETENTION_DAYS  age of retired partitions, 0 (default) keeps every partition
+    PARTITION_REGISTRY_EVENTS_ARCHIVE         move retired partitions to the archive schema (default) or drop them
+    PARTITION_REGISTRY_COMPACTION_HORIZON_DAYS  age of compacted events, 30 by default
+    PARTITION_REGISTRY_COMPACTION_BATCH_SIZE    events removed within one transaction, 1000 by default
+    PARTITION_REGISTRY_COMPACTION_ARCHIVE       copy removed events to the archive schema, false by default
+"""
+import argparse
+import datetime as dt
+import os
+from typing import Sequence
+
+from sqlalchemy import text
+
+from partition_registry.integration.postgres import init_postgres_engine
+from partition_registry.maintenance.compaction import COMPACTED_EVENTS
+from partition_registry.maintenance.compaction import compact_events
+from partition_registry.maintenance.events_partitions import ARCHIVE_SCHEMA
+from partition_registry.maintenance.events_partitions import create_events_partitions
+from partition_registry.maintenance.events_partitions import retire_events_partitions
+
+
+# Serializes maintenance started from several hosts at once
+MAINTENANCE_LOCK_KEY = 5499
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m partition_registry.maintenance', description="Partition Registry maintenance")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    events = subparsers.add_parser('events', help="create upcoming partitions of events, retire expired ones")
+    events.add_argument('--months-ahead', type=int, default=int(os.getenv('PARTITION_REGISTRY_EVENTS_MONTHS_AHEAD', '3')))
+    events.add_argument('--retention-days', type=int, default=int(os.getenv('PARTITION_REGISTRY_EVENTS_RETENTION_DAYS', '0')))
+    events.add_argument(
+        '--archive',
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv('PARTITION_REGISTRY_EVENTS_ARCHIVE', 'true').lower() == 'true',
+        help=f"move retired partitions to schema {ARCHIVE_SCHEMA} instead of dropping them",
+    )
+
+    compact = subparsers.add_parser('compact', help="collapse events history older than the horizon")
+    compact.add_argument('--horizon-days', type=int, default=int(os.getenv('PARTITION_REGISTRY_COMPACTION_HORIZON_DAYS', '30')))
+    compact.add_argument(
+        '--batch-size',
+        type=int,
+        default=int(os.getenv('PARTITION_REGISTRY_COMPACTION_BATCH_SIZE', '1000')),
+        help="events removed within one transaction",
+    )
+    compact.add_argument(
+        '--archive',
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv('PARTITION_REGISTRY_COMPACTION_ARCHIVE', 'false').lower() == 'true',
+        help=f"copy removed events to {COMPACTED_EVENTS}",
+    )
+    args = parser.parse_args(argv)
+
+    engine = init_postgres_engine()
+    now = dt.datetime.now(dt.timezone.utc)
+    try:
+        match args.command:
+            case 'events':
+                with engine.begin() as connection:
+                    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': MAINTENANCE_LOCK_KEY})
+                    for partition in create_events_partitions(connection, args.months_ahead, now):
+                        print(f"Created {partition.name}")
+                    if args.retention_days > 0:
+                        retention = dt.timedelta(days=args.retention_days)
+                        for partition in retire_events_partitions(connection, retention, now, archive=args.archive):
+                            print(f"{'Archived' if args.archive else 'Dropped'} {partition.name}")
+                return 0
+            case 'compact':
+                horizon = now - dt.timedelta(days=args.horizon_days)
+                report = compact_events(engine, horizon, args.batch_size, archive=args.archive)
+                print(f"Removed {report.rows_removed} events registered before {horizon} in {report.batches} batches, took {report.seconds:.2f}s")
+                return 0
+    finally:
+        engine.dispose()
+
+    return 2
@@ -0,0 +1,88 @@
+"""Compaction of the events history
+
+Events registered before the horizon are collapsed to the latest of them per partition,
+so the state of every partition at the horizon and every event after it are kept.
+Events are removed in batches of at most `batch_size` rows, each within its own short transaction,
+walking partitions in the order of their ids until no removable event is left.
+"""
+import dataclasses as dc
+import datetime as dt
+import time
+
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import text
+
+from partition_registry.maintenance.events_partitions import ARCHIVE_SCHEMA
+
+
+COMPACTED_EVENTS = f'{ARCHIVE_SCHEMA}.events_compacted'
+
+
+@dc.dataclass(frozen=True)
+class CompactionReport:
+    rows_removed: int
+    batches: int
+    seconds: float
+
+
+def compact_events_batch(
+    connection: Connection,
+    after: int,
+    horizon: dt.datetime,
+    batch_size: int,
+    archive: bool = False,
+) -> tuple[int, int | None]:
+    """Remove at most `batch_size` compacted events of partitions with ids from `after`
+
+    Returns the number of removed events and the last partition id they belong to,
+    the next batch continues from it. Events are addressed by their table partition and `ctid`,
+    because the events table has no unique key.
+    """
+    removal = (
+        "WITH victims AS ("
+        "     SELECT events.tableoid AS relation, events.ctid AS row_id"
+        "       FROM registry.events AS events"
+        "      WHERE events.partition_id >= :after AND events.registered_at < :horizon"
+        "        AND events.registered_at < ("
+        "            SELECT max(latest.registered_at)"
+        "              FROM registry.events AS latest"
+        "             WHERE latest.partition_id = events.partition_id AND latest.registered_at < :horizon"
+        "        )"
+        "      ORDER BY events.partition_id"
+        "      LIMIT :batch_size"
+        " ), removed AS ("
+        "     DELETE FROM registry.events AS events USING victims"
+        "      WHERE events.tableoid = victims.relation AND events.ctid = victims.row_id"
+        "     RETURNING events.partition_id, events.event_type, events.registered_at"
+        " )"
+    )
+    if archive:
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        connection.execute(text(f"CREATE TABLE IF NOT EXISTS {COMPACTED_EVENTS} (LIKE registry.events)"))
+        removal += (
+            f", archived AS (INSERT INTO {COMPACTED_EVENTS} (partition_id, event_type, registered_at) SELECT * FROM removed)"
+        )
+
+    removed, last_partition_id = connection.execute(
+        text(removal + " SELECT count(*), max(partition_id) FROM removed"),
+        {'after': after, 'horizon': horizon, 'batch_size': batch_size},
+    ).one()
+    return removed, last_partition_id
+
+
+def compact_events(engine: Engine, horizon: dt.datetime, batch_size: int, archive: bool = False) -> CompactionReport:
+    started = time.monotonic()
+    rows_removed = 0
+    batches = 0
+    after = 0
+    while True:
+        with engine.begin() as connection:
+            removed, last_partition_id = compact_events_batch(connection, after, horizon, batch_size, archive)
+        if last_partition_id is None:
+            break
+        rows_removed += removed
+        batches += 1
+        after = last_partition_id
+
+    return CompactionReport(rows_removed=rows_removed, batches=batches, seconds=time.monotonic() - started)
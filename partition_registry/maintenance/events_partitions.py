@@ -0,0 +1,134 @@
+"""Monthly partitions of `registry.events`
+
+Partitions are named `events_<year>_<month>` and cover a calendar month in UTC.
+The last event of every partition is kept by `registry.partition_state`,
+so retired partitions are detached without affecting readiness, then archived or dropped.
+"""
+import dataclasses as dc
+import datetime as dt
+import re
+
+from sqlalchemy import Connection
+from sqlalchemy import text
+
+
+DEFAULT_PARTITION = 'events_default'
+ARCHIVE_SCHEMA = 'registry_archive'
+
+# Bounds as printed by `pg_get_expr`, e.g. FOR VALUES FROM (MINVALUE) TO ('2024-02-01 00:00:00+00')
+BOUNDS = re.compile(r"FROM \((?:'(?P<start>[^']+)'|MINVALUE)\) TO \((?:'(?P<end>[^']+)'|MAXVALUE)\)")
+
+
+@dc.dataclass(frozen=True)
+class EventsPartition:
+    name: str
+    start: dt.datetime | None  # None is unbounded
+    end: dt.datetime | None
+
+
+def events_partitions(connection: Connection) -> list[EventsPartition]:
+    """Range partitions of events ordered by their bounds, the default partition is skipped"""
+    rows = connection.execute(text(
+        "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+        "  FROM pg_inherits"
+        "  JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid"
+        " WHERE pg_inherits.inhparent = 'registry.events'::regclass"
+    ))
+
+    partitions = []
+    for name, bounds in rows:
+        match BOUNDS.search(bounds):
+            case None:
+                continue
+            case found:
+                partitions.append(EventsPartition(
+                    name=name,
+                    start=dt.datetime.fromisoformat(found['start']) if found['start'] else None,
+                    end=dt.datetime.fromisoformat(found['end']) if found['end'] else None,
+                ))
+    return sorted(partitions, key=lambda partition: partition.end or dt.datetime.max.replace(tzinfo=dt.timezone.utc))
+
+
+def month_start(moment: dt.datetime) -> dt.datetime:
+    moment = moment.astimezone(dt.timezone.utc)
+    return dt.datetime(moment.year, moment.month, 1, tzinfo=dt.timezone.utc)
+
+
+def add_months(moment: dt.datetime, months: int) -> dt.datetime:
+    year, month = divmod(moment.month - 1 + months, 12)
+    return moment.replace(year=moment.year + year, month=month + 1)
+
+
+def create_events_partition(connection: Connection, start: dt.datetime, end: dt.datetime) -> EventsPartition:
+    """Create partition of [start, end), events caught by the default partition meanwhile are moved into it"""
+    partition = EventsPartition(f"events_{start:%Y_%m}", start, end)
+    bounds = {'start': start, 'end': end}
+
+    connection.execute(text("CREATE TEMPORARY TABLE moved_events (LIKE registry.events)"))
+    connection.execute(text(
+        "WITH moved AS ("
+        f"    DELETE FROM registry.{DEFAULT_PARTITION}"
+        "     WHERE registered_at >= :start AND registered_at < :end"
+        "    RETURNING partition_id, event_type, registered_at"
+        ") "
+        "INSERT INTO moved_events (partition_id, event_type, registered_at) SELECT * FROM moved"
+    ), bounds)
+    connection.execute(text(
+        f"CREATE TABLE registry.{partition.name} PARTITION OF registry.events"
+        f"    FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    connection.execute(text(
+        "INSERT INTO registry.events (partition_id, event_type, registered_at)"
+        "    SELECT partition_id, event_type, registered_at FROM moved_events"
+    ))
+    connection.execute(text("DROP TABLE moved_events"))
+
+    return partition
+
+
+def create_events_partitions(connection: Connection, months_ahead: int, now: dt.datetime) -> list[EventsPartition]:
+    """Create monthly partitions following the existing ones up to `months_ahead` months after the current one"""
+    horizon = add_months(month_start(now), months_ahead + 1)
+    start = max(
+        (partition.end for partition in events_partitions(connection) if partition.end is not None),
+        default=month_start(now),
+    )
+
+    created = []
+    while start < horizon:
+        end = add_months(month_start(start), 1)
+        created.append(create_events_partition(connection, start, end))
+        start = end
+    return created
+
+
+def retire_events_partitions(
+    connection: Connection,
+    retention: dt.timedelta,
+    now: dt.datetime,
+    archive: bool = True,
+) -> list[EventsPartition]:
+    """Detach partitions of events older than `retention`, move them to the archive schema or drop them"""
+    retired = []
+    for partition in events_partitions(connection):
+        if partition.end is None or partition.end > now - retention:
+            continue
+
+        # Readiness reads last events from the partition state, it must outlive the retired events
+        connection.execute(text(
+            "INSERT INTO registry.partition_state (partition_id, event_type, registered_at)"
+            "    SELECT DISTINCT ON (partition_id) partition_id, event_type, registered_at"
+            f"      FROM registry.{partition.name}"
+            "     ORDER BY partition_id, registered_at DESC "
+            "ON CONFLICT (partition_id) DO UPDATE"
+            "    SET event_type = excluded.event_type, registered_at = excluded.registered_at"
+            "    WHERE partition_state.registered_at < excluded.registered_at"
+        ))
+        connection.execute(text(f"ALTER TABLE registry.events DETACH PARTITION registry.{partition.name}"))
+        if archive:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            connection.execute(text(f"ALTER TABLE registry.{partition.name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        else:
+            connection.execute(text(f"DROP TABLE registry.{partition.name}"))
+        retired.append(partition)
+    return retired
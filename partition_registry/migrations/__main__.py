@@ -0,0 +1,4 @@
+from partition_registry.migrations.migrate import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,204 @@
+"""Versioned schema migrations of the Partition Registry database
+
+Migrations are SQL files `versions/<version>_<name>.sql` applied in the order of versions,
+each within its own transaction together with its record in `registry.schema_migrations`.
+Every migration is idempotent, so databases created before migrations are upgraded by applying all of them.
+
+Usage:
+    python -m partition_registry.migrations migrate   # apply pending migrations
+    python -m partition_registry.migrations status    # list applied and pending migrations
+    python -m partition_registry.migrations check     # compare ORM models with the live schema
+    python -m partition_registry.migrations exclude-provider-overlaps  # reject overlapping partitions of a provider
+"""
+import argparse
+import dataclasses as dc
+import pathlib
+import sys
+from typing import Sequence
+from typing import cast
+
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import Table
+from sqlalchemy import inspect
+from sqlalchemy import text
+from sqlalchemy.types import TypeEngine
+
+from partition_registry.orm import DependencyGroupsORM
+from partition_registry.orm import PartitionsRegistryORM
+from partition_registry.orm import PartitionEventsORM
+from partition_registry.orm import PartitionStateORM
+from partition_registry.orm import ProvidersRegistryORM
+from partition_registry.orm import SourcesRegistryORM
+
+from partition_registry.integration.postgres import init_postgres_engine
+
+
+VERSIONS_DIRECTORY = pathlib.Path(__file__).parent / 'versions'
+
+# Serializes migrations started by several workers at once
+MIGRATIONS_LOCK_KEY = 5498
+
+PROVIDER_OVERLAPS_CONSTRAINT = 'partitions_provider_no_overlap'
+
+ORM_TABLES = [
+    cast(Table, orm.__table__)
+    for orm in (SourcesRegistryORM, ProvidersRegistryORM, PartitionsRegistryORM, PartitionEventsORM, PartitionStateORM,
+                DependencyGroupsORM)
+]
+
+
+@dc.dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+def load_migrations(directory: pathlib.Path = VERSIONS_DIRECTORY) -> list[Migration]:
+    migrations = []
+    for path in sorted(directory.glob('*.sql')):
+        version, _, name = path.stem.partition('_')
+        migrations.append(Migration(int(version), name, path.read_text()))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def applied_versions(connection: Connection) -> set[int]:
+    connection.execute(text(
+        "CREATE SCHEMA IF NOT EXISTS registry;"
+        "CREATE TABLE IF NOT EXISTS registry.schema_migrations ("
+        "    version INT PRIMARY KEY,"
+        "    name TEXT NOT NULL,"
+        "    applied_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ")"
+    ))
+    versions = set(connection.execute(text("SELECT version FROM registry.schema_migrations")).scalars())
+    connection.commit()
+    return versions
+
+
+def migrate(engine: Engine, migrations: Sequence[Migration] | None = None) -> list[Migration]:
+    """Apply pending migrations, return the applied ones"""
+    migrations = load_migrations() if migrations is None else migrations
+    applied: list[Migration] = []
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': MIGRATIONS_LOCK_KEY})
+        connection.commit()
+        try:
+            versions = applied_versions(connection)
+            for migration in migrations:
+                if migration.version in versions:
+                    continue
+                with connection.begin():
+                    connection.exec_driver_sql(migration.sql)
+                    connection.execute(
+                        text("INSERT INTO registry.schema_migrations (version, name) VALUES (:version, :name)"),
+                        {'version': migration.version, 'name': migration.name},
+                    )
+                applied.append(migration)
+        finally:
+            connection.rollback()
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': MIGRATIONS_LOCK_KEY})
+            connection.commit()
+
+    return applied
+
+
+def pending_migrations(engine: Engine, migrations: Sequence[Migration] | None = None) -> list[Migration]:
+    migrations = load_migrations() if migrations is None else migrations
+    with engine.connect() as connection:
+        versions = applied_versions(connection)
+    return [migration for migration in migrations if migration.version not in versions]
+
+
+def exclude_provider_overlaps(connection: Connection) -> None:
+    """
+    Reject partitions of a source overlapping another partition of the same provider.
+    Fails when such partitions are already registered.
+    Singleton ranges of ids compare them for equality without btree_gist
+    """
+    connection.execute(text(
+        f"ALTER TABLE registry.partitions DROP CONSTRAINT IF EXISTS {PROVIDER_OVERLAPS_CONSTRAINT};"
+        f"ALTER TABLE registry.partitions ADD CONSTRAINT {PROVIDER_OVERLAPS_CONSTRAINT} EXCLUDE USING gist ("
+        "    int4range(source_id, source_id, '[]') WITH &&,"
+        "    int4range(provider_id, provider_id, '[]') WITH &&,"
+        "    tstzrange(start, \"end\", '[)') WITH &&"
+        ")"
+    ))
+
+
+def type_affinity(column_type: TypeEngine) -> object:
+    """Python type of column values, the type class itself when it has none (e.g. ranges)"""
+    try:
+        return column_type.python_type
+    except NotImplementedError:
+        return type(column_type)
+
+
+def check_schema(engine: Engine, tables: Sequence[Table] = ORM_TABLES) -> list[str]:
+    """Differences between ORM models and the live schema, empty if they match"""
+    inspector = inspect(engine)
+    differences = []
+
+    for table in tables:
+        name = f"{table.schema}.{table.name}"
+        if not inspector.has_table(table.name, schema=table.schema):
+            differences.append(f"Table <<{name}>> doesn't exist")
+            continue
+
+        live_columns = {column['name']: column for column in inspector.get_columns(table.name, schema=table.schema)}
+        for column in table.columns:
+            live_column = live_columns.get(column.name)
+            if live_column is None:
+                differences.append(f"Column <<{name}.{column.name}>> doesn't exist")
+                continue
+            if type_affinity(column.type) != type_affinity(live_column['type']):
+                differences.append(f"Column <<{name}.{column.name}>> is {live_column['type']}, but model expects {column.type}")
+            elif getattr(column.type, 'timezone', False) != getattr(live_column['type'], 'timezone', False):
+                differences.append(f"Column <<{name}.{column.name}>> timezone awareness differs from the model")
+            if column.nullable != live_column['nullable']:
+                differences.append(f"Column <<{name}.{column.name}>> nullable={live_column['nullable']}, but model expects nullable={column.nullable}")
+
+        for column_name in live_columns.keys() - set(table.columns.keys()):
+            differences.append(f"Column <<{name}.{column_name}>> is not mapped by the model")
+
+        live_indexes = {index['name'] for index in inspector.get_indexes(table.name, schema=table.schema)}
+        for index in table.indexes:
+            if index.name not in live_indexes:
+                differences.append(f"Index <<{index.name}>> of <<{name}>> doesn't exist")
+
+    return differences
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m partition_registry.migrations', description="Partition Registry schema migrations")
+    parser.add_argument('command', choices=['migrate', 'status', 'check', 'exclude-provider-overlaps'])
+    args = parser.parse_args(argv)
+
+    engine = init_postgres_engine()
+    try:
+        match args.command:
+            case 'migrate':
+                for migration in migrate(engine):
+                    print(f"Applied {migration.version:04d}_{migration.name}")
+                return 0
+            case 'status':
+                pending = {migration.version for migration in pending_migrations(engine)}
+                for migration in load_migrations():
+                    print(f"{migration.version:04d}_{migration.name}: {'pending' if migration.version in pending else 'applied'}")
+                return 0
+            case 'check':
+                differences = check_schema(engine)
+                for difference in differences:
+                    print(difference, file=sys.stderr)
+                return 1 if differences else 0
+            case 'exclude-provider-overlaps':
+                with engine.begin() as connection:
+                    exclude_provider_overlaps(connection)
+                print(f"Added {PROVIDER_OVERLAPS_CONSTRAINT}")
+                return 0
+    finally:
+        engine.dispose()
+
+    return 2
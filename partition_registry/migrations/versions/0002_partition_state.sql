@@ -0,0 +1,13 @@
+-- Last event of every partition, maintained by the service together with events
+CREATE TABLE IF NOT EXISTS registry.partition_state (
+    partition_id INT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    registered_at TIMESTAMPTZ NOT NULL,
+    FOREIGN KEY (partition_id) REFERENCES registry.partitions(id)
+);
+
+INSERT INTO registry.partition_state (partition_id, event_type, registered_at)
+SELECT DISTINCT ON (partition_id) partition_id, event_type, registered_at
+FROM registry.events
+ORDER BY partition_id, registered_at DESC
+ON CONFLICT (partition_id) DO NOTHING;
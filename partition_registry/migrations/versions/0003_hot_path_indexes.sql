@@ -0,0 +1,10 @@
+-- Partitions of a source intersected with requested interval
+CREATE INDEX IF NOT EXISTS partitions_source_interval_idx
+    ON registry.partitions (source_id, start, "end");
+
+-- Last events of partitions
+CREATE INDEX IF NOT EXISTS events_partition_registered_at_idx
+    ON registry.events (partition_id, registered_at DESC);
+
+-- Every event is registered for a partition
+ALTER TABLE registry.events ALTER COLUMN partition_id SET NOT NULL;
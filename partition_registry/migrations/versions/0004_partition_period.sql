@@ -0,0 +1,23 @@
+-- Interval of every partition as a range, the same half-open [start, end) the registry reasons about.
+-- Partitions of a source overlapping requested interval: `tstzrange(start, "end", '[)') && tstzrange(:start, :end)`,
+-- the range is an index expression rather than a stored column, so the table is not rewritten.
+-- Integer equality within GiST needs btree_gist, which builds without contrib modules don't ship:
+-- there the index covers periods alone and is combined with partitions_source_interval_idx by the planner.
+--
+-- Locks: CREATE INDEX holds a SHARE lock on registry.partitions until the migration commits,
+-- registrations wait for the whole build while readiness checks keep being answered.
+-- On large tables build the index beforehand without blocking writes, the migration then skips it:
+--   CREATE INDEX CONCURRENTLY partitions_source_period_idx
+--       ON registry.partitions USING gist (source_id, tstzrange(start, "end", '[)'));
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist') THEN
+        CREATE EXTENSION IF NOT EXISTS btree_gist;
+        CREATE INDEX IF NOT EXISTS partitions_source_period_idx
+            ON registry.partitions USING gist (source_id, tstzrange(start, "end", '[)'));
+    ELSE
+        CREATE INDEX IF NOT EXISTS partitions_source_period_idx
+            ON registry.partitions USING gist (tstzrange(start, "end", '[)'));
+    END IF;
+END
+$$;
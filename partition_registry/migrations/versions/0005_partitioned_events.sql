@@ -0,0 +1,36 @@
+-- Events are range partitioned by registration time, one partition per month.
+-- Existing events are kept in place as partition `events_history` covering everything up to the next month,
+-- following partitions are created and retired by `python -m partition_registry.maintenance events`.
+-- Events outside of created partitions are caught by `events_default` and moved once their partition is created
+DO $$
+DECLARE
+    history_end TIMESTAMPTZ;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'registry.events'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE registry.events RENAME TO events_history;
+    ALTER INDEX registry.events_partition_registered_at_idx RENAME TO events_history_partition_registered_at_idx;
+    ALTER TABLE registry.events_history DROP CONSTRAINT IF EXISTS events_partition_id_fkey;
+
+    CREATE TABLE registry.events (
+        partition_id INT NOT NULL,
+        event_type TEXT NOT NULL,
+        registered_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (partition_id) REFERENCES registry.partitions(id)
+    ) PARTITION BY RANGE (registered_at);
+
+    CREATE INDEX events_partition_registered_at_idx ON registry.events (partition_id, registered_at DESC);
+
+    -- Months are counted in UTC
+    SELECT (date_trunc('month', greatest(CURRENT_TIMESTAMP, max(registered_at)) AT TIME ZONE 'UTC') + INTERVAL '1 month') AT TIME ZONE 'UTC'
+    INTO history_end
+    FROM registry.events_history;
+
+    EXECUTE 'ALTER TABLE registry.events ATTACH PARTITION registry.events_history '
+        || 'FOR VALUES FROM (MINVALUE) TO (' || quote_literal(history_end) || ')';
+
+    CREATE TABLE registry.events_default PARTITION OF registry.events DEFAULT;
+END
+$$;
@@ -0,0 +1,8 @@
+-- Named sets of sources a downstream job depends on, checked for readiness together
+CREATE TABLE IF NOT EXISTS registry.dependency_groups (
+    name TEXT NOT NULL,
+    source_id INT NOT NULL,
+    registered_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (name, source_id),
+    FOREIGN KEY (source_id) REFERENCES registry.sources(id)
+);
@@ -0,0 +1,37 @@
+-- Databases migrated while 0004 added a stored `period` column get the expression index of 0004 instead.
+-- Dropping the column doesn't rewrite the table, but drops partitions_source_period_idx and
+-- partitions_provider_no_overlap built on it, both are built again on the expression.
+-- Same locks as 0004: the index build holds a SHARE lock on registry.partitions until the migration commits
+DO $$
+DECLARE
+    excluded_overlaps BOOLEAN;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'registry' AND table_name = 'partitions' AND column_name = 'period'
+    ) THEN
+        RETURN;
+    END IF;
+
+    SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'partitions_provider_no_overlap')
+    INTO excluded_overlaps;
+
+    ALTER TABLE registry.partitions DROP COLUMN period CASCADE;
+
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'btree_gist') THEN
+        CREATE INDEX IF NOT EXISTS partitions_source_period_idx
+            ON registry.partitions USING gist (source_id, tstzrange(start, "end", '[)'));
+    ELSE
+        CREATE INDEX IF NOT EXISTS partitions_source_period_idx
+            ON registry.partitions USING gist (tstzrange(start, "end", '[)'));
+    END IF;
+
+    IF excluded_overlaps THEN
+        ALTER TABLE registry.partitions ADD CONSTRAINT partitions_provider_no_overlap EXCLUDE USING gist (
+            int4range(source_id, source_id, '[]') WITH &&,
+            int4range(provider_id, provider_id, '[]') WITH &&,
+            tstzrange(start, "end", '[)') WITH &&
+        );
+    END IF;
+END
+$$;
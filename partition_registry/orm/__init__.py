@@ -2,3 +2,5 @@ from partition_registry.orm.partitions import PartitionsRegistryORM
 from partition_registry.orm.events import PartitionEventsORM
 from partition_registry.orm.providers import ProvidersRegistryORM
 from partition_registry.orm.sources import SourcesRegistryORM
+from partition_registry.orm.partition_state import PartitionStateORM
+from partition_registry.orm.dependency_groups import DependencyGroupsORM
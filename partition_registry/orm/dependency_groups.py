@@ -0,0 +1,22 @@
+import datetime as dt
+
+from sqlalchemy import TEXT
+from sqlalchemy import DATETIME
+from sqlalchemy import INTEGER
+from sqlalchemy import func
+
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+
+class Base(DeclarativeBase): ...
+
+class DependencyGroupsORM(Base):
+    """Sources of named dependency groups, one row per source of a group"""
+    __tablename__ = "dependency_groups"
+    __table_args__ = {'schema': 'registry'}
+
+    name: Mapped[str] = mapped_column(TEXT, primary_key=True)
+    source_id: Mapped[int] = mapped_column(INTEGER, primary_key=True)
+    registered_at: Mapped[dt.datetime] = mapped_column(DATETIME(timezone=True), nullable=False, server_default=func.now())
@@ -3,6 +3,8 @@ import datetime as dt
 from sqlalchemy import TEXT
 from sqlalchemy import DATETIME
 from sqlalchemy import INTEGER
+from sqlalchemy import Index
+from sqlalchemy import text
 
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
@@ -13,7 +15,10 @@ class Base(DeclarativeBase): ...
 
 class PartitionEventsORM(Base):
     __tablename__ = "events"
-    __table_args__ = {'schema': 'registry'}
+    __table_args__ = (
+        Index('events_partition_registered_at_idx', 'partition_id', text('registered_at DESC')),
+        {'schema': 'registry', 'postgresql_partition_by': 'RANGE (registered_at)'},
+    )
 
     partition_id: Mapped[int] = mapped_column(INTEGER, nullable=False, primary_key=True)
     event_type: Mapped[str] = mapped_column(TEXT, nullable=False)
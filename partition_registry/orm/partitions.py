@@ -1,7 +1,9 @@
 import datetime as dt
 
-from sqlalchemy import DATETIME
+from sqlalchemy import DateTime
 from sqlalchemy import INTEGER
+from sqlalchemy import Index
+from sqlalchemy import text
 
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
@@ -13,11 +15,16 @@ class Base(DeclarativeBase): ...
 
 class PartitionsRegistryORM(Base):
     __tablename__ = "partitions"
-    __table_args__ = {'schema': 'registry'}
+    __table_args__ = (
+        Index('partitions_source_interval_idx', 'source_id', 'start', 'end'),
+        # [start, end) as a range, filtered with the overlap operator `&&` by `overlaps` of the partition registry
+        Index('partitions_source_period_idx', 'source_id', text("tstzrange(start, \"end\", '[)')"), postgresql_using='gist'),
+        {'schema': 'registry'},
+    )
 
     id: Mapped[int] = mapped_column(INTEGER, primary_key=True, autoincrement=True)
-    start: Mapped[dt.datetime] = mapped_column(DATETIME, nullable=False)
-    end: Mapped[dt.datetime] = mapped_column(DATETIME, nullable=False)
+    start: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     source_id: Mapped[int] = mapped_column(INTEGER, nullable=False)
     provider_id: Mapped[int] = mapped_column(INTEGER, nullable=False)
-    registered_at: Mapped[dt.datetime] = mapped_column(DATETIME(timezone=True), nullable=False, default=dt.datetime.utcnow)
+    registered_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=dt.datetime.utcnow)
@@ -5,6 +5,7 @@ import hypothesis.strategies as st
 from hypothesis import assume
 
 from partition_registry.data.partition import SimplePartition
+from partition_registry.actor.readiness_index import IndexedPartition
 
 def build_simple_partition(start: dt.datetime, end: dt.datetime) -> SimplePartition:
     """Build a Simple Partition object from 2 given intervals"""
@@ -12,3 +13,22 @@ def build_simple_partition(start: dt.datetime, end: dt.datetime) -> SimplePartit
     return SimplePartition(start, end)
 
 arbitrary_simple_partition = st.builds(build_simple_partition, st.datetimes(), st.datetimes())
+
+arbitrary_utc_datetime = st.datetimes(
+    min_value=dt.datetime(2000, 1, 1),
+    max_value=dt.datetime(2030, 1, 1),
+    timezones=st.just(dt.timezone.utc),
+)
+
+
+def build_indexed_partitions(bounds: list[tuple[dt.datetime, int]]) -> list[IndexedPartition]:
+    """Build partitions with unique ids from (start, duration in hours) pairs"""
+    return [
+        IndexedPartition(partition_id, start, start + dt.timedelta(hours=hours))
+        for partition_id, (start, hours) in enumerate(bounds)
+    ]
+
+arbitrary_indexed_partitions = st.builds(
+    build_indexed_partitions,
+    st.lists(st.tuples(arbitrary_utc_datetime, st.integers(min_value=1, max_value=24 * 365)), max_size=50),
+)
@@ -0,0 +1,64 @@
+import contextlib
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Iterator
+
+import pytest
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from partition_registry.integration.postgres import init_postgres_engine
+
+
+@pytest.fixture(scope='module')
+def postgres_engine() -> Iterator[Engine]:
+    """Engine of Postgres configured by POSTGRES_APPLICATION_* variables, skips the test when it's not reachable"""
+    engine = init_postgres_engine()
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        engine.dispose()
+        pytest.skip(f"Postgres is not reachable: {e}")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def postgres_connection(postgres_engine: Engine) -> Iterator[Connection]:
+    with postgres_engine.connect() as connection:
+        yield connection
+
+
+@pytest.fixture
+def query_budget() -> Iterator[Callable[[int], ContextManager[list[str]]]]:
+    """Fails the test when statements executed within `with query_budget(n):` exceed n
+
+    Statements of every engine are counted, including engines of the service called by the test.
+    """
+    statements: list[str] | None = None
+
+    def count(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+        if statements is not None:
+            statements.append(statement)
+
+    @contextlib.contextmanager
+    def budget(max_queries: int) -> Iterator[list[str]]:
+        nonlocal statements
+        executed: list[str] = []
+        statements = executed
+        try:
+            yield executed
+        finally:
+            statements = None
+        if len(executed) > max_queries:
+            listed = '\n'.join(executed)
+            pytest.fail(f"Expected at most {max_queries} queries, but got {len(executed)}:\n{listed}")
+
+    event.listen(Engine, 'before_cursor_execute', count)
+    yield budget
+    event.remove(Engine, 'before_cursor_execute', count)
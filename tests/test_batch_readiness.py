@@ -0,0 +1,70 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+from hypothesis import given
+
+from partition_registry.actions.check_batch_readiness import check_batch_readiness
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_index import IndexedPartition
+from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.request import ReadinessRequest
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.orm import PartitionsRegistryORM
+
+from tests.arbitrary.partition import arbitrary_utc_datetime
+
+
+@given(start=arbitrary_utc_datetime)
+def test_batch_readiness_keeps_request_order(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+    requests = [
+        ReadinessRequest('locked_source', start, end),
+        ReadinessRequest('unlocked_source', start, end),
+        ReadinessRequest('unknown_source', start, end),
+    ]
+
+    partition_registry = MagicMock()
+    partition_registry.get_filtered_partitions_batch.return_value = {
+        0: [PartitionsRegistryORM(id=1, start=start, end=end, source_id=1, provider_id=1)],
+        1: [PartitionsRegistryORM(id=2, start=start, end=end, source_id=2, provider_id=1)],
+        2: [],
+    }
+    events_registry = MagicMock()
+    events_registry.get_partition_events.return_value = [
+        SimplifiedPartitionEventORM(1, EventType.LOCK, start),
+        SimplifiedPartitionEventORM(2, EventType.UNLOCK, start),
+    ]
+
+    results = check_batch_readiness(requests, partition_registry, events_registry)
+
+    assert [type(result) for result in results] == [PartitionNotReady, PartitionReady, PartitionNotReady], \
+        f"Expected results in the order of requests, but got: {results}"
+    partition_registry.get_filtered_partitions_batch.assert_called_once()
+    events_registry.get_partition_events.assert_called_once()
+
+
+@given(start=arbitrary_utc_datetime)
+def test_batch_readiness_skips_database_for_warm_sources(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+    readiness_index = ReadinessIndex()
+    readiness_index.warm(
+        'warm_source',
+        [IndexedPartition(1, start, end)],
+        [SimplifiedPartitionEventORM(1, EventType.UNLOCK, start)],
+        readiness_index.generation('warm_source'),
+    )
+
+    partition_registry = MagicMock()
+    events_registry = MagicMock()
+    results = check_batch_readiness(
+        [ReadinessRequest('warm_source', start, end)],
+        partition_registry,
+        events_registry,
+        readiness_index,
+    )
+
+    assert isinstance(results[0], PartitionReady), f"Expected ready partition, but got: {results[0]}"
+    partition_registry.get_filtered_partitions_batch.assert_not_called()
+    events_registry.get_partition_events.assert_not_called()
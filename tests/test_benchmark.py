@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+
+from sqlalchemy import Engine
+
+from partition_registry.benchmark.report import LevelResult
+from partition_registry.benchmark.report import compare_results
+from partition_registry.benchmark.report import percentile
+from partition_registry.benchmark.runner import in_process
+from partition_registry.benchmark.runner import run_level
+from partition_registry.benchmark.seed import SeedConfig
+from partition_registry.benchmark.seed import cleanup
+from partition_registry.benchmark.seed import seed
+from partition_registry.benchmark.workload import Operation
+from partition_registry.benchmark.workload import Workload
+from partition_registry.benchmark.workload import parse_mix
+from partition_registry.data.status import ValidationFailed
+
+
+def test_percentile_is_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.5) == 50, f"Expected 50, but got: {percentile(values, 0.5)}"
+    assert percentile(values, 0.99) == 99, f"Expected 99, but got: {percentile(values, 0.99)}"
+    assert percentile([], 0.5) == 0, f"Expected 0 of no values, but got: {percentile([], 0.5)}"
+
+
+def test_mix_is_parsed() -> None:
+    mix = parse_mix('check_readiness=3,lock=1')
+
+    assert mix == {Operation.CHECK_READINESS: 3, Operation.LOCK: 1}, f"Expected weights of operations, but got: {mix}"
+    assert isinstance(parse_mix('delete=1'), ValidationFailed), "Expected unknown operation to fail"
+    assert isinstance(parse_mix('lock=0'), ValidationFailed), "Expected mix without positive weights to fail"
+
+
+def test_regressions_beyond_tolerance_are_reported() -> None:
+    def result(throughput: float, p95_ms: float) -> dict[str, object]:
+        operations = {'lock': {'p95_ms': p95_ms}}
+        return {'levels': [{'concurrency': 8, 'throughput': throughput, 'operations': operations}]}
+
+    regressions = compare_results(result(100, 10), result(95, 12), tolerance=0.1)
+
+    assert len(regressions) == 1 and 'p95' in regressions[0], f"Expected p95 regression only, but got: {regressions}"
+
+
+def test_mix_is_measured_in_process(postgres_engine: Engine) -> None:
+    from partition_registry.control import mainflow
+
+    prefix = f"benchmark_{uuid.uuid4().hex[:8]}"
+    mix = {operation: 1 for operation in Operation}
+    try:
+        with postgres_engine.begin() as connection:
+            seeded = seed(connection, SeedConfig(sources=2, partitions_per_source=10), prefix)
+
+        async def measure() -> LevelResult:
+            async with in_process(mainflow.app, mainflow.postgres_engine) as client:
+                return await run_level(client, Workload(seeded, mix, window=4, seed=0), concurrency=2, requests=40, count_queries=True)
+
+        result = asyncio.run(measure())
+    finally:
+        with postgres_engine.begin() as connection:
+            cleanup(connection, prefix)
+
+    assert sum(stats.requests for stats in result.operations.values()) == 40, f"Expected every request measured, but got: {result}"
+    for operation, stats in result.operations.items():
+        assert stats.errors == 0, f"Expected no errors of {operation}, but got: {stats}"
+        assert stats.queries_per_request, f"Expected queries of {operation} to be counted, but got: {stats}"
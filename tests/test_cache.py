@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from partition_registry.actor.cache import LRUCache
+from partition_registry.actor.source_registry import SourceRegistry
+from partition_registry.data.source import RegisteredSource
+from partition_registry.data.status import LookupFailed
+
+
+@given(keys=st.lists(st.integers(), min_size=1, max_size=100), max_size=st.integers(min_value=1, max_value=10))
+def test_cache_never_exceeds_max_size(keys: list[int], max_size: int) -> None:
+    cache: LRUCache[int, int] = LRUCache(max_size=max_size)
+    for key in keys:
+        cache.put(key, key)
+
+    assert len(cache) <= max_size, f"Expected at most {max_size} entries, but got: {len(cache)}"
+    assert cache.get(keys[-1]) == keys[-1], f"Expected last put key to be kept, but got: {cache.stats()}"
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None, f"Expected least recently used entry to be evicted, but got: {cache.stats()}"
+    assert cache.get('a') == 1, f"Expected recently used entry to be kept, but got: {cache.stats()}"
+    assert cache.stats()['evictions'] == 1, f"Expected one eviction, but got: {cache.stats()}"
+
+
+def test_entry_expires_after_ttl() -> None:
+    now = [0.0]
+    cache: LRUCache[str, int] = LRUCache(max_size=10, ttl=5, clock=lambda: now[0])
+    cache.put('a', 1)
+
+    now[0] = 4.9
+    assert cache.get('a') == 1, f"Expected entry within ttl, but got: {cache.stats()}"
+    now[0] = 5.0
+    assert cache.get('a') is None, f"Expected expired entry, but got: {cache.stats()}"
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1, \
+        f"Expected one hit and one miss, but got: {cache.stats()}"
+
+
+def test_invalidated_entry_is_missed() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    cache.put('a', 1)
+    cache.invalidate('a')
+
+    assert cache.get('a') is None, f"Expected invalidated entry to be missed, but got: {cache.stats()}"
+
+
+def test_source_found_in_db_is_cached() -> None:
+    registry = SourceRegistry(MagicMock(), cache=LRUCache(max_size=10))
+    registered_source = MagicMock(spec=RegisteredSource)
+    registry.db_lookup = MagicMock(return_value=registered_source)
+
+    first_lookup = registry.lookup_registered('some_source')
+    second_lookup = registry.lookup_registered('some_source')
+
+    assert first_lookup is registered_source and second_lookup is registered_source, \
+        f"Expected registered source, but got: {first_lookup}, {second_lookup}"
+    registry.db_lookup.assert_called_once_with('some_source')
+
+
+def test_missing_source_is_looked_up_in_db_once() -> None:
+    registry = SourceRegistry(MagicMock(), cache=LRUCache(max_size=10), missing_cache=LRUCache(max_size=10, ttl=5))
+    registry.db_lookup = MagicMock(return_value=None)
+
+    results = [registry.lookup_registered('missing_source') for _ in range(3)]
+
+    assert all(isinstance(result, LookupFailed) for result in results), f"Expected failed lookups, but got: {results}"
+    registry.db_lookup.assert_called_once_with('missing_source')
+
+
+def test_registration_invalidates_missing_source() -> None:
+    registry = SourceRegistry(MagicMock(), cache=LRUCache(max_size=10), missing_cache=LRUCache(max_size=10, ttl=5))
+    registered_source = MagicMock(spec=RegisteredSource)
+    registry.db_lookup = MagicMock(return_value=None)
+    registry.persist = MagicMock(return_value=registered_source)
+
+    registry.lookup_registered('new_source')
+    registry.safe_register('new_source', 'owner')
+    result = registry.lookup_registered('new_source')
+
+    assert result is registered_source, f"Expected registered source after registration, but got: {result}"
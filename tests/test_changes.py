@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+
+from sqlalchemy import Engine
+from sqlalchemy import text
+
+from partition_registry.actor.changes_broker import ChangesBroker
+from partition_registry.actor.changes_broker import Subscription
+from partition_registry.data.change import ChangeType
+from partition_registry.data.change import SourceChange
+from partition_registry.integration.notifications import ChangesListener
+from partition_registry.integration.notifications import notify_statement
+
+
+def test_changes_are_delivered_to_subscribers_of_their_source() -> None:
+    broker = ChangesBroker()
+
+    def drain(subscription: Subscription) -> list[SourceChange | None]:
+        return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    async def deliver() -> tuple[list[SourceChange | None], list[SourceChange | None]]:
+        some_source = broker.subscribe(frozenset(['some_source']))
+        every_source = broker.subscribe(frozenset())
+        broker.publish(SourceChange('some_source', 1, ChangeType.LOCK))
+        broker.publish(SourceChange('another_source', 2, ChangeType.UNLOCK))
+        return drain(some_source), drain(every_source)
+
+    some_source, every_source = asyncio.run(deliver())
+
+    assert [change and change.partition_id for change in some_source] == [1], f"Expected changes of some_source, but got: {some_source}"
+    assert [change and change.partition_id for change in every_source] == [1, 2], f"Expected every change, but got: {every_source}"
+
+
+def test_subscriber_falling_behind_is_disconnected() -> None:
+    broker = ChangesBroker(max_pending=2)
+
+    async def stream() -> list[str]:
+        subscription = broker.subscribe(frozenset())
+        for partition_id in range(3):
+            broker.publish(SourceChange('some_source', partition_id, ChangeType.REGISTER))
+        return [event async for event in broker.server_sent_events(subscription, keepalive=5)]
+
+    events = asyncio.run(stream())
+
+    assert events == [], f"Expected stream to end, but got: {events}"
+    assert not broker.subscriptions, f"Expected no subscriptions left, but got: {broker.subscriptions}"
+
+
+def test_server_sent_events_carry_changes() -> None:
+    broker = ChangesBroker()
+    change = SourceChange('some_source', 1, ChangeType.UNLOCK)
+
+    async def stream() -> list[str]:
+        subscription = broker.subscribe(frozenset())
+        broker.publish(change)
+        events = broker.server_sent_events(subscription, keepalive=0.01)
+        return [await anext(events), await anext(events)]
+
+    event, keepalive = asyncio.run(stream())
+
+    assert event == f"event: UNLOCK\ndata: {change.to_json()}\n\n", f"Expected event of the change, but got: {event!r}"
+    assert keepalive.startswith(':'), f"Expected keepalive comment, but got: {keepalive!r}"
+
+
+def test_listener_receives_committed_changes(postgres_engine: Engine) -> None:
+    channel = f"test_{uuid.uuid4().hex}"
+    change = SourceChange('some_source', 1, ChangeType.REGISTER)
+
+    async def listen() -> SourceChange:
+        received: asyncio.Queue[SourceChange] = asyncio.Queue()
+        listener = ChangesListener(received.put_nowait, channel=channel)
+        listener.start()
+        try:
+            await asyncio.wait_for(listener.listening.wait(), 5)
+            with postgres_engine.begin() as connection:
+                connection.execute(notify_statement(channel, [change]))
+            return await asyncio.wait_for(received.get(), 5)
+        finally:
+            await listener.stop()
+
+    received = asyncio.run(listen())
+
+    assert received == change, f"Expected {change}, but got: {received}"
+
+
+def test_changes_of_other_workers_are_not_local() -> None:
+    local = SourceChange('some_source', 1, ChangeType.REGISTER)
+    remote = SourceChange('some_source', 1, ChangeType.REGISTER, worker='another_host:1')
+
+    assert local.is_local(), f"Expected change published by this worker to be local: {local}"
+    assert not remote.is_local(), f"Expected change published by another worker not to be local: {remote}"
+    assert SourceChange.from_json(local.to_json()) == local, f"Expected worker to survive serialization: {local}"
+
+
+def test_listener_reports_reconnect_after_connection_is_dropped(postgres_engine: Engine) -> None:
+    channel = f"test_{uuid.uuid4().hex}"
+
+    async def listen() -> int:
+        connects: asyncio.Queue[None] = asyncio.Queue()
+        listener = ChangesListener(lambda change: None, channel=channel, reconnect_delay=0.01, on_connect=lambda: connects.put_nowait(None))
+        listener.start()
+        try:
+            await asyncio.wait_for(connects.get(), 5)
+            with postgres_engine.begin() as connection:
+                connection.execute(
+                    text("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query LIKE :listen"),
+                    {'listen': f'LISTEN%{channel}%'},
+                )
+            await asyncio.wait_for(connects.get(), 5)
+            return connects.qsize() + 2
+        finally:
+            await listener.stop()
+
+    connects = asyncio.run(listen())
+
+    assert connects == 2, f"Expected initial connect and reconnect, but got: {connects}"
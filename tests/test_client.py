@@ -0,0 +1,175 @@
+import asyncio
+import datetime as dt
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from partition_registry.client import AsyncPartitionRegistryClient
+from partition_registry.client import PartitionRegistryClient
+from partition_registry.client import RetryPolicy
+from partition_registry.client.response import ChangesParser
+from partition_registry.data.change import ChangeType
+from partition_registry.data.change import SourceChange
+from partition_registry.data.request import ReadinessRequest
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import SuccededRegistration
+
+
+START = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+END = dt.datetime(2000, 1, 2, tzinfo=dt.timezone.utc)
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0)
+
+
+def readiness_batch(request: httpx.Request) -> httpx.Response:
+    """Sources named `ready_*` are ready"""
+    body = [
+        {'is_ready': item['source_name'].startswith('ready_'), 'message': None}
+        for item in json.loads(request.content)
+    ]
+    return httpx.Response(200, json=body)
+
+
+def test_unsent_registration_is_retried() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(200, json={'registered_object': {'name': 'some_source'}})
+
+    with PartitionRegistryClient('http://registry', retry_policy=NO_DELAY, transport=httpx.MockTransport(handler)) as client:
+        result = client.register_source('some_source', 'owner')
+
+    assert isinstance(result, SuccededRegistration), f"Expected registration after retry, but got: {result}"
+    assert calls == 2, f"Expected two attempts, but got: {calls}"
+
+
+def test_sent_registration_is_not_retried() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ReadTimeout("Timed out", request=request)
+
+    with PartitionRegistryClient('http://registry', retry_policy=NO_DELAY, transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            client.register_source('some_source', 'owner')
+
+    assert calls == 1, f"Expected single attempt, but got: {calls}"
+
+
+def test_failed_actions_are_parsed_from_error_statuses() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/sources/register':
+            return httpx.Response(409, json={'detail': "Object already registered..."})
+        return httpx.Response(404, json={'detail': "DependencyGroup<<some_group>> not registered..."})
+
+    with PartitionRegistryClient('http://registry', retry_policy=NO_DELAY, transport=httpx.MockTransport(handler)) as client:
+        registration = client.register_source('some_source', 'owner')
+        readiness = client.check_dependency_readiness(START, END, group_name='some_group')
+
+    assert registration == FailedRegistration("Object already registered..."), f"Expected failed registration, but got: {registration}"
+    assert isinstance(readiness, LookupFailed), f"Expected unknown group, but got: {readiness}"
+
+
+def test_readiness_check_is_retried_on_unavailable_service() -> None:
+    statuses = [503, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json=[{'is_ready': True, 'message': None}])
+
+    with PartitionRegistryClient('http://registry', retry_policy=NO_DELAY, transport=httpx.MockTransport(handler)) as client:
+        result = client.check_partition_readiness('some_source', START, END)
+
+    assert isinstance(result, PartitionReady), f"Expected ready after retry, but got: {result}"
+
+
+def test_batch_readiness_is_sent_in_chunks_of_unique_requests() -> None:
+    bodies: list[list[dict[str, str]]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return readiness_batch(request)
+
+    requests = [
+        ReadinessRequest('ready_source', START, END),
+        ReadinessRequest('locked_source', START, END),
+        ReadinessRequest('ready_source', START, END),
+    ]
+    with PartitionRegistryClient('http://registry', batch_size=1, transport=httpx.MockTransport(handler)) as client:
+        results = client.check_batch_readiness(requests)
+
+    assert [type(result) for result in results] == [PartitionReady, PartitionNotReady, PartitionReady], \
+        f"Expected results in the order of requests, but got: {results}"
+    assert len(bodies) == 2, f"Expected one request per unique check, but got: {bodies}"
+
+
+def test_concurrent_checks_are_coalesced_into_one_batch() -> None:
+    bodies: list[list[dict[str, str]]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return readiness_batch(request)
+
+    async def check() -> list[PartitionReady | PartitionNotReady]:
+        async with AsyncPartitionRegistryClient('http://registry', transport=httpx.MockTransport(handler)) as client:
+            return list(await asyncio.gather(
+                client.check_partition_readiness('ready_source', START, END),
+                client.check_partition_readiness('locked_source', START, END),
+                client.check_partition_readiness('ready_source', START, END),
+            ))
+
+    results = asyncio.run(check())
+
+    assert [type(result) for result in results] == [PartitionReady, PartitionNotReady, PartitionReady], \
+        f"Expected results in the order of checks, but got: {results}"
+    assert [len(body) for body in bodies] == [2], f"Expected one batch of unique checks, but got: {bodies}"
+
+
+def test_checks_made_while_batch_is_in_flight_are_sent_as_next_batch() -> None:
+    bodies: list[list[dict[str, str]]] = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        release.wait(5)
+        return readiness_batch(request)
+
+    with PartitionRegistryClient('http://registry', transport=httpx.MockTransport(handler)) as client:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(client.check_partition_readiness, 'ready_first', START, END)
+            while not bodies:
+                time.sleep(0.001)
+            checks = [
+                executor.submit(client.check_partition_readiness, source_name, START, END)
+                for source_name in ['ready_source', 'locked_source', 'ready_source']
+            ]
+            while len(client.pending) < 2:
+                time.sleep(0.001)
+            release.set()
+            results = [first.result(), *[check.result() for check in checks]]
+
+    assert [type(result) for result in results] == [PartitionReady, PartitionReady, PartitionNotReady, PartitionReady], \
+        f"Expected results of every check, but got: {results}"
+    assert [len(body) for body in bodies] == [1, 2], f"Expected waiting checks sent as one batch of unique checks, but got: {bodies}"
+
+
+def test_changes_are_parsed_from_server_sent_events() -> None:
+    change = SourceChange('some_source', 1, ChangeType.LOCK)
+    parser = ChangesParser()
+    lines = [': keepalive', '', 'event: LOCK', f"data: {change.to_json()}", '']
+
+    changes = [parsed for line in lines if (parsed := parser.feed(line)) is not None]
+
+    assert changes == [change], f"Expected {[change]}, but got: {changes}"
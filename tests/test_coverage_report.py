@@ -0,0 +1,78 @@
+import datetime as dt
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+from sqlalchemy import Connection
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+
+from partition_registry.actions.check_partition_readiness import read_partition_readiness
+from partition_registry.actions.report_partition_coverage import CoverageSweep
+from partition_registry.actions.report_partition_coverage import report_partition_coverage
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.data.event import EventType
+from partition_registry.data.readiness import CoverageGap
+from partition_registry.data.readiness import LockedPartition
+from partition_registry.data.status import PartitionReady
+
+from tests.test_readiness_engines import EPOCH
+from tests.test_readiness_engines import arbitrary_interval
+from tests.test_readiness_engines import arbitrary_partition
+from tests.test_readiness_engines import seed
+
+
+def hours(count: int) -> dt.datetime:
+    return EPOCH + dt.timedelta(hours=count)
+
+
+def test_every_gap_and_lock_is_reported() -> None:
+    sweep = CoverageSweep(hours(0), hours(10))
+    sweep.add(1, hours(-2), hours(2), EventType.UNLOCK)
+    sweep.add(2, hours(1), hours(3), EventType.LOCK)
+    sweep.add(3, hours(4), hours(6), EventType.UNLOCK)
+    sweep.add(4, hours(7), hours(8), EventType.LOCK)
+
+    report = sweep.report()
+
+    expected_gaps = [CoverageGap(hours(3), hours(4)), CoverageGap(hours(6), hours(7)), CoverageGap(hours(8), hours(10))]
+    assert report.gaps == expected_gaps, f"Expected {expected_gaps}, but got: {report.gaps}"
+    expected_locked = [LockedPartition(2, hours(1), hours(3)), LockedPartition(4, hours(7), hours(8))]
+    assert report.locked == expected_locked, f"Expected {expected_locked}, but got: {report.locked}"
+    assert report.covered_fraction == 0.6, f"Expected 0.6 of the interval covered, but got: {report.covered_fraction}"
+    assert not report.is_ready, "Expected interval with gaps not to be ready"
+
+
+def test_interval_without_partitions_is_one_gap() -> None:
+    report = CoverageSweep(hours(0), hours(10)).report()
+
+    assert report.gaps == [CoverageGap(hours(0), hours(10))], f"Expected the whole interval as a gap, but got: {report.gaps}"
+    assert report.covered_fraction == 0, f"Expected nothing covered, but got: {report.covered_fraction}"
+
+
+@settings(max_examples=200, deadline=None)
+@given(partitions=st.lists(arbitrary_partition, max_size=8), interval=arbitrary_interval)
+def test_report_agrees_with_readiness(
+    postgres_connection: Connection,
+    partitions: list[tuple[int, int, list[EventType]]],
+    interval: tuple[int, int],
+) -> None:
+    transaction = postgres_connection.begin()
+    session = scoped_session(sessionmaker(bind=postgres_connection, join_transaction_mode='create_savepoint'))
+    try:
+        source_name = seed(postgres_connection, partitions)
+        start = hours(interval[0])
+        end = start + dt.timedelta(hours=interval[1])
+
+        events_registry = EventsRegistry(session)
+        report = report_partition_coverage(start, end, source_name, events_registry)
+        result = read_partition_readiness(start, end, source_name, PartitionRegistry(session), events_registry)
+    finally:
+        session.remove()
+        transaction.rollback()
+
+    assert report.is_ready == isinstance(result, PartitionReady), \
+        f"Expected equal verdicts, but got: {report} (report) and {result} (readiness)"
+    assert report.is_ready == (report.covered_fraction == 1 and not report.locked), \
+        f"Expected ready interval to be fully covered, but got: {report}"
@@ -0,0 +1,91 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+from hypothesis import given
+from sqlalchemy import Connection
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+
+from partition_registry.actions.check_dependency_readiness import check_dependency_readiness
+from partition_registry.actor.dependency_registry import DependencyRegistry
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.actor.source_registry import SourceRegistry
+from partition_registry.data.dependency import DependencyGroup
+from partition_registry.data.dependency import DependencyReadiness
+from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.status import LookupFailed
+from partition_registry.data.status import ValidationFailed
+from partition_registry.orm import PartitionsRegistryORM
+
+from tests.arbitrary.partition import arbitrary_utc_datetime
+from tests.test_readiness_engines import EPOCH
+from tests.test_readiness_engines import seed
+
+
+@given(start=arbitrary_utc_datetime)
+def test_sources_of_group_are_checked_together_with_given_ones(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+
+    dependency_registry = MagicMock()
+    dependency_registry.lookup_registered.return_value = DependencyGroup('some_group', ('locked_source', 'ready_source'))
+    partition_registry = MagicMock()
+    partition_registry.get_filtered_partitions_batch.return_value = {
+        0: [PartitionsRegistryORM(id=1, start=start, end=end, source_id=1, provider_id=1)],
+        1: [PartitionsRegistryORM(id=2, start=start, end=end, source_id=2, provider_id=1)],
+    }
+    events_registry = MagicMock()
+    events_registry.get_partition_events.return_value = [
+        SimplifiedPartitionEventORM(1, EventType.LOCK, start),
+        SimplifiedPartitionEventORM(2, EventType.UNLOCK, start),
+    ]
+
+    result = check_dependency_readiness(
+        start, end, ['locked_source'], 'some_group', dependency_registry, partition_registry, events_registry
+    )
+
+    assert isinstance(result, DependencyReadiness), f"Expected readiness of dependencies, but got: {result}"
+    assert not result.is_ready, f"Expected locked dependency to block, but got: {result}"
+    assert list(result.blocking) == ['locked_source'], f"Expected only locked_source to block, but got: {result.blocking}"
+    requests = partition_registry.get_filtered_partitions_batch.call_args.args[0]
+    assert [request.source_name for request in requests] == ['locked_source', 'ready_source'], \
+        f"Expected every source to be checked once, but got: {requests}"
+
+
+def test_dependencies_should_be_given() -> None:
+    result = check_dependency_readiness(EPOCH, EPOCH, [], None, MagicMock(), MagicMock(), MagicMock())
+
+    assert isinstance(result, ValidationFailed), f"Expected ValidationFailed, but got: {result}"
+
+
+def test_registered_group_is_checked(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    session = scoped_session(sessionmaker(bind=postgres_connection, join_transaction_mode='create_savepoint'))
+    try:
+        ready_source = seed(postgres_connection, [(0, 6, [EventType.UNLOCK])])
+        locked_source = seed(postgres_connection, [(0, 6, [EventType.LOCK])])
+        dependency_registry = DependencyRegistry(session)
+        source_registry = SourceRegistry(session)
+
+        unknown = dependency_registry.safe_register('some_group', [ready_source, 'unknown_source'], source_registry)
+        registered = dependency_registry.safe_register('some_group', [ready_source, locked_source], source_registry)
+        result = check_dependency_readiness(
+            EPOCH,
+            EPOCH + dt.timedelta(hours=6),
+            [],
+            'some_group',
+            dependency_registry,
+            PartitionRegistry(session),
+            EventsRegistry(session),
+        )
+        missing = dependency_registry.lookup_registered('another_group')
+    finally:
+        session.remove()
+        transaction.rollback()
+
+    assert isinstance(unknown, LookupFailed), f"Expected unknown source to fail registration, but got: {unknown}"
+    assert isinstance(registered, DependencyGroup), f"Expected registered group, but got: {registered}"
+    assert isinstance(result, DependencyReadiness), f"Expected readiness of dependencies, but got: {result}"
+    assert list(result.blocking) == [locked_source], f"Expected locked source to block, but got: {result.blocking}"
+    assert isinstance(missing, LookupFailed), f"Expected unknown group to fail lookup, but got: {missing}"
@@ -0,0 +1,147 @@
+import datetime as dt
+
+from sqlalchemy import Connection
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+
+from partition_registry.actions.check_partition_readiness import read_partition_readiness
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.data.event import EventType
+from partition_registry.data.status import PartitionReady
+from partition_registry.maintenance.compaction import COMPACTED_EVENTS
+from partition_registry.maintenance.compaction import compact_events_batch
+from partition_registry.maintenance.events_partitions import ARCHIVE_SCHEMA
+from partition_registry.maintenance.events_partitions import DEFAULT_PARTITION
+from partition_registry.maintenance.events_partitions import create_events_partitions
+from partition_registry.maintenance.events_partitions import events_partitions
+from partition_registry.maintenance.events_partitions import retire_events_partitions
+from partition_registry.orm import PartitionEventsORM
+from partition_registry.orm import PartitionStateORM
+from partition_registry.orm import PartitionsRegistryORM
+from partition_registry.orm import SourcesRegistryORM
+
+from tests.test_readiness_engines import EPOCH
+from tests.test_readiness_engines import seed
+
+
+def seeded_partition_id(connection: Connection, source_name: str) -> int:
+    return connection.execute(
+        select(PartitionsRegistryORM.id)
+        .join(SourcesRegistryORM, SourcesRegistryORM.id == PartitionsRegistryORM.source_id)
+        .filter(SourcesRegistryORM.name == source_name)
+    ).scalar_one()
+
+
+def test_events_caught_by_default_partition_are_moved(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    try:
+        last_end = events_partitions(postgres_connection)[-1].end
+        assert last_end is not None, "Expected bounded partitions of events"
+
+        partition_id = seeded_partition_id(postgres_connection, seed(postgres_connection, [(0, 1, [])]))
+        registered_at = last_end + dt.timedelta(days=1)
+        postgres_connection.execute(
+            insert(PartitionEventsORM).values(partition_id=partition_id, event_type=EventType.LOCK.value, registered_at=registered_at)
+        )
+
+        created = create_events_partitions(postgres_connection, months_ahead=0, now=registered_at)
+        default_events = postgres_connection.execute(
+            text(f"SELECT count(*) FROM registry.{DEFAULT_PARTITION} WHERE partition_id = :partition_id"),
+            {'partition_id': partition_id},
+        ).scalar_one()
+        created_events = postgres_connection.execute(
+            text(f"SELECT count(*) FROM registry.{created[-1].name} WHERE partition_id = :partition_id"),
+            {'partition_id': partition_id},
+        ).scalar_one()
+    finally:
+        transaction.rollback()
+
+    assert [partition.start for partition in created] == [last_end], f"Expected partition of the following month, but got: {created}"
+    assert default_events == 0, f"Expected no events left in the default partition, but got: {default_events}"
+    assert created_events == 1, f"Expected event moved to the created partition, but got: {created_events}"
+
+
+def test_retired_events_keep_readiness(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    session = scoped_session(sessionmaker(bind=postgres_connection, join_transaction_mode='create_savepoint'))
+    try:
+        # Registered long ago, so events are kept by the earliest partition
+        source_name = seed(postgres_connection, [(0, 1, [EventType.LOCK, EventType.UNLOCK])])
+        partition_id = seeded_partition_id(postgres_connection, source_name)
+        postgres_connection.execute(delete(PartitionStateORM).filter(PartitionStateORM.partition_id == partition_id))
+
+        earliest = events_partitions(postgres_connection)[0]
+        assert earliest.end is not None, "Expected bounded partitions of events"
+        retired = retire_events_partitions(postgres_connection, dt.timedelta(0), now=earliest.end)
+
+        events = postgres_connection.execute(
+            select(PartitionEventsORM.event_type).filter(PartitionEventsORM.partition_id == partition_id)
+        ).all()
+        archived = postgres_connection.execute(
+            text(f"SELECT count(*) FROM {ARCHIVE_SCHEMA}.{earliest.name} WHERE partition_id = :partition_id"),
+            {'partition_id': partition_id},
+        ).scalar_one()
+        result = read_partition_readiness(
+            EPOCH, EPOCH + dt.timedelta(hours=1), source_name, PartitionRegistry(session), EventsRegistry(session)
+        )
+    finally:
+        session.remove()
+        transaction.rollback()
+
+    assert retired == [earliest], f"Expected only the earliest partition retired, but got: {retired}"
+    assert not events, f"Expected retired events detached from the registry, but got: {events}"
+    assert archived == 2, f"Expected retired events archived, but got: {archived}"
+    assert isinstance(result, PartitionReady), f"Expected readiness by the last retired event, but got: {result}"
+
+
+def test_compaction_keeps_state_at_horizon_and_later_events(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    try:
+        # Events are registered a minute apart, the horizon falls between the second and the third one
+        source_name = seed(postgres_connection, [(0, 1, [EventType.LOCK, EventType.UNLOCK, EventType.LOCK, EventType.UNLOCK])])
+        partition_id = seeded_partition_id(postgres_connection, source_name)
+        horizon = EPOCH + dt.timedelta(minutes=1, seconds=30)
+
+        removed, last_partition_id = compact_events_batch(postgres_connection, partition_id, horizon, batch_size=10, archive=True)
+        kept = postgres_connection.execute(
+            select(PartitionEventsORM.event_type, PartitionEventsORM.registered_at)
+            .filter(PartitionEventsORM.partition_id == partition_id)
+            .order_by(PartitionEventsORM.registered_at)
+        ).all()
+        archived = postgres_connection.execute(
+            text(f"SELECT event_type FROM {COMPACTED_EVENTS} WHERE partition_id = :partition_id"),
+            {'partition_id': partition_id},
+        ).scalars().all()
+    finally:
+        transaction.rollback()
+
+    expected = [
+        (EventType.UNLOCK.value, EPOCH + dt.timedelta(minutes=1)),
+        (EventType.LOCK.value, EPOCH + dt.timedelta(minutes=2)),
+        (EventType.UNLOCK.value, EPOCH + dt.timedelta(minutes=3)),
+    ]
+    assert removed == 1, f"Expected one removed event, but got: {removed}"
+    assert last_partition_id == partition_id, f"Expected batch to end at partition {partition_id}, but got: {last_partition_id}"
+    assert [tuple(row) for row in kept] == expected, f"Expected {expected}, but got: {kept}"
+    assert archived == [EventType.LOCK.value], f"Expected removed event archived, but got: {archived}"
+
+
+def test_compaction_batches_are_bounded_by_rows(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    try:
+        # Three events fall before the horizon, the last of them is kept
+        source_name = seed(postgres_connection, [(0, 1, [EventType.LOCK, EventType.UNLOCK, EventType.LOCK, EventType.UNLOCK])])
+        partition_id = seeded_partition_id(postgres_connection, source_name)
+        horizon = EPOCH + dt.timedelta(minutes=2, seconds=30)
+
+        batches = [compact_events_batch(postgres_connection, partition_id, horizon, batch_size=1) for _ in range(3)]
+    finally:
+        transaction.rollback()
+
+    expected = [(1, partition_id), (1, partition_id), (0, None)]
+    assert batches == expected, f"Expected one event removed per batch until none is left, {expected}, but got: {batches}"
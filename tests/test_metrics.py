@@ -0,0 +1,95 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy import text
+
+from partition_registry.actions.check_partition_readiness import locked
+from partition_registry.actor.cache import LRUCache
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import PartitionReady
+from partition_registry.integration.metrics import Histogram
+from partition_registry.integration.metrics import Metrics
+from partition_registry.integration.metrics import MetricsMiddleware
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram('latency_seconds', "Latency", ('handler',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(('some_handler',), value)
+
+    lines = list(histogram.render())
+
+    expected = [
+        'latency_seconds_bucket{handler="some_handler",le="0.1"} 1',
+        'latency_seconds_bucket{handler="some_handler",le="1"} 2',
+        'latency_seconds_bucket{handler="some_handler",le="+Inf"} 3',
+        'latency_seconds_sum{handler="some_handler"} 5.55',
+        'latency_seconds_count{handler="some_handler"} 3',
+    ]
+    assert lines[2:] == expected, f"Expected {expected}, but got: {lines[2:]}"
+
+
+def test_outcomes_are_counted_by_type_and_reason() -> None:
+    metrics = Metrics()
+
+    metrics.record_outcome('lock_partition', FailedRegistration("Partition not registered..."))
+    metrics.record_outcome('check_batch_readiness', [PartitionReady(), locked(1), locked(2)])
+
+    expected = {
+        ('lock_partition', 'FailedRegistration', ''): 1,
+        ('check_batch_readiness', 'PartitionReady', ''): 1,
+        ('check_batch_readiness', 'PartitionNotReady', 'locked'): 2,
+    }
+    assert metrics.outcomes.values == expected, f"Expected {expected}, but got: {metrics.outcomes.values}"
+
+
+def test_readiness_checks_of_unknown_sources_share_one_label() -> None:
+    metrics = Metrics()
+
+    metrics.count_readiness_checks(['some_source', 'unknown_1', 'unknown_2', 'some_source'], lambda name: name == 'some_source')
+
+    expected = {('some_source',): 2, ('other',): 2}
+    assert metrics.readiness_checks.values == expected, f"Expected {expected}, but got: {metrics.readiness_checks.values}"
+
+
+def test_requests_are_observed_by_handler() -> None:
+    metrics = Metrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/sources/{source_name}")
+    def get_source(source_name: str) -> dict[str, str]:
+        return {'name': source_name}
+
+    with TestClient(app) as client:
+        client.get("/sources/some_source")
+        client.get("/sources/another_source")
+        client.get("/unknown")
+
+    counts = {labels: sum(counts) for labels, (counts, _) in metrics.requests.values.items()}
+    expected = {('get_source', 'GET', '200'): 2, ('unmatched', 'GET', '404'): 1}
+    assert counts == expected, f"Expected {expected}, but got: {counts}"
+
+
+def test_caches_are_rendered() -> None:
+    metrics = Metrics()
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    cache.put('key', 1)
+    cache.get('key')
+    metrics.register_caches({'some': cache})
+
+    rendered = metrics.render()
+
+    for line in ('partition_registry_cache_size{cache="some"} 1', 'partition_registry_cache_hits_total{cache="some"} 1'):
+        assert line in rendered, f"Expected {line!r} to be rendered, but got: {rendered}"
+
+
+def test_queries_are_observed(postgres_engine: Engine) -> None:
+    metrics = Metrics()
+    metrics.instrument_engine(postgres_engine)
+
+    with postgres_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    observed = sum(metrics.queries.values[('SELECT',)][0])
+    assert observed >= 1, f"Expected the query to be observed, but got: {metrics.queries.values}"
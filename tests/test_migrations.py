@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import Column
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import INTEGER
+from sqlalchemy import Index
+from sqlalchemy import MetaData
+from sqlalchemy import TEXT
+from sqlalchemy import Table
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from partition_registry.migrations.migrate import check_schema
+from partition_registry.migrations.migrate import exclude_provider_overlaps
+from partition_registry.migrations.migrate import load_migrations
+from partition_registry.migrations.migrate import migrate
+from partition_registry.orm import PartitionsRegistryORM
+
+from tests.test_readiness_engines import EPOCH
+from tests.test_readiness_engines import seed
+
+
+def test_migration_versions_are_sequential() -> None:
+    versions = [migration.version for migration in load_migrations()]
+
+    assert versions == list(range(1, len(versions) + 1)), f"Expected versions without gaps and duplicates, but got: {versions}"
+
+
+def test_migrated_schema_matches_models(postgres_engine: Engine) -> None:
+    migrate(postgres_engine)
+    applied_twice = migrate(postgres_engine)
+    differences = check_schema(postgres_engine)
+
+    assert not applied_twice, f"Expected no pending migrations after migration, but got: {applied_twice}"
+    assert not differences, f"Expected schema to match models, but got: {differences}"
+
+
+def test_schema_check_reports_differences(postgres_engine: Engine) -> None:
+    metadata = MetaData()
+    changed_table = Table(
+        'partitions', metadata,
+        Column('id', INTEGER, primary_key=True),
+        Column('start', TEXT, nullable=False),
+        Column('missing_column', INTEGER),
+        Index('missing_idx', 'id'),
+        schema='registry',
+    )
+    missing_table = Table('missing_table', metadata, Column('id', INTEGER, primary_key=True), schema='registry')
+
+    differences = check_schema(postgres_engine, [changed_table, missing_table])
+
+    for expected in ['registry.partitions.start', 'registry.partitions.missing_column', 'registry.partitions.end', 'missing_idx', 'registry.missing_table']:
+        assert any(expected in difference for difference in differences), f"Expected difference of {expected}, but got: {differences}"
+
+
+def test_provider_overlaps_are_rejected(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    try:
+        exclude_provider_overlaps(postgres_connection)
+        seed(postgres_connection, [(0, 3, [])])
+        source_id, provider_id = postgres_connection.execute(
+            select(PartitionsRegistryORM.source_id, PartitionsRegistryORM.provider_id)
+            .order_by(PartitionsRegistryORM.id.desc())
+            .limit(1)
+        ).one()
+
+        def insert_partition(start_hour: int, end_hour: int) -> None:
+            with postgres_connection.begin_nested():
+                postgres_connection.execute(insert(PartitionsRegistryORM).values(
+                    start=EPOCH + dt.timedelta(hours=start_hour),
+                    end=EPOCH + dt.timedelta(hours=end_hour),
+                    source_id=source_id,
+                    provider_id=provider_id,
+                ))
+
+        insert_partition(3, 6)
+        with pytest.raises(IntegrityError):
+            insert_partition(2, 4)
+    finally:
+        transaction.rollback()
@@ -1,9 +1,16 @@
 import datetime as dt
+import gc
 
 from hypothesis import given
 from hypothesis import assume
 
+from partition_registry.data.access_token import AccessToken
+from partition_registry.data.func import utc_now
+from partition_registry.data.partition import CachedPartition
+from partition_registry.data.partition import RegisteredPartition
 from partition_registry.data.partition import SimplePartition
+from partition_registry.data.provider import RegisteredProvider
+from partition_registry.data.source import RegisteredSource
 from partition_registry.data.status import ValidationFailed
 from partition_registry.data.status import ValidationSucceded
 
@@ -67,3 +74,39 @@ def test_partition_on_valid_data(
     result = partition.safe_validate()
     assert isinstance(partition.safe_validate(), ValidationSucceded), \
         f"Expected successfully passed validation but got: {result}"
+
+
+def registered_partition(registered_at: dt.datetime | None = None) -> RegisteredPartition:
+    access_token = AccessToken.generate()
+    source = RegisteredSource(source_id=1, name='some_source', owner='owner', access_token=access_token)
+    provider = RegisteredProvider(provider_id=2, name='some_provider', access_token=access_token)
+    start = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+    if registered_at is None:
+        return RegisteredPartition(3, start, start + dt.timedelta(days=1), source, provider)
+    return RegisteredPartition(3, start, start + dt.timedelta(days=1), source, provider, registered_at)
+
+
+def test_registered_at_defaults_to_creation_time() -> None:
+    created_after = utc_now()
+    partition = registered_partition()
+    for registered_at in (partition.registered_at, partition.source.registered_at, partition.provider.registered_at):
+        assert registered_at >= created_after, \
+            f"Expected registration time after {created_after}, but got: {registered_at}"
+
+
+def test_registered_objects_have_no_instance_dict() -> None:
+    partition = registered_partition()
+    cached_partition = CachedPartition.from_registered(partition)
+    for obj in (partition, partition.source, partition.provider, partition.source.access_token, cached_partition):
+        assert not hasattr(obj, '__dict__'), f"Expected slotted object, but got instance dict of: {obj}"
+
+
+def test_cached_partition_references_source_and_provider_by_id() -> None:
+    partition = registered_partition(registered_at=dt.datetime(2000, 1, 3, tzinfo=dt.timezone.utc))
+    cached_partition = CachedPartition.from_registered(partition)
+    referents = gc.get_referents(cached_partition)
+    assert partition.source not in referents and partition.provider not in referents, \
+        f"Expected source and provider referenced by id, but got: {referents}"
+
+    restored = cached_partition.to_registered(partition.source, partition.provider)
+    assert restored == partition, f"Expected {partition}, but got: {restored}"
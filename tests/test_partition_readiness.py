@@ -5,7 +5,10 @@ from hypothesis import given
 from hypothesis import assume
 
 from partition_registry.actions.check_partition_readiness import check_partition_readiness
+from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
 from partition_registry.data.status import PartitionNotReady
+from partition_registry.data.status import PartitionReady
 from partition_registry.orm import PartitionsRegistryORM
 
 from tests.arbitrary._datetime import arbitrary_datetime_with_timezone
@@ -86,3 +89,32 @@ def test_readiness_on_lack_of_partition_events(
         f"because there are no registered events for the source: <<{source_name}>>, but got: {result}"
     )
     assert result.reason, "Expected exact reason of not ready partition"
+
+
+@given(start=arbitrary_datetime_with_timezone)
+def test_readiness_on_partition_nested_into_another(start: dt.datetime) -> None:
+    day = dt.timedelta(days=1)
+
+    # Nested partition ends before the partition containing it, covered prefix still ends at start + 3 days:
+    # |        p_1        ||  p_3  |
+    #      |  p_2  |
+    partition_registry = MagicMock()
+    partition_registry.get_filtered_partitions.return_value = [
+        PartitionsRegistryORM(id=1, start=start, end=start + 3 * day, source_id=1, provider_id=1),
+        PartitionsRegistryORM(id=2, start=start + day, end=start + 2 * day, source_id=1, provider_id=1),
+        PartitionsRegistryORM(id=3, start=start + 3 * day, end=start + 4 * day, source_id=1, provider_id=1),
+    ]
+    events_registry = MagicMock()
+    events_registry.get_partition_events.return_value = [
+        SimplifiedPartitionEventORM(partition_id, EventType.UNLOCK, start) for partition_id in (1, 2, 3)
+    ]
+
+    result = check_partition_readiness(
+        start=start,
+        end=start + 4 * day,
+        source_name='some_source',
+        partition_registry=partition_registry,
+        events_registry=events_registry,
+    )
+
+    assert isinstance(result, PartitionReady), f"Expected nested partition not to open a gap, but got: {result}"
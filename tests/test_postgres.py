@@ -0,0 +1,57 @@
+import threading
+import contextvars
+
+import pytest
+
+from partition_registry.integration.postgres import init_postgres_engine
+from partition_registry.integration.postgres import init_postgres_session
+from partition_registry.integration.postgres import postgres_pool_options
+from partition_registry.integration.postgres import pool_stats
+from partition_registry.integration.postgres import request_scope
+
+
+def test_every_request_gets_own_session() -> None:
+    session = init_postgres_session(init_postgres_engine())
+
+    token = request_scope.set(object())
+    first_request_session = session()
+    assert session() is first_request_session, "Expected the same session within one request"
+    request_scope.reset(token)
+
+    token = request_scope.set(object())
+    second_request_session = session()
+    request_scope.reset(token)
+
+    assert first_request_session is not second_request_session, \
+        f"Expected separate sessions for separate requests, but got: {first_request_session}"
+
+
+def test_request_session_is_shared_with_worker_thread() -> None:
+    session = init_postgres_session(init_postgres_engine())
+    token = request_scope.set(object())
+    request_session = session()
+
+    # Threadpool runs sync endpoints within a copy of the request context
+    thread_sessions = []
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=lambda: thread_sessions.append(context.run(session)))
+    thread.start()
+    thread.join()
+    request_scope.reset(token)
+
+    assert thread_sessions[0] is request_session, \
+        f"Expected session of the request within worker thread, but got: {thread_sessions[0]}"
+
+
+def test_pool_options_are_read_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('POSTGRES_APPLICATION_POOL_SIZE', '3')
+    monkeypatch.setenv('POSTGRES_APPLICATION_MAX_OVERFLOW', '2')
+    monkeypatch.setenv('POSTGRES_APPLICATION_POOL_PRE_PING', 'true')
+
+    options = postgres_pool_options()
+    stats = pool_stats(init_postgres_engine())
+
+    assert options['pool_pre_ping'] is True, f"Expected pre ping to be enabled, but got: {options}"
+    assert stats['pool_size'] == 3, f"Expected pool of 3 connections, but got: {stats}"
+    assert stats['max_connections'] == 5, f"Expected up to 5 connections, but got: {stats}"
+    assert stats['checked_out'] == 0, f"Expected no connections in use, but got: {stats}"
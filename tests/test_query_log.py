@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import uuid
+from typing import AsyncIterator
+from typing import Callable
+from typing import ContextManager
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy import text
+from sqlalchemy.orm import scoped_session
+from sqlalchemy.orm import sessionmaker
+
+from partition_registry.actor.source_registry import SourceRegistry
+from partition_registry.integration.postgres import QUERY_COUNT_HEADER
+from partition_registry.integration.postgres import QueryCountMiddleware
+from partition_registry.integration.postgres import init_postgres_engine
+from partition_registry.integration.postgres import instrument_queries
+from partition_registry.integration.postgres import query_tag
+from partition_registry.integration.postgres import query_tagging
+from partition_registry.integration.tracing import traced
+
+
+QueryBudget = Callable[[int], ContextManager[list[str]]]
+
+
+class Tagged:
+    @traced
+    def generate(self) -> Iterator[str | None]:
+        yield query_tag.get()
+        yield query_tag.get()
+
+    @traced
+    async def agenerate(self) -> AsyncIterator[str | None]:
+        yield query_tag.get()
+
+
+def test_generators_are_tagged_while_iterated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(query_tagging, 'enabled', True)
+    tagged = Tagged()
+    outside = []
+    inside = []
+    for tag in tagged.generate():
+        inside.append(tag)
+        outside.append(query_tag.get())
+
+    async def iterate() -> list[str | None]:
+        return [tag async for tag in tagged.agenerate()]
+
+    inside.extend(asyncio.run(iterate()))
+
+    expected = ['Tagged.generate', 'Tagged.generate', 'Tagged.agenerate']
+    assert inside == expected, f"Expected {expected}, but got: {inside}"
+    assert outside == [None, None], f"Expected no tag outside of the generator, but got: {outside}"
+
+
+def test_calls_are_not_tagged_without_slow_query_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(query_tagging, 'enabled', False)
+    tags = list(Tagged().generate())
+
+    assert tags == [None, None], f"Expected no tag with tracing and slow query log off, but got: {tags}"
+
+
+def test_slow_queries_are_logged_with_actor_method(postgres_engine: Engine, caplog: pytest.LogCaptureFixture) -> None:
+    engine = init_postgres_engine()
+    # Every statement is slower than a nanosecond
+    instrument_queries(engine, slow_query_threshold=0.000001)
+    session = scoped_session(sessionmaker(bind=engine))
+    try:
+        with caplog.at_level(logging.WARNING, logger='partition_registry.integration.postgres'):
+            SourceRegistry(session).db_lookup(f"missing_{uuid.uuid4().hex}")
+    finally:
+        session.remove()
+        engine.dispose()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Slow query of SourceRegistry.db_lookup took") for message in messages), \
+        f"Expected slow query of SourceRegistry.db_lookup to be logged, but got: {messages}"
+
+
+def test_queries_of_request_are_counted_in_header(postgres_engine: Engine) -> None:
+    engine = init_postgres_engine()
+    instrument_queries(engine, slow_query_threshold=0)
+    app = FastAPI()
+    app.add_middleware(QueryCountMiddleware)
+
+    @app.get("/")
+    def queries() -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    try:
+        response = TestClient(app).get("/")
+    finally:
+        engine.dispose()
+
+    assert response.headers[QUERY_COUNT_HEADER] == '2', f"Expected 2 queries, but got: {response.headers}"
+
+
+def test_query_budget_fails_when_exceeded(postgres_engine: Engine, query_budget: QueryBudget) -> None:
+    with pytest.raises(pytest.fail.Exception):
+        with query_budget(1):
+            with postgres_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+
+def test_readiness_of_missing_source_is_within_budget(postgres_engine: Engine, query_budget: QueryBudget) -> None:
+    from partition_registry.control import mainflow
+
+    client = TestClient(mainflow.app)
+    params = {'start': '2024-01-01T00:00:00+00:00', 'end': '2024-01-02T00:00:00+00:00'}
+
+    with query_budget(1):
+        response = client.get(f"/sources/missing_{uuid.uuid4().hex}/check_readiness", params=params)
+
+    assert response.headers[QUERY_COUNT_HEADER] == '1', f"Expected 1 query, but got: {response.headers}"
@@ -0,0 +1,94 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+from hypothesis import given
+
+from partition_registry.actions.check_partition_readiness import check_partition_readiness
+from partition_registry.actions.check_batch_readiness import check_batch_readiness
+from partition_registry.actor.readiness_cache import ReadinessCache
+from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.request import ReadinessRequest
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.orm import PartitionsRegistryORM
+
+from tests.arbitrary.partition import arbitrary_utc_datetime
+
+
+@given(start=arbitrary_utc_datetime)
+def test_repeated_check_is_answered_by_cache_until_source_changes(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+    readiness_cache = ReadinessCache()
+
+    partition_registry = MagicMock()
+    partition_registry.get_filtered_partitions.return_value = [
+        PartitionsRegistryORM(id=1, start=start, end=end, source_id=1, provider_id=1)
+    ]
+    events_registry = MagicMock()
+    events_registry.get_partition_events.return_value = [SimplifiedPartitionEventORM(1, EventType.LOCK, start)]
+
+    def check() -> PartitionReady | PartitionNotReady:
+        return check_partition_readiness(
+            start, end, 'some_source', partition_registry, events_registry, readiness_cache=readiness_cache
+        )
+
+    first_result = check()
+    second_result = check()
+    assert isinstance(first_result, PartitionNotReady), f"Expected locked source, but got: {first_result}"
+    assert second_result is first_result, f"Expected cached result, but got: {second_result}"
+    partition_registry.get_filtered_partitions.assert_called_once()
+
+    events_registry.get_partition_events.return_value = [SimplifiedPartitionEventORM(1, EventType.UNLOCK, start)]
+    readiness_cache.bump('some_source')
+    result = check()
+
+    assert isinstance(result, PartitionReady), f"Expected fresh result after source change, but got: {result}"
+
+
+@given(start=arbitrary_utc_datetime)
+def test_result_computed_before_source_change_is_not_cached(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+    readiness_cache = ReadinessCache()
+
+    version = readiness_cache.version('some_source')
+    readiness_cache.bump('some_source')
+    readiness_cache.put('some_source', version, start, end, PartitionReady())
+
+    result = readiness_cache.get('some_source', readiness_cache.version('some_source'), start, end)
+    assert result is None, f"Expected stale result to be skipped, but got: {result}"
+
+
+@given(start=arbitrary_utc_datetime)
+def test_batch_readiness_queries_only_uncached_requests(start: dt.datetime) -> None:
+    end = start + dt.timedelta(days=1)
+    readiness_cache = ReadinessCache()
+    readiness_cache.put('cached_source', readiness_cache.version('cached_source'), start, end, PartitionReady())
+
+    partition_registry = MagicMock()
+    partition_registry.get_filtered_partitions_batch.return_value = {0: []}
+    events_registry = MagicMock()
+
+    requests = [ReadinessRequest('cached_source', start, end), ReadinessRequest('unknown_source', start, end)]
+    results = check_batch_readiness(requests, partition_registry, events_registry, readiness_cache=readiness_cache)
+
+    assert [type(result) for result in results] == [PartitionReady, PartitionNotReady], \
+        f"Expected results in the order of requests, but got: {results}"
+    partition_registry.get_filtered_partitions_batch.assert_called_once_with([requests[1]])
+    cached = readiness_cache.get('unknown_source', readiness_cache.version('unknown_source'), start, end)
+    assert cached == results[1], f"Expected computed result to be cached, but got: {cached}"
+
+
+def test_bumping_every_source_drops_every_result() -> None:
+    readiness_cache = ReadinessCache()
+    readiness_cache.bump('written_source')
+    start = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+    end = start + dt.timedelta(days=1)
+    for source_name in ['written_source', 'some_source']:
+        readiness_cache.put(source_name, readiness_cache.version(source_name), start, end, PartitionReady())
+
+    readiness_cache.bump_all()
+
+    for source_name in ['written_source', 'some_source']:
+        result = readiness_cache.get(source_name, readiness_cache.version(source_name), start, end)
+        assert result is None, f"Expected no cached result of {source_name}, but got: {result}"
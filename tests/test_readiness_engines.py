@@ -0,0 +1,143 @@
+"""Differential tests of readiness engines, run against Postgres configured by POSTGRES_APPLICATION_* variables
+
+Every example is written within a transaction which is rolled back afterwards.
+Tests are skipped when Postgres is not reachable.
+"""
+import datetime as dt
+import uuid
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis import strategies as st
+from sqlalchemy import Connection
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+
+from partition_registry.actions.check_partition_readiness import read_partition_readiness
+from partition_registry.actor.events_registry import EventsRegistry
+from partition_registry.actor.events_registry import update_partition_state
+from partition_registry.actor.partition_registry import PartitionRegistry
+from partition_registry.data.event import EventType
+from partition_registry.data.readiness import ReadinessEngine
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.orm import PartitionEventsORM
+from partition_registry.orm import PartitionsRegistryORM
+from partition_registry.orm import ProvidersRegistryORM
+from partition_registry.orm import SourcesRegistryORM
+
+
+EPOCH = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+
+# Event types in order of registration, unlocked partitions are frequent to reach coverage checks
+arbitrary_events = st.one_of(st.lists(st.sampled_from(EventType), max_size=3), st.just([EventType.UNLOCK]))
+
+# (start hour, length in hours, event types)
+arbitrary_partition = st.tuples(
+    st.integers(min_value=0, max_value=12),
+    st.integers(min_value=1, max_value=6),
+    arbitrary_events,
+)
+arbitrary_interval = st.tuples(st.integers(min_value=0, max_value=12), st.integers(min_value=1, max_value=12))
+
+
+def category(result: PartitionReady | PartitionNotReady) -> str:
+    match result:
+        case PartitionNotReady() as not_ready if not_ready.reason.startswith("Source is locked by"):
+            # Any of locked partitions may be reported
+            return "locked"
+        case PartitionNotReady() as not_ready:
+            return not_ready.reason
+    return "ready"
+
+
+def seed(connection: Connection, partitions: list[tuple[int, int, list[EventType]]]) -> str:
+    source_name = f"source_{uuid.uuid4().hex}"
+    source_id = connection.execute(
+        insert(SourcesRegistryORM).values(name=source_name, owner='owner', access_token='token').returning(SourcesRegistryORM.id)
+    ).scalar_one()
+    provider_id = connection.execute(
+        insert(ProvidersRegistryORM).values(name=f"provider_{uuid.uuid4().hex}", access_token='token').returning(ProvidersRegistryORM.id)
+    ).scalar_one()
+
+    for start_hour, length, event_types in partitions:
+        partition_id = connection.execute(
+            insert(PartitionsRegistryORM).values(
+                start=EPOCH + dt.timedelta(hours=start_hour),
+                end=EPOCH + dt.timedelta(hours=start_hour + length),
+                source_id=source_id,
+                provider_id=provider_id,
+            ).returning(PartitionsRegistryORM.id)
+        ).scalar_one()
+        for position, event_type in enumerate(event_types):
+            event = PartitionEventsORM(
+                partition_id=partition_id,
+                event_type=event_type.value,
+                registered_at=EPOCH + dt.timedelta(minutes=position),
+            )
+            connection.execute(
+                insert(PartitionEventsORM).values(
+                    partition_id=event.partition_id,
+                    event_type=event.event_type,
+                    registered_at=event.registered_at,
+                )
+            )
+            connection.execute(update_partition_state(event))
+
+    return source_name
+
+
+@settings(max_examples=200, deadline=None)
+@given(partitions=st.lists(arbitrary_partition, max_size=8), interval=arbitrary_interval)
+def test_engines_agree(
+    postgres_connection: Connection,
+    partitions: list[tuple[int, int, list[EventType]]],
+    interval: tuple[int, int],
+) -> None:
+    transaction = postgres_connection.begin()
+    session = scoped_session(sessionmaker(bind=postgres_connection, join_transaction_mode='create_savepoint'))
+    try:
+        source_name = seed(postgres_connection, partitions)
+        start = EPOCH + dt.timedelta(hours=interval[0])
+        end = start + dt.timedelta(hours=interval[1])
+
+        partition_registry = PartitionRegistry(session)
+        events_registry = EventsRegistry(session)
+        python_result = read_partition_readiness(
+            start, end, source_name, partition_registry, events_registry, readiness_engine=ReadinessEngine.PYTHON
+        )
+        sql_result = read_partition_readiness(
+            start, end, source_name, partition_registry, events_registry, readiness_engine=ReadinessEngine.SQL
+        )
+    finally:
+        session.remove()
+        transaction.rollback()
+
+    assert category(python_result) == category(sql_result), \
+        f"Expected equal verdicts, but got: {python_result} (python) and {sql_result} (sql)"
+
+
+def test_partitions_within_interval_are_found(postgres_connection: Connection) -> None:
+    transaction = postgres_connection.begin()
+    session = scoped_session(sessionmaker(bind=postgres_connection, join_transaction_mode='create_savepoint'))
+    try:
+        # The middle partition neither contains start nor end of the interval
+        source_name = seed(postgres_connection, [(0, 3, [EventType.UNLOCK]), (3, 3, [EventType.UNLOCK]), (6, 4, [EventType.UNLOCK])])
+        start = EPOCH
+        end = EPOCH + dt.timedelta(hours=10)
+
+        partition_registry = PartitionRegistry(session)
+        events_registry = EventsRegistry(session)
+        partitions = partition_registry.get_filtered_partitions(start, end, source_name)
+        results = [
+            read_partition_readiness(start, end, source_name, partition_registry, events_registry, readiness_engine=engine)
+            for engine in ReadinessEngine
+        ]
+    finally:
+        session.remove()
+        transaction.rollback()
+
+    assert len(partitions) == 3, f"Expected every partition within the interval, but got: {partitions}"
+    for result in results:
+        assert isinstance(result, PartitionReady), f"Expected covered interval to be ready, but got: {result}"
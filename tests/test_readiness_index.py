@@ -0,0 +1,140 @@
+import datetime as dt
+from unittest.mock import MagicMock
+
+from hypothesis import given
+from hypothesis import assume
+from hypothesis import strategies as st
+
+from partition_registry.actions.check_partition_readiness import check_partition_readiness
+from partition_registry.actor.readiness_index import ReadinessIndex
+from partition_registry.actor.readiness_index import IndexedPartition
+from partition_registry.actor.readiness_index import SourceIntervalIndex
+from partition_registry.actor.readiness_index import span_class
+from partition_registry.data.event import EventType
+from partition_registry.data.event import SimplifiedPartitionEventORM
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+from partition_registry.orm import PartitionsRegistryORM
+
+from tests.arbitrary.partition import arbitrary_indexed_partitions
+from tests.arbitrary.partition import arbitrary_utc_datetime
+
+
+@given(
+    partitions=arbitrary_indexed_partitions,
+    start=arbitrary_utc_datetime,
+    end=arbitrary_utc_datetime,
+)
+def test_index_overlapping_matches_full_scan(
+    partitions: list[IndexedPartition],
+    start: dt.datetime,
+    end: dt.datetime,
+) -> None:
+    assume(start < end)
+    index = SourceIntervalIndex()
+    for partition in partitions:
+        index.add_partition(partition)
+
+    expected = {partition.id for partition in partitions if partition.start < end and start < partition.end}
+    overlapping = index.overlapping(start, end)
+    found = {partition.id for partition in overlapping}
+    starts = [partition.start for partition in overlapping]
+    assert found == expected, f"Expected overlapping partitions {expected}, but index returned {found}"
+    assert starts == sorted(starts), f"Expected overlapping partitions ordered by start, but got: {starts}"
+
+
+def test_long_partition_does_not_widen_scan_of_short_ones() -> None:
+    day = dt.timedelta(days=1)
+    origin = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+    days = [IndexedPartition(i, origin + i * day, origin + (i + 1) * day) for i in range(1000)]
+    long_partition = IndexedPartition(1000, origin, origin + 1000 * day)
+    index = SourceIntervalIndex()
+    for partition in [long_partition, *days]:
+        index.add_partition(partition)
+
+    found = index.overlapping(origin + 500 * day, origin + 502 * day)
+    short_bucket = index.buckets[span_class(days[0])]
+
+    assert found == [long_partition, days[500], days[501]], f"Expected overlaps ordered by start, but got: {found}"
+    assert short_bucket.max_span == day, f"Expected scan window of daily partitions to stay one day, but got: {short_bucket.max_span}"
+
+
+@given(start=arbitrary_utc_datetime, source_name=st.just('some_source'))
+def test_readiness_served_by_warm_index(start: dt.datetime, source_name: str) -> None:
+    end = start + dt.timedelta(days=2)
+    partitions = [
+        IndexedPartition(1, start, start + dt.timedelta(days=1)),
+        IndexedPartition(2, start + dt.timedelta(days=1), end),
+    ]
+    events = [SimplifiedPartitionEventORM(p.id, EventType.UNLOCK, start) for p in partitions]
+
+    readiness_index = ReadinessIndex()
+    readiness_index.warm(source_name, partitions, events, readiness_index.generation(source_name))
+
+    partition_registry = MagicMock()
+    events_registry = MagicMock()
+    result = check_partition_readiness(start, end, source_name, partition_registry, events_registry, readiness_index)
+
+    assert isinstance(result, PartitionReady), f"Expected ready partition, but got: {result}"
+    partition_registry.get_filtered_partitions.assert_not_called()
+    events_registry.get_partition_events.assert_not_called()
+
+
+@given(start=arbitrary_utc_datetime, source_name=st.just('some_source'))
+def test_readiness_index_warms_up_on_cold_source(start: dt.datetime, source_name: str) -> None:
+    end = start + dt.timedelta(days=1)
+    partition_registry = MagicMock()
+    partition_registry.get_source_partitions.return_value = [
+        PartitionsRegistryORM(id=1, start=start, end=end, source_id=1, provider_id=1),
+    ]
+    events_registry = MagicMock()
+    events_registry.get_partition_events.return_value = [
+        SimplifiedPartitionEventORM(1, EventType.LOCK, start),
+    ]
+
+    readiness_index = ReadinessIndex()
+    result = check_partition_readiness(start, end, source_name, partition_registry, events_registry, readiness_index)
+
+    assert isinstance(result, PartitionNotReady), f"Expected locked partition, but got: {result}"
+    assert readiness_index.is_warm(source_name), "Expected index to be warm after the first check"
+    partition_registry.get_filtered_partitions.assert_not_called()
+
+
+def test_readiness_index_refuses_stale_warm_up() -> None:
+    readiness_index = ReadinessIndex()
+    generation = readiness_index.generation('some_source')
+    partition = MagicMock()
+    partition.source.name = 'some_source'
+    readiness_index.add_partition(partition)
+
+    assert not readiness_index.warm('some_source', [], [], generation), \
+        "Expected warm up to be rejected because the source changed while loading"
+    assert not readiness_index.is_warm('some_source'), "Expected source to stay cold"
+
+
+def test_readiness_index_invalidation_makes_source_cold() -> None:
+    readiness_index = ReadinessIndex()
+    readiness_index.warm('some_source', [], [], readiness_index.generation('some_source'))
+    generation = readiness_index.generation('some_source')
+
+    readiness_index.invalidate('some_source')
+
+    assert not readiness_index.is_warm('some_source'), "Expected source to be cold after invalidation"
+    assert not readiness_index.warm('some_source', [], [], generation), \
+        "Expected warm up taken before invalidation to be rejected"
+
+
+def test_readiness_index_invalidation_of_every_source_refuses_pending_warm_ups() -> None:
+    readiness_index = ReadinessIndex()
+    partition = MagicMock()
+    partition.source.name = 'written_source'
+    readiness_index.add_partition(partition)
+    readiness_index.warm('warm_source', [], [], readiness_index.generation('warm_source'))
+    generations = {source_name: readiness_index.generation(source_name) for source_name in ['written_source', 'some_source']}
+
+    readiness_index.invalidate_all()
+
+    assert not readiness_index.is_warm('warm_source'), "Expected every source to be cold after invalidation"
+    for source_name, generation in generations.items():
+        assert not readiness_index.warm(source_name, [], [], generation), \
+            f"Expected warm up of {source_name} taken before invalidation to be rejected"
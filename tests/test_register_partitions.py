@@ -0,0 +1,115 @@
+import datetime as dt
+import json
+import uuid
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+
+from hypothesis import given
+
+from partition_registry.actions.register_partitions import register_partitions
+from partition_registry.data.partition import SimplePartition
+from partition_registry.data.partition import RegisteredPartition
+from partition_registry.data.request import PartitionsStreamParser
+from partition_registry.data.request import parse_partitions_payload
+from partition_registry.data.status import AlreadyRegistered
+from partition_registry.data.status import FailedRegistration
+from partition_registry.data.status import SuccededRegistration
+from partition_registry.data.status import ValidationFailed
+
+from tests.arbitrary.partition import arbitrary_utc_datetime
+
+
+@given(start=arbitrary_utc_datetime)
+def test_json_and_ndjson_payloads_are_parsed_equally(start: dt.datetime) -> None:
+    rows = [
+        {"start": start.isoformat(), "end": (start + dt.timedelta(hours=1)).isoformat()},
+        {"start": "not a timestamp", "end": start.isoformat()},
+    ]
+    from_json = parse_partitions_payload(json.dumps(rows).encode(), 'application/json')
+    from_ndjson = parse_partitions_payload("\n".join(json.dumps(row) for row in rows).encode(), 'application/x-ndjson')
+
+    assert from_json == from_ndjson, f"Expected equal parsing results, but got: {from_json} and {from_ndjson}"
+    assert isinstance(from_json[0], SimplePartition), f"Expected parsed partition, but got: {from_json[0]}"
+    assert isinstance(from_json[1], ValidationFailed), f"Expected failed validation, but got: {from_json[1]}"
+
+
+@given(start=arbitrary_utc_datetime)
+def test_ndjson_chunks_are_parsed_as_whole_payload(start: dt.datetime) -> None:
+    rows = [
+        {"start": start.isoformat(), "end": (start + dt.timedelta(hours=hour + 1)).isoformat()}
+        for hour in range(3)
+    ]
+    payload = "\n".join(json.dumps(row) for row in rows).encode()
+    parser = PartitionsStreamParser()
+
+    parsed = [partition for offset in range(0, len(payload), 7) for partition in parser.feed(payload[offset:offset + 7])]
+    parsed.extend(parser.close())
+
+    expected = parse_partitions_payload(payload, 'application/x-ndjson')
+    assert parsed == expected, f"Expected chunks split within lines to be parsed as {expected}, but got: {parsed}"
+
+
+@given(start=arbitrary_utc_datetime)
+def test_bulk_registration_keeps_partition_order(start: dt.datetime) -> None:
+    end = start + dt.timedelta(hours=1)
+    new_partition = SimplePartition(start, end)
+    registered_partition = SimplePartition(end, end + dt.timedelta(hours=1))
+
+    partition_registry = MagicMock()
+    partition_registry.safe_register_many.return_value = [
+        AlreadyRegistered(registered_partition),
+        MagicMock(spec=RegisteredPartition),
+    ]
+
+    results = register_partitions(
+        partitions=[registered_partition, ValidationFailed("Can't parse"), new_partition],
+        partition_registry=partition_registry,
+        source_name='some_source',
+        source_registry=MagicMock(),
+        provider_name='provider',
+        provider_registry=MagicMock(),
+    )
+
+    assert isinstance(results, list), f"Expected outcome for every partition, but got: {results}"
+    assert [type(result) for result in results] == [FailedRegistration, FailedRegistration, SuccededRegistration], \
+        f"Expected outcomes in the order of partitions, but got: {results}"
+    partition_registry.safe_register_many.assert_called_once()
+
+
+def test_bulk_registration_persists_many_rows(postgres_engine: Engine) -> None:
+    from partition_registry.control import mainflow
+
+    client = TestClient(mainflow.app)
+    source_name = f"bulk_source_{uuid.uuid4().hex}"
+    provider_name = f"bulk_provider_{uuid.uuid4().hex}"
+    source = client.post("/sources/register", params={'source_name': source_name, 'owner': 'owner'}).json()
+    access_token = source['registered_object']['access_token']['token']
+    client.post("/providers/register", params={'provider_name': provider_name, 'access_token': access_token})
+    start = dt.datetime(2000, 1, 1, tzinfo=dt.timezone.utc)
+    rows = [
+        {"start": (start + dt.timedelta(days=day)).isoformat(), "end": (start + dt.timedelta(days=day + 1)).isoformat()}
+        for day in range(3)
+    ]
+
+    response = client.post(
+        "/partitions/register/bulk",
+        params={'source_name': source_name, 'provider_name': provider_name},
+        content=json.dumps(rows),
+        headers={'content-type': 'application/json'},
+    )
+
+    assert response.status_code == 200, f"Expected partitions registered, but got: {response.status_code} {response.text}"
+    registered = [item['registered_object']['start'] for item in response.json()]
+    assert registered == [row['start'] for row in rows], f"Expected partitions in the order of payload, but got: {registered}"
+
+    repeated = client.post(
+        "/partitions/register/bulk",
+        params={'source_name': source_name, 'provider_name': provider_name},
+        content="\n".join(json.dumps(row) for row in rows),
+        headers={'content-type': 'application/x-ndjson'},
+    )
+
+    already_registered = ['registered' in item['detail'] for item in repeated.json()]
+    assert already_registered == [True] * len(rows), f"Expected every partition found registered, but got: {repeated.json()}"
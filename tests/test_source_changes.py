@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+from partition_registry.actions.wait_partition_readiness import wait_partition_readiness
+from partition_registry.actor.source_changes import SourceChanges
+from partition_registry.data.status import PartitionReady
+from partition_registry.data.status import PartitionNotReady
+
+
+def test_waiter_is_woken_by_change_in_another_thread() -> None:
+    source_changes = SourceChanges()
+
+    async def wait() -> bool:
+        version = source_changes.version('some_source')
+        threading.Timer(0.05, source_changes.notify, args=['some_source']).start()
+        return await source_changes.wait('some_source', version, timeout=5)
+
+    woken = asyncio.run(wait())
+
+    assert woken, "Expected waiter to be woken by the change"
+    assert not source_changes.waiters, f"Expected no waiters left, but got: {source_changes.waiters}"
+
+
+def test_waiter_times_out_without_changes_of_its_source() -> None:
+    source_changes = SourceChanges()
+
+    async def wait() -> bool:
+        version = source_changes.version('some_source')
+        source_changes.notify('another_source')
+        return await source_changes.wait('some_source', version, timeout=0.05)
+
+    woken = asyncio.run(wait())
+
+    assert not woken, "Expected waiter to time out"
+    assert not source_changes.waiters, f"Expected no waiters left, but got: {source_changes.waiters}"
+
+
+def test_change_made_before_waiting_is_not_missed() -> None:
+    source_changes = SourceChanges()
+    version = source_changes.version('some_source')
+    source_changes.notify('some_source')
+
+    woken = asyncio.run(source_changes.wait('some_source', version, timeout=5))
+
+    assert woken, "Expected change after the version to be noticed"
+
+
+def test_readiness_is_checked_again_on_change_only() -> None:
+    source_changes = SourceChanges()
+    results: list[PartitionReady | PartitionNotReady] = [PartitionNotReady("Source is locked"), PartitionReady()]
+    checks = 0
+
+    async def check() -> PartitionReady | PartitionNotReady:
+        nonlocal checks
+        checks += 1
+        if checks == 1:
+            asyncio.get_running_loop().call_later(0.05, source_changes.notify, 'some_source')
+        return results[checks - 1]
+
+    result = asyncio.run(wait_partition_readiness('some_source', check, source_changes, timeout=5, recheck_interval=5))
+
+    assert isinstance(result, PartitionReady), f"Expected ready after the change, but got: {result}"
+    assert checks == 2, f"Expected two checks, but got: {checks}"
+
+
+def test_last_result_is_returned_on_timeout() -> None:
+    source_changes = SourceChanges()
+
+    async def check() -> PartitionReady | PartitionNotReady:
+        return PartitionNotReady("Source is locked")
+
+    result = asyncio.run(wait_partition_readiness('some_source', check, source_changes, timeout=0.05, recheck_interval=5))
+
+    assert isinstance(result, PartitionNotReady), f"Expected not ready on timeout, but got: {result}"
@@ -0,0 +1,194 @@
+import json
+import pathlib
+from typing import Iterator
+from typing import Sequence
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy import text
+
+from partition_registry.actor.cache import LRUCache
+from partition_registry.integration.postgres import init_postgres_engine
+from partition_registry.integration.tracing import BatchSpanExporter
+from partition_registry.integration.tracing import FileSpanExporter
+from partition_registry.integration.tracing import Span
+from partition_registry.integration.tracing import SpanKind
+from partition_registry.integration.tracing import TracedCache
+from partition_registry.integration.tracing import TracingMiddleware
+from partition_registry.integration.tracing import parse_traceparent
+from partition_registry.integration.tracing import traced
+from partition_registry.integration.tracing import tracer
+
+
+class CollectingExporter:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.batches: list[int] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+        self.batches.append(len(spans))
+
+    def by_name(self) -> dict[str, Span]:
+        return {span.name: span for span in self.spans}
+
+
+@pytest.fixture
+def exporter() -> Iterator[CollectingExporter]:
+    exporter = CollectingExporter()
+    tracer.configure(exporter, sample_ratio=1.0)
+    yield exporter
+    tracer.configure(None, sample_ratio=1.0)
+
+
+@traced
+def action() -> int:
+    return lookup() + 1
+
+
+@traced
+def lookup() -> int:
+    return 1
+
+
+@traced
+def failing() -> None:
+    raise ValueError("some error")
+
+
+def test_nested_calls_are_child_spans(exporter: CollectingExporter) -> None:
+    action()
+
+    spans = exporter.by_name()
+    parent, child = spans['action'], spans['lookup']
+    assert child.parent_span_id == parent.context.span_id, f"Expected lookup to be a child of action, but got: {child}"
+    assert child.context.trace_id == parent.context.trace_id, f"Expected one trace, but got: {exporter.spans}"
+    assert parent.parent_span_id is None, f"Expected action to be the root span, but got: {parent}"
+
+
+def test_errors_are_recorded(exporter: CollectingExporter) -> None:
+    with pytest.raises(ValueError):
+        failing()
+
+    otlp = exporter.by_name()['failing'].to_otlp()
+    expected = {'code': 2, 'message': "ValueError: some error"}
+    assert otlp['status'] == expected, f"Expected {expected}, but got: {otlp['status']}"
+
+
+def test_traces_are_sampled_as_a_whole(exporter: CollectingExporter) -> None:
+    tracer.configure(exporter, sample_ratio=0.5)
+    for _ in range(200):
+        action()
+
+    traces: dict[str, set[str]] = {}
+    for span in exporter.spans:
+        traces.setdefault(span.context.trace_id, set()).add(span.name)
+
+    assert 0 < len(traces) < 200, f"Expected part of traces to be sampled, but got: {len(traces)}"
+    assert all(names == {'action', 'lookup'} for names in traces.values()), f"Expected complete traces, but got: {traces}"
+
+
+def test_requests_continue_remote_traces(exporter: CollectingExporter) -> None:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/sources/{source_name}")
+    def get_source(source_name: str) -> int:
+        return action()
+
+    traceparent = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+    TestClient(app).get("/sources/some_source", headers={'traceparent': traceparent})
+
+    spans = exporter.by_name()
+    server = spans['GET /sources/{source_name}']
+    assert server.kind == SpanKind.SERVER, f"Expected server span, but got: {server}"
+    assert server.context.trace_id == '4bf92f3577b34da6a3ce929d0e0e4736', f"Expected remote trace, but got: {server}"
+    assert server.parent_span_id == '00f067aa0ba902b7', f"Expected remote parent, but got: {server}"
+    assert server.attributes['http.response.status_code'] == 200, f"Expected status attribute, but got: {server}"
+    assert spans['action'].parent_span_id == server.context.span_id, f"Expected action within request, but got: {spans}"
+
+
+def test_remote_traces_not_sampled_are_not_recorded(exporter: CollectingExporter) -> None:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/")
+    def root() -> int:
+        return action()
+
+    TestClient(app).get("/", headers={'traceparent': '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00'})
+
+    assert exporter.spans == [], f"Expected no spans, but got: {exporter.spans}"
+
+
+def test_malformed_traceparent_is_ignored() -> None:
+    for traceparent in (None, '', '00-xyz-00f067aa0ba902b7-01', '00-00000000000000000000000000000000-00f067aa0ba902b7-01'):
+        assert parse_traceparent(traceparent) is None, f"Expected {traceparent!r} to be ignored"
+
+
+def test_cache_lookups_are_traced(exporter: CollectingExporter) -> None:
+    cache: TracedCache[str, int] = TracedCache('some', LRUCache(max_size=10))
+    cache.put('key', 1)
+
+    cache.get('key')
+    cache.get('missing')
+
+    hits = [span.attributes['cache.hit'] for span in exporter.spans]
+    assert hits == [True, False], f"Expected hit and miss, but got: {exporter.spans}"
+
+
+def test_statements_are_traced(postgres_engine: Engine, exporter: CollectingExporter) -> None:
+    engine = init_postgres_engine()
+    tracer.instrument_engine(engine)
+    try:
+        with tracer.span('parent') as parent, engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+
+    statement = exporter.by_name()['SELECT']
+    assert parent is not None and statement.parent_span_id == parent.context.span_id, \
+        f"Expected statement within parent, but got: {statement}"
+    assert statement.attributes['db.statement'] == 'SELECT 1', f"Expected statement attribute, but got: {statement}"
+
+
+def test_spans_are_exported_to_file(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'spans.jsonl'
+    exporter = FileSpanExporter(str(path))
+    tracer.configure(exporter, sample_ratio=1.0)
+    try:
+        action()
+    finally:
+        tracer.configure(None, sample_ratio=1.0)
+        exporter.close()
+
+    requests = [json.loads(line) for line in path.read_text().splitlines()]
+    names = [span['name'] for request in requests for span in request['resourceSpans'][0]['scopeSpans'][0]['spans']]
+    assert names == ['lookup', 'action'], f"Expected spans in the order they end, but got: {names}"
+
+
+def test_spans_are_exported_in_batches(exporter: CollectingExporter) -> None:
+    batched = BatchSpanExporter(exporter, max_export_batch_size=4, schedule_delay=60)
+    tracer.configure(batched, sample_ratio=1.0)
+    for _ in range(5):
+        action()
+
+    assert batched.flush(5), "Expected buffered spans to be exported"
+    assert exporter.batches[0] == 4, f"Expected full batch to be exported first, but got: {exporter.batches}"
+    assert sum(exporter.batches) == 10, f"Expected every span to be exported, but got: {exporter.batches}"
+    tracer.shutdown()
+    assert not batched.thread.is_alive(), "Expected export thread to stop on shutdown"
+
+
+def test_spans_beyond_queue_size_are_dropped(exporter: CollectingExporter) -> None:
+    batched = BatchSpanExporter(exporter, max_queue_size=3, max_export_batch_size=10, schedule_delay=60)
+    tracer.configure(batched, sample_ratio=1.0)
+    for _ in range(2):
+        action()
+    tracer.shutdown()
+
+    assert batched.dropped == 1, f"Expected one span to be dropped, but got: {batched.dropped}"
+    assert [span.name for span in exporter.spans] == ['lookup', 'action', 'lookup'], \
+        f"Expected spans buffered before the queue filled up to be exported on shutdown, but got: {exporter.spans}"